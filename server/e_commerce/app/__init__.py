@@ -4,11 +4,18 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
 from config import Config
+from app.utils.cache import Cache
+from app.utils.password_hasher import PasswordHasher
+from app.utils.rate_limit import RateLimiter
+from app.utils import sqlite_compat  # noqa: F401
 import os
 
 db = SQLAlchemy()
 jwt = JWTManager()
 migrate = Migrate()
+cache = Cache()
+password_hasher = PasswordHasher()
+rate_limiter = RateLimiter()
 
 
 def create_app(config_class=Config):
@@ -18,9 +25,12 @@ def create_app(config_class=Config):
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    password_hasher.init_app(app)
+    rate_limiter.init_app(app)
     CORS(app)
 
-    os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
     @app.route('/uploads/<path:filename>')
     def serve_uploads(filename):
@@ -35,6 +45,8 @@ def create_app(config_class=Config):
     from app.api.orders import orders_bp
     from app.api.addresses import addresses_bp
     from app.api.favorite import favorites_bp
+    from app.api.metrics import metrics_bp
+    from app.api.reports import reports_bp
 
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -45,5 +57,16 @@ def create_app(config_class=Config):
     app.register_blueprint(orders_bp, url_prefix='/api/orders')
     app.register_blueprint(addresses_bp, url_prefix='/api/addresses')
     app.register_blueprint(favorites_bp, url_prefix='/api/favorites')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+    app.register_blueprint(reports_bp, url_prefix='/api/reports')
+
+    from app.commands import register_commands
+    register_commands(app)
+
+    from app.service.local_search_service import LocalSearchService
+    LocalSearchService.init_app(app)
+
+    from app.service.token_revocation_service import TokenRevocationService
+    TokenRevocationService.init_app(app)
 
     return app
\ No newline at end of file
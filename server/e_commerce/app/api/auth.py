@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, create_access_token, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from marshmallow import ValidationError
+from app import rate_limiter
 from app.service.auth_service import AuthService
+from app.service.token_revocation_service import TokenRevocationService
+from app.service.user_service import UserService
 from app.schemas.auth_schema import RegisterSchema, LoginSchema
 from app.schemas.user_schema import UserSchema
+from app.utils.password_hasher import HASHER_BUSY
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -12,6 +18,7 @@ login_schema = LoginSchema()
 user_schema = UserSchema()
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limiter.limit('register', '5/minute')
 def register():
     json_data = request.get_json()
     if not json_data:
@@ -23,6 +30,8 @@ def register():
 
     user, error = AuthService.register_user(validated_data)
 
+    if error == HASHER_BUSY:
+        return jsonify({'error': error}), 503, {'Retry-After': '1'}
     if error:
         return jsonify({'error': error}), 400
 
@@ -33,6 +42,7 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limiter.limit('login', '10/minute')
 def login():
     json_data = request.get_json()
     if not json_data:
@@ -43,6 +53,8 @@ def login():
         return jsonify(err.messages), 422
     result, error = AuthService.login_user(validated_data)
 
+    if error == HASHER_BUSY:
+        return jsonify({'error': error}), 503, {'Retry-After': '1'}
     if error:
         return jsonify({'error': error}), 401
 
@@ -55,6 +67,33 @@ def login():
 @auth_bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
+    # Loaded from the database rather than the user cache, so a deleted or demoted
+    # account cannot mint new access tokens from a still-valid refresh token.
     current_user_id = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user_id)
-    return jsonify({'access_token': new_access_token}), 200
\ No newline at end of file
+    user = UserService.get_user_by_id(int(current_user_id))
+    if not user:
+        return jsonify({'error': 'User not found'}), 401
+
+    new_access_token = create_access_token(identity=current_user_id, additional_claims={"role": user.role})
+    return jsonify({'access_token': new_access_token}), 200
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    payloads = [get_jwt()]
+
+    refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+    if refresh_token:
+        try:
+            refresh_payload = decode_token(refresh_token)
+        except (JWTExtendedException, PyJWTError):
+            return jsonify({'error': 'Invalid refresh token'}), 400
+        if refresh_payload.get('type') != 'refresh' or refresh_payload['sub'] != get_jwt_identity():
+            return jsonify({'error': 'Invalid refresh token'}), 400
+        payloads.append(refresh_payload)
+
+    for payload in payloads:
+        TokenRevocationService.revoke(payload)
+
+    return jsonify({'message': 'Logged out successfully'}), 200
\ No newline at end of file
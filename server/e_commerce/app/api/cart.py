@@ -2,11 +2,14 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
 from app.service.cart_service import CartService
-from app.schemas.cart_schema import CartSchema, CartItemSchema
+from app.schemas.cart_schema import CartSchema, CartItemSchema, CartOperationSchema
 
 cart_bp = Blueprint('cart', __name__)
 cart_schema = CartSchema()
 cart_item_schema = CartItemSchema()
+cart_operations_schema = CartOperationSchema(many=True)
+
+MAX_CART_OPERATIONS = 100
 
 
 @cart_bp.route('', methods=['GET'])
@@ -21,6 +24,31 @@ def get_cart():
     return jsonify(cart_schema.dump(cart)), 200
 
 
+@cart_bp.route('', methods=['PATCH'])
+@jwt_required()
+def update_cart():
+    current_user_id = int(get_jwt_identity())
+    json_data = request.get_json() or {}
+
+    operations = json_data.get('items')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'items must be a non-empty list'}), 400
+    if len(operations) > MAX_CART_OPERATIONS:
+        return jsonify({'error': f'At most {MAX_CART_OPERATIONS} operations per request'}), 400
+
+    try:
+        validated_operations = cart_operations_schema.load(operations)
+    except ValidationError as err:
+        return jsonify(err.messages), 422
+
+    cart, error = CartService.apply_operations(current_user_id, validated_operations)
+    if error:
+        status_code = 404 if "not found" in error else 400
+        return jsonify({'error': error}), status_code
+
+    return jsonify(cart_schema.dump(cart)), 200
+
+
 @cart_bp.route('/items', methods=['POST'])
 @jwt_required()
 def add_item_to_cart():
@@ -1,52 +1,61 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
 from app.service.category_service import CategoryService
-from app.service.user_service import UserService
+from app.service.catalog_version_service import CatalogVersionService
 from app.schemas.category_schema import CategorySchema
+from app.utils.auth import require_role, current_user
+from app.utils.http_cache import conditional_get
 
 categories_bp = Blueprint('categories', __name__)
 
 category_schema = CategorySchema()
-categories_schema = CategorySchema(many=True)
+
+
+def _categories_version(**kwargs):
+    return CatalogVersionService.get_version('categories')
 
 
 @categories_bp.route('', methods=['GET'])
+@conditional_get(_categories_version)
 def get_all_categories():
-    categories = CategoryService.get_all_categories()
-    return jsonify(categories_schema.dump(categories)), 200
+    return jsonify(CategoryService.get_tree().all()), 200
 
 
 @categories_bp.route('/roots', methods=['GET'])
+@conditional_get(_categories_version)
 def get_root_categories():
-    categories = CategoryService.get_root_categories()
-    return jsonify(categories_schema.dump(categories)), 200
+    return jsonify(CategoryService.get_tree().roots()), 200
 
 
 @categories_bp.route('/<int:category_id>', methods=['GET'])
+@conditional_get(_categories_version)
 def get_category(category_id):
-    category = CategoryService.get_category_by_id(category_id)
+    category = CategoryService.get_tree().subtree(category_id)
     if not category:
         return jsonify({'error': 'Category not found'}), 404
 
-    return jsonify(category_schema.dump(category)), 200
+    return jsonify(category), 200
+
+
+@categories_bp.route('/<int:category_id>/breadcrumbs', methods=['GET'])
+@conditional_get(_categories_version)
+def get_category_breadcrumbs(category_id):
+    breadcrumbs = CategoryService.get_tree().breadcrumbs(category_id)
+    if not breadcrumbs:
+        return jsonify({'error': 'Category not found'}), 404
+
+    return jsonify(breadcrumbs), 200
 
 
 @categories_bp.route('/parent/<int:parent_id>', methods=['GET'])
+@conditional_get(_categories_version)
 def get_child_categories(parent_id):
-    categories = CategoryService.get_child_categories(parent_id)
-    return jsonify(categories_schema.dump(categories)), 200
+    return jsonify(CategoryService.get_tree().child_nodes(parent_id)), 200
 
 
 @categories_bp.route('', methods=['POST'])
-@jwt_required()
+@require_role('admin', message="Access denied. Only admins can create categories.")
 def create_category():
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user:
-        return jsonify({'error': 'User not found'}), 401
-
     json_data = request.get_json()
     if not json_data:
         return jsonify({'error': 'No data provided'}), 400
@@ -69,14 +78,8 @@ def create_category():
 
 
 @categories_bp.route('/<int:category_id>', methods=['PUT'])
-@jwt_required()
+@require_role('admin', message="Access denied")
 def update_category(category_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user:
-        return jsonify({'error': 'User not found'}), 401
-
     json_data = request.get_json()
     if not json_data:
         return jsonify({'error': 'No data provided'}), 400
@@ -99,14 +102,8 @@ def update_category(category_id):
 
 
 @categories_bp.route('/<int:category_id>', methods=['DELETE'])
-@jwt_required()
+@require_role('admin', message="Access denied")
 def delete_category(category_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user:
-        return jsonify({'error': 'User not found'}), 401
-
     success, error = CategoryService.delete_category(category_id, requesting_user=current_user)
 
     if error:
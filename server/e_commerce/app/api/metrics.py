@@ -0,0 +1,15 @@
+from flask import Blueprint, jsonify
+from app import cache, password_hasher, rate_limiter
+from app.utils.auth import require_role
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('', methods=['GET'])
+@require_role('admin')
+def get_metrics():
+    return jsonify({
+        'cache': cache.stats(),
+        'password_hasher': password_hasher.stats(),
+        'rate_limit': rate_limiter.stats()
+    }), 200
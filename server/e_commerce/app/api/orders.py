@@ -1,9 +1,11 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, g, request, jsonify
+from flask_jwt_extended import jwt_required
 from marshmallow import ValidationError
 from app.service.order_service import OrderService
-from app.service.user_service import UserService
 from app.schemas.order_schema import OrderSchema, OrderCreateItemSchema
+from app.utils.auth import require_role, current_user_id, is_admin
+from app.utils.idempotency import idempotent
+from app.utils.pagination import wants_page, parse_page_args, parse_date_arg
 
 orders_bp = Blueprint('orders', __name__)
 
@@ -12,42 +14,81 @@ orders_schema = OrderSchema(many=True)
 direct_order_item_schema = OrderCreateItemSchema(many=True)  # Liste validasyonu için
 
 
+ORDER_FILTER_ARGS = ('status', 'user_id', 'created_from', 'created_to')
+
+
+MAX_BULK_STATUS_ORDERS = 1000
+
+
+def _orders_page_response():
+    limit, after, error = parse_page_args(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    try:
+        user_id = int(request.args['user_id']) if request.args.get('user_id') else None
+        created_from = parse_date_arg(request.args, 'created_from')
+        created_to = parse_date_arg(request.args, 'created_to', end_of_range=True)
+    except ValueError:
+        return jsonify({'error': 'user_id must be an integer and dates must be ISO formatted'}), 400
+
+    if not is_admin():
+        user_id = current_user_id()
+
+    page, error = OrderService.get_orders_page(
+        limit, after,
+        status=request.args.get('status') or None,
+        user_id=user_id,
+        created_from=created_from,
+        created_to=created_to
+    )
+    if error:
+        return jsonify({'error': error}), 400
+
+    return jsonify({'items': orders_schema.dump(page['items']), 'next_cursor': page['next_cursor']}), 200
+
+
 @orders_bp.route('', methods=['GET'])
 @jwt_required()
 def get_orders():
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user:
-        return jsonify({'error': 'User not found'}), 404
+    if wants_page(request.args) or any(arg in request.args for arg in ORDER_FILTER_ARGS):
+        return _orders_page_response()
 
-    if current_user.role == 'admin':
+    if is_admin():
         orders = OrderService.get_all_orders()
     else:
-        orders = OrderService.get_orders_by_user(current_user_id)
+        orders = OrderService.get_orders_by_user(current_user_id())
     return jsonify(orders_schema.dump(orders)), 200
 
 
 @orders_bp.route('/<int:order_id>', methods=['GET'])
 @jwt_required()
 def get_order_detail(order_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
     order = OrderService.get_order_by_id(order_id)
     if not order:
         return jsonify({'error': 'Order not found'}), 404
 
-    if current_user.role != 'admin' and order.user_id != current_user_id:
+    if not is_admin() and order.user_id != current_user_id():
         return jsonify({'error': 'Access denied'}), 403
 
     return jsonify(order_schema.dump(order)), 200
 
 
+def _order_created(order):
+    return jsonify({
+        'message': 'Order created successfully',
+        'order': order_schema.dump(order)
+    }), 201
+
+
+def _recover_created_order(order_id):
+    return _order_created(OrderService.get_order_by_id(order_id))
+
+
 @orders_bp.route('', methods=['POST'])
 @jwt_required()
+@idempotent(recover=_recover_created_order)
 def create_order():
-    current_user_id = int(get_jwt_identity())
     json_data = request.get_json() or {}
 
     address_id = json_data.get('address_id')
@@ -61,29 +102,24 @@ def create_order():
         except ValidationError as err:
             return jsonify(err.messages), 422
 
-        order, error = OrderService.create_order_direct(current_user_id, address_id, validated_items)
+        order, error = OrderService.create_order_direct(
+            current_user_id(), address_id, validated_items, idempotency_key_id=g.get('idempotency_key_id')
+        )
 
     else:
-        order, error = OrderService.create_order_from_cart(current_user_id, address_id)
+        order, error = OrderService.create_order_from_cart(
+            current_user_id(), address_id, idempotency_key_id=g.get('idempotency_key_id')
+        )
 
     if error:
         return jsonify({'error': error}), 400
 
-    return jsonify({
-        'message': 'Order created successfully',
-        'order': order_schema.dump(order)
-    }), 201
+    return _order_created(order)
 
 
 @orders_bp.route('/<int:order_id>/status', methods=['PUT'])
-@jwt_required()
+@require_role('admin')
 def update_order_status(order_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Admin access required'}), 403
-
     json_data = request.get_json() or {}
     status = json_data.get('status')
 
@@ -100,19 +136,82 @@ def update_order_status(order_id):
     }), 200
 
 
+@orders_bp.route('/status', methods=['PUT'])
+@require_role('admin')
+def update_order_statuses():
+    json_data = request.get_json() or {}
+    orders = json_data.get('orders')
+    order_filter = json_data.get('filter')
+
+    if (orders is None) == (order_filter is None):
+        return jsonify({'error': 'Provide either orders or filter'}), 400
+
+    if orders is not None:
+        if not isinstance(orders, list) or not orders or len(orders) > MAX_BULK_STATUS_ORDERS:
+            return jsonify({'error': f'orders must be a list of 1 to {MAX_BULK_STATUS_ORDERS} items'}), 400
+
+        targets = {}
+        for i, entry in enumerate(orders):
+            order_id = entry.get('order_id') if isinstance(entry, dict) else None
+            status = entry.get('status') if isinstance(entry, dict) else None
+            if not isinstance(order_id, int) or isinstance(order_id, bool) or not isinstance(status, str):
+                return jsonify({'error': f'orders[{i}]: order_id (integer) and status are required'}), 400
+            if order_id in targets:
+                return jsonify({'error': f'orders[{i}]: duplicate order_id {order_id}'}), 400
+            targets[order_id] = status
+
+        result, error = OrderService.update_order_statuses(targets)
+
+    else:
+        status = json_data.get('status')
+        if not isinstance(order_filter, dict) or not status:
+            return jsonify({'error': 'filter must be an object and status is required'}), 400
+
+        try:
+            user_id = int(order_filter['user_id']) if order_filter.get('user_id') else None
+            created_from = parse_date_arg(order_filter, 'created_from')
+            created_to = parse_date_arg(order_filter, 'created_to', end_of_range=True)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'user_id must be an integer and dates must be ISO formatted'}), 400
+
+        result, error = OrderService.update_order_statuses_matching(
+            status, MAX_BULK_STATUS_ORDERS,
+            status=order_filter.get('status') or None,
+            user_id=user_id,
+            created_from=created_from,
+            created_to=created_to
+        )
+
+    if error:
+        return jsonify({'error': error}), 400
+
+    return jsonify(result), 200
+
+
 @orders_bp.route('/<int:order_id>/cancel', methods=['POST'])
 @jwt_required()
 def cancel_order(order_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    is_admin = (current_user.role == 'admin') if current_user else False
-
-    success, error = OrderService.cancel_order(order_id, current_user_id, is_admin)
+    success, error = OrderService.cancel_order(order_id, current_user_id(), is_admin())
 
     if error:
         status_code = 404 if error == "Order not found" else 400
         if error == "Access denied": status_code = 403
         return jsonify({'error': error}), status_code
 
-    return jsonify({'message': 'Order cancelled successfully'}), 200
\ No newline at end of file
+    return jsonify({'message': 'Order cancelled successfully'}), 200
+
+
+@orders_bp.route('/cancel', methods=['POST'])
+@require_role('admin')
+def cancel_orders():
+    json_data = request.get_json() or {}
+    order_ids = json_data.get('order_ids')
+    if not isinstance(order_ids, list) or not order_ids or \
+            not all(isinstance(order_id, int) and not isinstance(order_id, bool) for order_id in order_ids):
+        return jsonify({'error': 'order_ids must be a non-empty list of integers'}), 400
+
+    result, error = OrderService.cancel_orders(order_ids)
+    if error:
+        return jsonify({'error': error}), 400
+
+    return jsonify(result), 200
@@ -1,9 +1,13 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
+from app import cache, rate_limiter
 from app.service.product_service import ProductService
-from app.service.user_service import UserService
+from app.service.inventory_service import InventoryService
+from app.service.product_cache import product_key, listing_key
 from app.schemas.product_schema import ProductSchema, ProductImageSchema
+from app.utils.auth import require_role, current_user
+from app.utils.pagination import wants_page, parse_page_args, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.http_cache import conditional_get
 
 products_bp = Blueprint('products', __name__)
 
@@ -12,36 +16,113 @@ products_schema = ProductSchema(many=True)
 images_schema = ProductImageSchema(many=True)
 
 
+SEARCH_PAGE_ARGS = ('page', 'size', 'search_after', 'category_id', 'min_price', 'max_price', 'in_stock')
+
+
+def _search_page_response(query):
+    try:
+        page = int(request.args.get('page', 1))
+        size = min(int(request.args.get('size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        category_id = request.args.get('category_id', type=int)
+        min_price = float(request.args['min_price']) if request.args.get('min_price') else None
+        max_price = float(request.args['max_price']) if request.args.get('max_price') else None
+    except ValueError:
+        return jsonify({'error': 'Geçersiz arama parametresi'}), 400
+
+    if page < 1 or size < 1:
+        return jsonify({'error': 'page ve size pozitif olmalıdır'}), 400
+
+    result, error = ProductService.search_products_page(
+        query,
+        size=size,
+        page=page,
+        search_after=request.args.get('search_after') or None,
+        category_id=category_id,
+        include_descendants=request.args.get('include_descendants', '1').lower() in ('1', 'true', 'yes'),
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=request.args.get('in_stock', '').lower() in ('1', 'true', 'yes')
+    )
+    if error:
+        status_code = 503 if "kullanılamıyor" in error else 400
+        return jsonify({'error': error}), status_code
+
+    return jsonify(result), 200
+
 @products_bp.route('/search', methods=['GET'])
+@rate_limiter.limit('search', '60/minute', per='user')
 def search_products_api():
     query = request.args.get('q', '')
 
+    if any(arg in request.args for arg in SEARCH_PAGE_ARGS):
+        return _search_page_response(query)
+
     if not query:
         return jsonify([]), 200
     results = ProductService.search_in_elastic(query)
     return jsonify(results), 200
 
+def _include_descendants():
+    return request.args.get('include_descendants', '').lower() in ('1', 'true', 'yes')
+
+def _products_page_response(category_id=None):
+    limit, after, error = parse_page_args(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    key = listing_key(request.args, category_id)
+    data = cache.get(key)
+    if data is not None:
+        return jsonify(data), 200
+
+    sort = request.args.get('sort', 'id')
+    page, error = ProductService.get_products_page(
+        limit, after, sort,
+        category_id=category_id,
+        include_descendants=category_id is not None and _include_descendants()
+    )
+    if error:
+        return jsonify({'error': error}), 400
+
+    data = {
+        'items': products_schema.dump(page['items']),
+        'next_cursor': page['next_cursor']
+    }
+    cache.set(key, data)
+    return jsonify(data), 200
+
+def _products_version(product_id=None, **kwargs):
+    return ProductService.get_catalog_stamp(product_id)
+
 @products_bp.route('', methods=['GET'])
+@conditional_get(_products_version)
 def get_all_products():
-    products = ProductService.get_all_products()
-    return jsonify(products_schema.dump(products)), 200
+    if wants_page(request.args):
+        return _products_page_response()
+
+    key = listing_key(request.args)
+    data = cache.get(key)
+    if data is None:
+        data = products_schema.dump(ProductService.get_all_products())
+        cache.set(key, data)
+    return jsonify(data), 200
 
 @products_bp.route('/<int:product_id>', methods=['GET'])
+@conditional_get(_products_version)
 def get_product(product_id):
-    product = ProductService.get_product_by_id(product_id)
-    if not product:
-        return jsonify({'error': 'Ürün bulunamadı'}), 404
-    return jsonify(product_schema.dump(product)), 200
+    key = product_key(product_id)
+    data = cache.get(key)
+    if data is None:
+        product = ProductService.get_product_by_id(product_id)
+        if not product:
+            return jsonify({'error': 'Ürün bulunamadı'}), 404
+        data = product_schema.dump(product)
+        cache.set(key, data)
+    return jsonify(data), 200
 
 @products_bp.route('/', methods=['POST'])
-@jwt_required()
+@require_role('admin', message='Sadece admin ürün ekleyebilir')
 def create_product():
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Sadece admin ürün ekleyebilir'}), 403
-
     json_data = request.get_json() or {}
     try:
         validated_data = product_schema.load(json_data)
@@ -55,14 +136,8 @@ def create_product():
     return jsonify({'message': 'Ürün başarıyla oluşturuldu', 'product': product_schema.dump(product)}), 201
 
 @products_bp.route('/<int:product_id>', methods=['PUT'])
-@jwt_required()
+@require_role('admin', message='Sadece admin ürün güncelleyebilir')
 def update_product(product_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Sadece admin ürün güncelleyebilir'}), 403
-
     json_data = request.get_json() or {}
     try:
         validated_data = product_schema.load(json_data, partial=True)
@@ -77,14 +152,8 @@ def update_product(product_id):
     return jsonify({'message': 'Ürün güncellendi', 'product': product_schema.dump(product)}), 200
 
 @products_bp.route('/<int:product_id>', methods=['DELETE'])
-@jwt_required()
+@require_role('admin', message='Sadece admin ürün silebilir')
 def delete_product(product_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Sadece admin ürün silebilir'}), 403
-
     success, error = ProductService.delete_product(product_id, requesting_user=current_user)
     if error:
         return jsonify({'error': error}), 404 if "bulunamadı" in error else 400
@@ -92,14 +161,8 @@ def delete_product(product_id):
     return jsonify({'message': 'Ürün silindi'}), 200
 
 @products_bp.route('/<int:product_id>/images', methods=['POST'])
-@jwt_required()
+@require_role('admin', message='Sadece admin resim ekleyebilir')
 def add_product_images(product_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Sadece admin resim ekleyebilir'}), 403
-
     files = request.files.getlist('file')
     if not files or files[0].filename == '':
         return jsonify({'error': 'Dosya seçilmedi'}), 400
@@ -111,21 +174,47 @@ def add_product_images(product_id):
     return jsonify({'message': f'{len(images)} resim yüklendi', 'images': images_schema.dump(images)}), 201
 
 @products_bp.route('/images/<int:image_id>', methods=['DELETE'])
-@jwt_required()
+@require_role('admin', message='Sadece admin resim silebilir')
 def delete_product_image(image_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Sadece admin resim silebilir'}), 403
-
     success, error = ProductService.delete_product_image(image_id, requesting_user=current_user)
     if error:
         return jsonify({'error': error}), 400
 
     return jsonify({'message': 'Resim silindi'}), 200
 
+@products_bp.route('/<int:product_id>/stock-shards', methods=['GET'])
+@require_role('admin', message='Sadece admin stok dağılımını görebilir')
+def get_stock_shards(product_id):
+    data, error = InventoryService.get_stock_shards(product_id)
+    if error:
+        return jsonify({'error': error}), 404
+
+    return jsonify(data), 200
+
+@products_bp.route('/<int:product_id>/stock-shards', methods=['PUT'])
+@require_role('admin', message='Sadece admin stok dağılımını değiştirebilir')
+def rebalance_stock_shards(product_id):
+    json_data = request.get_json() or {}
+    shard_count = json_data.get('shard_count')
+    if not isinstance(shard_count, int) or isinstance(shard_count, bool):
+        return jsonify({'error': 'shard_count tam sayı olmalı'}), 422
+
+    data, error = InventoryService.rebalance(product_id, shard_count, requesting_user=current_user)
+    if error:
+        return jsonify({'error': error}), 404 if "bulunamadı" in error else 400
+
+    return jsonify({'message': 'Stok dağılımı güncellendi', **data}), 200
+
 @products_bp.route('/category/<int:category_id>', methods=['GET'])
+@conditional_get(_products_version)
 def get_products_by_category(category_id):
-    products = ProductService.get_products_by_category(category_id)
-    return jsonify(products_schema.dump(products)), 200
\ No newline at end of file
+    if wants_page(request.args):
+        return _products_page_response(category_id=category_id)
+
+    key = listing_key(request.args, category_id)
+    data = cache.get(key)
+    if data is None:
+        products = ProductService.get_products_by_category(category_id, include_descendants=_include_descendants())
+        data = products_schema.dump(products)
+        cache.set(key, data)
+    return jsonify(data), 200
\ No newline at end of file
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from flask import Blueprint, request, jsonify
+from app.service.report_service import ReportService
+from app.utils.auth import require_role
+
+reports_bp = Blueprint('reports', __name__)
+
+DEFAULT_REPORT_DAYS = 30
+MAX_TOP_PRODUCTS = 100
+
+
+def _report_args():
+    end = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+    start = date.fromisoformat(request.args['from']) if request.args.get('from') \
+        else end - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if start > end:
+        raise ValueError
+    category_id = int(request.args['category_id']) if request.args.get('category_id') else None
+    return start, end, category_id
+
+
+@reports_bp.route('/sales/daily', methods=['GET'])
+@require_role('admin')
+def sales_by_day():
+    try:
+        start, end, category_id = _report_args()
+    except ValueError:
+        return jsonify({'error': 'from/to must be ISO dates with from <= to, category_id an integer'}), 400
+
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'days': ReportService.sales_by_day(start, end, category_id)
+    }), 200
+
+
+@reports_bp.route('/sales/categories', methods=['GET'])
+@require_role('admin')
+def sales_by_category():
+    try:
+        start, end, _ = _report_args()
+    except ValueError:
+        return jsonify({'error': 'from/to must be ISO dates with from <= to'}), 400
+
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'categories': ReportService.sales_by_category(start, end)
+    }), 200
+
+
+@reports_bp.route('/sales/products', methods=['GET'])
+@require_role('admin')
+def top_products():
+    try:
+        start, end, category_id = _report_args()
+        limit = min(int(request.args.get('limit', 10)), MAX_TOP_PRODUCTS)
+    except ValueError:
+        return jsonify({'error': 'from/to must be ISO dates with from <= to, category_id and limit integers'}), 400
+
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'products': ReportService.top_products(start, end, max(limit, 1), category_id)
+    }), 200
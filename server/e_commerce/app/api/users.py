@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from marshmallow import ValidationError
 from app.service.user_service import UserService
 # Şemalarını doğru klasörden import ettiğine emin ol
 from app.schemas.user_schema import UserSchema, UserUpdateSchema
+from app.utils.auth import require_role, current_user, current_user_id, is_admin
+from app.utils.pagination import wants_page, parse_page_args, parse_date_arg
+from app.utils.password_hasher import HASHER_BUSY
 
 users_bp = Blueprint('users', __name__)
 user_schema = UserSchema()
@@ -11,14 +14,38 @@ users_schema = UserSchema(many=True)
 user_update_schema = UserUpdateSchema(partial=True)
 
 
+USER_FILTER_ARGS = ('role', 'q', 'created_from', 'created_to')
+
+
+def _users_page_response():
+    limit, after, error = parse_page_args(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    try:
+        created_from = parse_date_arg(request.args, 'created_from')
+        created_to = parse_date_arg(request.args, 'created_to', end_of_range=True)
+    except ValueError:
+        return jsonify({'error': 'Dates must be ISO formatted'}), 400
+
+    page, error = UserService.get_users_page(
+        limit, after,
+        role=request.args.get('role') or None,
+        q=request.args.get('q', '').strip() or None,
+        created_from=created_from,
+        created_to=created_to
+    )
+    if error:
+        return jsonify({'error': error}), 400
+
+    return jsonify({'items': users_schema.dump(page['items']), 'next_cursor': page['next_cursor']}), 200
+
+
 @users_bp.route('', methods=['GET'])
-@jwt_required()
+@require_role('admin')
 def get_all_users():
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Admin access required'}), 403
+    if wants_page(request.args) or any(arg in request.args for arg in USER_FILTER_ARGS):
+        return _users_page_response()
 
     users = UserService.get_all_users()
     return jsonify(users_schema.dump(users)), 200
@@ -27,13 +54,10 @@ def get_all_users():
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if current_user_id != user_id and (not current_user or current_user.role != 'admin'):
+    if current_user_id() != user_id and not is_admin():
         return jsonify({'error': 'Access denied'}), 403
 
-    user = UserService.get_user_by_id(user_id)
+    user = current_user if current_user_id() == user_id else UserService.get_user_by_id(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     return jsonify(user_schema.dump(user)), 200
@@ -42,25 +66,13 @@ def get_user(user_id):
 @users_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
-    current_user_id = int(get_jwt_identity())
-    user = UserService.get_user_by_id(current_user_id)
-
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-
-    return jsonify(user_schema.dump(user)), 200
+    return jsonify(user_schema.dump(current_user)), 200
 
 
 @users_bp.route('/<int:user_id>', methods=['PUT'])
 @jwt_required()
 def update_user(user_id):
-    current_user_id = int(get_jwt_identity())
-    requesting_user = UserService.get_user_by_id(current_user_id)
-
-    if not requesting_user:
-        return jsonify({'error': 'Unauthorized'}), 401
-
-    if current_user_id != user_id and requesting_user.role != 'admin':
+    if current_user_id() != user_id and not is_admin():
         return jsonify({'error': 'Access denied'}), 403
 
     json_data = request.get_json()
@@ -71,8 +83,10 @@ def update_user(user_id):
     except ValidationError as err:
         return jsonify(err.messages), 422
 
-    user, error = UserService.update_user(user_id, validated_data, requesting_user)
+    user, error = UserService.update_user(user_id, validated_data, current_user)
 
+    if error == HASHER_BUSY:
+        return jsonify({'error': error}), 503, {'Retry-After': '1'}
     if error:
         status_code = 404 if error == "User not found" else 400
         return jsonify({'error': error}), status_code
@@ -84,14 +98,8 @@ def update_user(user_id):
 
 
 @users_bp.route('/<int:user_id>', methods=['DELETE'])
-@jwt_required()
+@require_role('admin')
 def delete_user(user_id):
-    current_user_id = int(get_jwt_identity())
-    current_user = UserService.get_user_by_id(current_user_id)
-
-    if not current_user or current_user.role != 'admin':
-        return jsonify({'error': 'Admin access required'}), 403
-
     success, error = UserService.delete_user(user_id)
 
     if error:
@@ -0,0 +1,111 @@
+import time
+import click
+from elasticsearch import Elasticsearch
+from flask.cli import with_appcontext
+from app import db
+
+
+def register_commands(app):
+    app.cli.add_command(sync_search)
+    app.cli.add_command(reindex_products)
+    app.cli.add_command(purge_idempotency_keys)
+    app.cli.add_command(rebuild_sales_rollups)
+    app.cli.add_command(purge_revoked_tokens)
+
+
+@click.command('sync-search')
+@click.option('--batch-size', default=500, show_default=True, help='Outbox rows claimed per bulk request.')
+@click.option('--loop', is_flag=True, help='Keep draining until interrupted.')
+@click.option('--interval', default=2.0, show_default=True, help='Seconds to sleep when the outbox is empty.')
+@click.option('--es-url', default=None, help='Elasticsearch URL, defaults to the application client.')
+@with_appcontext
+def sync_search(batch_size, loop, interval, es_url):
+    """Drain the search outbox into Elasticsearch."""
+    from app.service.search_outbox_service import SearchOutboxService
+
+    client = Elasticsearch([es_url]) if es_url else None
+
+    while True:
+        stats = SearchOutboxService.drain(batch_size=batch_size, client=client)
+        db.session.remove()
+        if stats['processed']:
+            click.echo(
+                f"processed={stats['processed']} indexed={stats['indexed']} "
+                f"deleted={stats['deleted']} failed={stats['failed']}"
+            )
+
+        if not loop:
+            break
+        if stats['processed'] < batch_size:
+            time.sleep(interval)
+
+
+@click.command('reindex-products')
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows fetched and documents sent per bulk request.')
+@click.option('--threads', default=4, show_default=True, help='Concurrent bulk requests.')
+@click.option('--replicas', default=1, show_default=True, help='Replica count set on the new index after loading.')
+@click.option('--delete-old', is_flag=True, help='Delete the indices the alias pointed to before the swap.')
+@click.option('--es-url', default=None, help='Elasticsearch URL, defaults to the application client.')
+@with_appcontext
+def reindex_products(chunk_size, threads, replicas, delete_old, es_url):
+    """Rebuild the products index into a new versioned index and swap the alias."""
+    from app.service.search_index_service import SearchIndexService
+
+    def progress(done, total, elapsed):
+        rate = done / elapsed if elapsed else 0
+        click.echo(f"{done}/{total} documents ({rate:.0f} docs/s)")
+
+    client = Elasticsearch([es_url]) if es_url else None
+    summary = SearchIndexService.reindex(
+        chunk_size=chunk_size,
+        thread_count=threads,
+        replicas=replicas,
+        client=client,
+        delete_old=delete_old,
+        progress=progress
+    )
+
+    click.echo(
+        f"{summary['index']}: indexed={summary['indexed']}/{summary['total']} failed={summary['failed']} "
+        f"in {summary['seconds']}s ({summary['docs_per_second']} docs/s), replayed={summary['replayed']}"
+    )
+    if not summary['swapped']:
+        raise click.ClickException(f"Alias not swapped, {summary['index']} left in place for inspection.")
+    if summary['replay_failed']:
+        click.echo(f"Replay failed for {summary['replay_failed']} products; run sync-search or reindex again.")
+    if summary['removed']:
+        click.echo(f"Removed: {', '.join(summary['removed'])}")
+
+
+@click.command('purge-idempotency-keys')
+@click.option('--batch-size', default=1000, show_default=True, help='Rows deleted per transaction.')
+@with_appcontext
+def purge_idempotency_keys(batch_size):
+    """Delete expired idempotency keys."""
+    from app.service.idempotency_service import IdempotencyService
+
+    deleted = IdempotencyService.purge_expired(batch_size=batch_size)
+    click.echo(f"deleted={deleted}")
+
+
+@click.command('purge-revoked-tokens')
+@click.option('--batch-size', default=1000, show_default=True, help='Rows deleted per transaction.')
+@with_appcontext
+def purge_revoked_tokens(batch_size):
+    """Delete revoked-token entries whose tokens have expired anyway."""
+    from app.service.token_revocation_service import TokenRevocationService
+
+    deleted = TokenRevocationService.purge_expired(batch_size=batch_size)
+    click.echo(f"deleted={deleted}")
+
+
+@click.command('rebuild-sales-rollups')
+@click.option('--from', 'start', default=None, help='First day (YYYY-MM-DD) to rebuild; all days when omitted.')
+@with_appcontext
+def rebuild_sales_rollups(start):
+    """Recompute sales rollups from orders and order items."""
+    from datetime import date
+    from app.service.report_service import ReportService
+
+    rows = ReportService.rebuild(date.fromisoformat(start) if start else None)
+    click.echo(f"sales_rollups rows={rows}")
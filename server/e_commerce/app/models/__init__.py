@@ -1,21 +1,33 @@
 from app.models.user import User
 from app.models.address import Address
-from app.models.category import Category
-from app.models.product import Product
+from app.models.category import Category, CategoryClosure
+from app.models.product import Product, ProductStockShard
 from app.models.product_image import ProductImage
 from app.models.cart import Cart, CartItem
 from app.models.order import Order, OrderItem
 from app.models.favorite import Favorite
+from app.models.catalog_version import CatalogVersion
+from app.models.search_outbox import SearchOutbox
+from app.models.idempotency_key import IdempotencyKey
+from app.models.sales_rollup import SalesRollup
+from app.models.revoked_token import RevokedToken
 __all__ = [
     'User',
     'Address',
     'Category',
+    'CategoryClosure',
     'Product',
+    'ProductStockShard',
     'ProductImage',
     'Cart',
     'CartItem',
     'Order',
     'OrderItem',
-    'Favorite'
+    'Favorite',
+    'CatalogVersion',
+    'SearchOutbox',
+    'IdempotencyKey',
+    'SalesRollup',
+    'RevokedToken'
 ]
 
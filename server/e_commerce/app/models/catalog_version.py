@@ -0,0 +1,9 @@
+from app import db
+from datetime import datetime
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
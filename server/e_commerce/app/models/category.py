@@ -13,4 +13,12 @@ class Category(db.Model):
     products = db.relationship('Product', backref='category', lazy=True)
 
 
+class CategoryClosure(db.Model):
+    __tablename__ = 'category_closure'
+
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('categories.id'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('categories.id'), primary_key=True, index=True)
+    depth = db.Column(db.Integer, nullable=False)
+
+
 
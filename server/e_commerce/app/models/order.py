@@ -8,7 +8,7 @@ class Order(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     total_price = db.Column(db.Numeric(10, 2), nullable=False)
     status = db.Column(db.String(50), default='pending', nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     shipping_title = db.Column(db.String(100), nullable=False)
     shipping_city = db.Column(db.String(100), nullable=False)
@@ -17,15 +17,23 @@ class Order(db.Model):
     # Relationships
     items = db.relationship('OrderItem', backref='order', lazy=True, cascade='all, delete-orphan')
 
+    __table_args__ = (
+        db.Index('ix_orders_created_at_id', db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('ix_orders_status_created_at_id', 'status', db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('ix_orders_user_created_at_id', 'user_id', db.text('created_at DESC'), db.text('id DESC')),
+    )
+
 
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     unit_price = db.Column(db.Numeric(10, 2), nullable=False)
+    product_name = db.Column(db.String(200), nullable=False)
+    image_url = db.Column(db.String(500), nullable=True)
 
 
 
@@ -1,4 +1,5 @@
 from app import db
+from datetime import datetime
 
 class Product(db.Model):
     __tablename__ = 'products'
@@ -10,11 +11,49 @@ class Product(db.Model):
     description = db.Column(db.Text)
     price = db.Column(db.Numeric(10, 2), nullable=False)
     stock = db.Column(db.Integer, default=0, nullable=False)
+    is_stock_sharded = db.Column(db.Boolean, default=False, nullable=False)
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
     deleted_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
     # Relationships
     images = db.relationship('ProductImage', backref='product', lazy=True, cascade='all, delete-orphan')
     cart_items = db.relationship('CartItem', backref='product', lazy=True)
     order_items = db.relationship('OrderItem', backref='product', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_products_live_price_id', 'price', 'id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_products_live_name_id', 'name', 'id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_products_category_live_id', 'category_id', 'id',
+                 postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_products_category_live_price_id', 'category_id', 'price', 'id',
+                 postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_products_category_live_name_id', 'category_id', 'name', 'id',
+                 postgresql_where=db.text('is_deleted = false')),
+    )
 
+
+class ProductStockShard(db.Model):
+    __tablename__ = 'product_stock_shards'
+
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    shard_no = db.Column(db.Integer, primary_key=True)
+    quantity = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.CheckConstraint('quantity >= 0', name='ck_product_stock_shards_quantity'),
+    )
+
+
+Product.available_stock = db.column_property(
+    db.case(
+        (
+            Product.is_stock_sharded,
+            db.select(db.func.coalesce(db.func.sum(ProductStockShard.quantity), 0))
+            .where(ProductStockShard.product_id == Product.id)
+            .correlate_except(ProductStockShard)
+            .scalar_subquery()
+        ),
+        else_=Product.stock
+    )
+)
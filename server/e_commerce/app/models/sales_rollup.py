@@ -0,0 +1,15 @@
+from app import db
+
+class SalesRollup(db.Model):
+    __tablename__ = 'sales_rollups'
+
+    day = db.Column(db.Date, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), primary_key=True)
+    # Checkouts of the same product on the same day write to different rows, chosen by order id.
+    shard = db.Column(db.SmallInteger, primary_key=True)
+    units = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_sales_rollups_product_day', 'product_id', 'day'),
+    )
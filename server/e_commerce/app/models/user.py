@@ -1,6 +1,5 @@
-from app import db
+from app import db, password_hasher
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -11,10 +10,19 @@ class User(db.Model):
     password = db.Column(db.String(255), nullable=False)
     phone = db.Column(db.String(20))
     role = db.Column(db.String(20), nullable=False, default='customer')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
     deleted_at = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('ix_users_role_created_at_id', 'role', db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('ix_users_email_lower_pattern', db.text('lower(email) text_pattern_ops')).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_users_fullname_lower_trgm', db.text('lower(fullname) gin_trgm_ops'), postgresql_using='gin'
+        ).ddl_if(dialect='postgresql'),
+    )
+
     # Relationships
     addresses = db.relationship('Address', backref='user', lazy=True, cascade='all, delete-orphan')
     products = db.relationship('Product', backref='seller', lazy=True, foreign_keys='Product.seller_id')
@@ -22,10 +30,13 @@ class User(db.Model):
     orders = db.relationship('Order', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        matches, new_hash = password_hasher.verify(self.password, password)
+        if new_hash:
+            self.password = new_hash
+        return matches
 
 
 
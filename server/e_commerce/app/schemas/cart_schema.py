@@ -2,12 +2,13 @@ from marshmallow import Schema, fields, validate
 from app.schemas.product_schema import ProductSchema
 
 
+QUANTITY_RANGE = validate.Range(min=1, max=10, error="Bir seferde en az 1, en fazla 10 adet ekleyebilirsiniz.")
+
+
 class CartItemSchema(Schema):
     id = fields.Int(dump_only=True)
     product_id = fields.Int(required=True, load_only=True)
-    quantity = fields.Int(
-        load_default=1,
-        validate=validate.Range(min=1, max=10, error="Bir seferde en az 1, en fazla 10 adet ekleyebilirsiniz."))
+    quantity = fields.Int(load_default=1, validate=QUANTITY_RANGE)
     product = fields.Nested(ProductSchema(only=("id", "name", "price", "images", "stock")), dump_only=True)
     subtotal = fields.Method("get_subtotal", dump_only=True)
 
@@ -17,6 +18,12 @@ class CartItemSchema(Schema):
         return 0.0
 
 
+class CartOperationSchema(Schema):
+    product_id = fields.Int(required=True)
+    op = fields.Str(load_default='add', validate=validate.OneOf(['add', 'set', 'remove']))
+    quantity = fields.Int(load_default=1, validate=QUANTITY_RANGE)
+
+
 class CartSchema(Schema):
     id = fields.Int(dump_only=True)
     user_id = fields.Int(dump_only=True)
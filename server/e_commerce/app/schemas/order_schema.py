@@ -1,14 +1,22 @@
 from marshmallow import Schema, fields, validate
-from app.schemas.product_schema import ProductSchema
 
 class OrderItemSchema(Schema):
     id = fields.Int(dump_only=True)
     product_id = fields.Int(dump_only=True)
     quantity = fields.Int(dump_only=True)
     unit_price = fields.Float(dump_only=True)
-    product = fields.Nested(ProductSchema(only=("id", "name", "images")), dump_only=True)
+    product_name = fields.Str(dump_only=True)
+    image_url = fields.Str(dump_only=True)
+    product = fields.Method("get_product", dump_only=True)
     subtotal = fields.Method("get_subtotal", dump_only=True)
 
+    def get_product(self, obj):
+        return {
+            "id": obj.product_id,
+            "name": obj.product_name,
+            "images": [{"url": obj.image_url}] if obj.image_url else []
+        }
+
     def get_subtotal(self, obj):
         return float(obj.unit_price) * obj.quantity
 
@@ -13,4 +13,9 @@ class ProductSchema(Schema):
     stock = fields.Int(validate=validate.Range(min=0), load_default=0)
     category_id = fields.Int(required=True)
     category_name = fields.Function(lambda obj: obj.category.name if obj.category else None, dump_only=True)
-    images = fields.List(fields.Nested(ProductImageSchema), dump_only=True)
\ No newline at end of file
+    images = fields.List(fields.Nested(ProductImageSchema), dump_only=True)
+
+    def get_attribute(self, obj, attr, default):
+        if attr == 'stock':
+            return obj.available_stock
+        return super().get_attribute(obj, attr, default)
@@ -1,5 +1,6 @@
 from app import db
 from app.models.user import User
+from app.utils.password_hasher import PasswordHasherBusy
 from flask_jwt_extended import create_access_token, create_refresh_token
 from datetime import datetime
 
@@ -19,10 +20,10 @@ class AuthService:
                 existing_user.fullname = data['fullname']
                 existing_user.phone = data.get('phone')
                 existing_user.role = 'customer'
-                existing_user.set_password(data['password'])
                 existing_user.created_at = datetime.utcnow()
 
                 try:
+                    existing_user.set_password(data['password'])
                     db.session.commit()
                     return existing_user, None
                 except Exception as e:
@@ -34,9 +35,9 @@ class AuthService:
             phone=data.get('phone'),
             role='customer'
         )
-        user.set_password(data['password'])
 
         try:
+            user.set_password(data['password'])
             db.session.add(user)
             db.session.commit()
             return user, None
@@ -51,13 +52,22 @@ class AuthService:
 
         user = User.query.filter_by(email=email, is_deleted=False).first()
 
-        if not user or not user.check_password(password):
-            return None, "Invalid email or password"
+        try:
+            if not user or not user.check_password(password):
+                return None, "Invalid email or password"
+        except PasswordHasherBusy as e:
+            return None, str(e)
+
+        if db.session.is_modified(user):
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
 
         additional_claims = {"role": user.role}
 
         access_token = create_access_token(identity=str(user.id), additional_claims=additional_claims)
-        refresh_token = create_refresh_token(identity=str(user.id))
+        refresh_token = create_refresh_token(identity=str(user.id), additional_claims=additional_claims)
 
         return {
             'user': user,
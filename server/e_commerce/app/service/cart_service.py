@@ -1,14 +1,20 @@
-from sqlalchemy.orm import joinedload
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert
 from app import db
 from app.models.cart import Cart, CartItem
 from app.models.product import Product
+from app.service.eager_loading import eager
+
+CART_LOADS = ('items.product.category', 'items.product.images')
+
+MAX_ITEM_QUANTITY = 10
 
 
 class CartService:
     @staticmethod
     def get_cart(user_id):
         cart = Cart.query \
-            .options(joinedload(Cart.items).joinedload(CartItem.product)) \
+            .options(*eager(Cart, *CART_LOADS)) \
             .filter_by(user_id=user_id) \
             .first()
 
@@ -16,68 +22,141 @@ class CartService:
 
     @staticmethod
     def get_or_create_cart(user_id):
-        cart = Cart.query.filter_by(user_id=user_id).first()
-        if not cart:
-            cart = Cart(user_id=user_id)
-            try:
-                db.session.add(cart)
-                db.session.commit()
-                return cart, None
-            except Exception as e:
-                db.session.rollback()
-                return None, str(e)
-        return cart, None
+        cart_id = db.session.query(Cart.id).filter_by(user_id=user_id).scalar()
+        if cart_id is None:
+            cart_id = db.session.execute(
+                insert(Cart)
+                .values(user_id=user_id, created_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=['user_id'])
+                .returning(Cart.id)
+            ).scalar()
+        if cart_id is None:
+            cart_id = db.session.query(Cart.id).filter_by(user_id=user_id).scalar()
+        return cart_id
 
     @staticmethod
     def add_item_to_cart(user_id, data):
         quantity = data['quantity']
         product_id = data['product_id']
 
-        max_item_limit = 10
+        try:
+            cart_id = CartService.get_or_create_cart(user_id)
 
-        cart, error = CartService.get_or_create_cart(user_id)
-        if error:
-            return None, error
+            stmt = insert(CartItem).from_select(
+                ['cart_id', 'product_id', 'quantity'],
+                db.select(db.literal(cart_id), Product.id, db.literal(quantity))
+                .where(Product.id == product_id, Product.is_deleted == False, Product.available_stock >= quantity)
+            )
+            new_quantity = CartItem.quantity + stmt.excluded.quantity
+            available = db.select(Product.available_stock) \
+                .where(Product.id == product_id) \
+                .scalar_subquery()
+
+            # The cap and the stock check run inside the upsert, so concurrent adds cannot overshoot either.
+            row = db.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=['cart_id', 'product_id'],
+                    set_={'quantity': new_quantity},
+                    where=(new_quantity <= MAX_ITEM_QUANTITY) & (available >= new_quantity)
+                ).returning(CartItem.id)
+            ).first()
+
+            if row is None:
+                error = CartService._add_item_error(cart_id, product_id, quantity)
+                db.session.rollback()
+                return None, error
 
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+
+        return CartItem.query.options(*eager(CartItem, 'product.images')).filter_by(id=row.id).first(), None
+
+    @staticmethod
+    def _add_item_error(cart_id, product_id, quantity):
         product = Product.query.filter_by(id=product_id, is_deleted=False).first()
         if not product:
-            return None, "Product not found"
+            return "Product not found"
 
-        if product.stock < quantity:
-            return None, f"Insufficient stock. Available: {product.stock}"
+        if product.available_stock < quantity:
+            return f"Insufficient stock. Available: {product.available_stock}"
 
-        cart_item = CartItem.query.filter_by(cart_id=cart.id, product_id=product_id).first()
-
-        current_quantity_in_cart = cart_item.quantity if cart_item else 0
+        current_quantity_in_cart = db.session.query(CartItem.quantity) \
+            .filter_by(cart_id=cart_id, product_id=product_id) \
+            .scalar() or 0
         new_total_quantity = current_quantity_in_cart + quantity
 
-        if new_total_quantity > max_item_limit:
-            return None, f"Bir üründen en fazla {max_item_limit} adet alabilirsiniz. Sepetinizde zaten {current_quantity_in_cart} adet var."
-
-        if product.stock < new_total_quantity:
-            return None, f"Stok yetersiz. Toplam istenen: {new_total_quantity}, Stoktaki: {product.stock}"
+        if new_total_quantity > MAX_ITEM_QUANTITY:
+            return f"Bir üründen en fazla {MAX_ITEM_QUANTITY} adet alabilirsiniz. Sepetinizde zaten {current_quantity_in_cart} adet var."
 
-        if cart_item:
-            cart_item.quantity = new_total_quantity
-        else:
-            cart_item = CartItem(
-                cart_id=cart.id,
-                product_id=product_id,
-                quantity=quantity
-            )
-            db.session.add(cart_item)
+        return f"Stok yetersiz. Toplam istenen: {new_total_quantity}, Stoktaki: {product.available_stock}"
 
+    @staticmethod
+    def apply_operations(user_id, operations):
         try:
+            cart_id = CartService.get_or_create_cart(user_id)
+
+            product_ids = {operation['product_id'] for operation in operations}
+            products = {
+                product.id: product
+                for product in Product.query.filter(Product.id.in_(product_ids), Product.is_deleted == False)
+            }
+            items = {
+                item.product_id: item
+                for item in CartItem.query.filter_by(cart_id=cart_id).with_for_update()
+            }
+
+            quantities = {product_id: item.quantity for product_id, item in items.items()}
+            for index, operation in enumerate(operations):
+                product_id = operation['product_id']
+                if operation['op'] == 'remove':
+                    quantities[product_id] = 0
+                    continue
+
+                product = products.get(product_id)
+                if not product:
+                    db.session.rollback()
+                    return None, f"items[{index}]: Product not found"
+
+                current_quantity = quantities.get(product_id, 0)
+                quantity = operation['quantity'] + (current_quantity if operation['op'] == 'add' else 0)
+                if quantity > MAX_ITEM_QUANTITY:
+                    db.session.rollback()
+                    return None, f"items[{index}]: Bir üründen en fazla {MAX_ITEM_QUANTITY} adet alabilirsiniz."
+                if product.available_stock < quantity:
+                    db.session.rollback()
+                    return None, f"items[{index}]: Insufficient stock. Available: {product.available_stock}"
+                quantities[product_id] = quantity
+
+            removed, updated, added = [], [], []
+            for product_id, quantity in quantities.items():
+                item = items.get(product_id)
+                if quantity == 0:
+                    if item:
+                        removed.append(item.id)
+                elif item:
+                    if item.quantity != quantity:
+                        updated.append({'id': item.id, 'quantity': quantity})
+                else:
+                    added.append({'cart_id': cart_id, 'product_id': product_id, 'quantity': quantity})
+
+            if removed:
+                db.session.execute(db.delete(CartItem).where(CartItem.id.in_(removed)))
+            if updated:
+                db.session.execute(db.update(CartItem), updated)
+            if added:
+                db.session.execute(db.insert(CartItem), added)
+
             db.session.commit()
-            return cart_item, None
         except Exception as e:
             db.session.rollback()
             return None, str(e)
 
+        return CartService.get_cart(user_id), None
+
     @staticmethod
     def update_cart_item(user_id, cart_item_id, quantity):
-        max_item_limit = 10
-
         cart_item = CartItem.query.join(Cart).filter(
             CartItem.id == cart_item_id,
             Cart.user_id == user_id
@@ -86,14 +165,14 @@ class CartService:
         if not cart_item:
             return None, "Cart item not found"
 
-        if quantity > max_item_limit:
-            return None, f"Bir üründen en fazla {max_item_limit} adet alabilirsiniz."
+        if quantity > MAX_ITEM_QUANTITY:
+            return None, f"Bir üründen en fazla {MAX_ITEM_QUANTITY} adet alabilirsiniz."
 
         if cart_item.product.is_deleted:
             return None, "This product is no longer available"
 
-        if cart_item.product.stock < quantity:
-            return None, f"Insufficient stock. Available: {cart_item.product.stock}"
+        if cart_item.product.available_stock < quantity:
+            return None, f"Insufficient stock. Available: {cart_item.product.available_stock}"
 
         cart_item.quantity = quantity
 
@@ -0,0 +1,21 @@
+from datetime import datetime
+from app import db
+from app.models.catalog_version import CatalogVersion
+
+
+class CatalogVersionService:
+    @staticmethod
+    def get_version(name):
+        version = db.session.query(CatalogVersion.version).filter_by(name=name).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump(*names):
+        for name in names:
+            result = db.session.execute(
+                db.update(CatalogVersion)
+                .where(CatalogVersion.name == name)
+                .values(version=CatalogVersion.version + 1, updated_at=datetime.utcnow())
+            )
+            if result.rowcount == 0:
+                db.session.add(CatalogVersion(name=name, version=1, updated_at=datetime.utcnow()))
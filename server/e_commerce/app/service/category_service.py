@@ -1,24 +1,145 @@
+import threading
+from collections import defaultdict
 from app import db
-from app.models.category import Category
+from app.models.category import Category, CategoryClosure
+from app.service.product_cache import invalidate_catalog
+from app.service.catalog_version_service import CatalogVersionService
 from datetime import datetime
 
 
+class CategoryTree:
+    def __init__(self, version, rows):
+        self.version = version
+        self.nodes = {}
+        self.children = defaultdict(list)
+        self._branches = {}
+
+        for category_id, name, parent_id in rows:
+            self.nodes[category_id] = {'id': category_id, 'name': name, 'parent_id': parent_id}
+            self.children[parent_id].append(category_id)
+
+    def roots(self):
+        return [self.subtree(category_id) for category_id in self.children[None]]
+
+    def all(self):
+        return [self.subtree(category_id) for category_id in self.nodes]
+
+    def child_nodes(self, parent_id):
+        return [self.subtree(category_id) for category_id in self.children.get(parent_id, [])]
+
+    def subtree(self, category_id, include_parent=True):
+        node = self.nodes.get(category_id)
+        if node is None:
+            return None
+
+        branch = self._branches.get(category_id)
+        if branch is None:
+            branch = {
+                'id': node['id'],
+                'name': node['name'],
+                'children': [
+                    self.subtree(child_id, include_parent=False) for child_id in self.children.get(category_id, [])
+                ]
+            }
+            self._branches[category_id] = branch
+
+        if include_parent:
+            return {**branch, 'parent_id': node['parent_id']}
+        return branch
+
+    def breadcrumbs(self, category_id):
+        trail = []
+        node = self.nodes.get(category_id)
+        while node is not None:
+            trail.append({'id': node['id'], 'name': node['name']})
+            node = self.nodes.get(node['parent_id'])
+        return list(reversed(trail)) if trail else None
+
+
+_tree = None
+_tree_lock = threading.Lock()
+
+
 class CategoryService:
     @staticmethod
-    def get_all_categories():
-        return Category.query.filter_by(is_deleted=False).all()
+    def get_tree():
+        global _tree
+        version = CatalogVersionService.get_version('categories')
+        tree = _tree
+        if tree is not None and tree.version == version:
+            return tree
+
+        with _tree_lock:
+            if _tree is None or _tree.version != version:
+                rows = db.session.query(Category.id, Category.name, Category.parent_id) \
+                    .filter_by(is_deleted=False) \
+                    .order_by(Category.id) \
+                    .all()
+                _tree = CategoryTree(version, rows)
+            return _tree
 
     @staticmethod
-    def get_category_by_id(category_id):
-        return Category.query.filter_by(id=category_id, is_deleted=False).first()
+    def invalidate_tree():
+        global _tree
+        _tree = None
 
     @staticmethod
-    def get_root_categories():
-        return Category.query.filter_by(parent_id=None, is_deleted=False).all()
+    def descendant_ids_query(category_id):
+        return db.select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
 
     @staticmethod
-    def get_child_categories(parent_id):
-        return Category.query.filter_by(parent_id=parent_id, is_deleted=False).all()
+    def get_descendant_ids(category_id):
+        return db.session.scalars(CategoryService.descendant_ids_query(category_id)).all()
+
+    @staticmethod
+    def get_ancestor_ids(*category_ids):
+        rows = db.session.query(CategoryClosure.ancestor_id) \
+            .filter(CategoryClosure.descendant_id.in_(category_ids)) \
+            .distinct() \
+            .all()
+        return [row.ancestor_id for row in rows]
+
+    @staticmethod
+    def _add_closure(category_id, parent_id):
+        db.session.add(CategoryClosure(ancestor_id=category_id, descendant_id=category_id, depth=0))
+        if parent_id is not None:
+            db.session.execute(
+                db.insert(CategoryClosure).from_select(
+                    ['ancestor_id', 'descendant_id', 'depth'],
+                    db.select(CategoryClosure.ancestor_id, db.literal(category_id), CategoryClosure.depth + 1)
+                    .where(CategoryClosure.descendant_id == parent_id)
+                )
+            )
+
+    @staticmethod
+    def _move_closure(category_id, new_parent_id):
+        subtree = db.select(CategoryClosure.descendant_id) \
+            .where(CategoryClosure.ancestor_id == category_id) \
+            .scalar_subquery()
+
+        db.session.execute(
+            db.delete(CategoryClosure)
+            .where(CategoryClosure.descendant_id.in_(subtree))
+            .where(CategoryClosure.ancestor_id.not_in(subtree))
+        )
+
+        if new_parent_id is not None:
+            above = db.aliased(CategoryClosure)
+            below = db.aliased(CategoryClosure)
+            db.session.execute(
+                db.insert(CategoryClosure).from_select(
+                    ['ancestor_id', 'descendant_id', 'depth'],
+                    db.select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                    .select_from(above)
+                    .join(below, db.true())
+                    .where(above.descendant_id == new_parent_id)
+                    .where(below.ancestor_id == category_id)
+                )
+            )
+
+    @staticmethod
+    def get_category_by_id(category_id):
+        return Category.query.filter_by(id=category_id, is_deleted=False).first()
 
     @staticmethod
     def create_category(data, requesting_user):
@@ -38,7 +159,11 @@ class CategoryService:
 
         try:
             db.session.add(category)
+            db.session.flush()
+            CategoryService._add_closure(category.id, parent_id)
+            CatalogVersionService.bump('categories')
             db.session.commit()
+            CategoryService.invalidate_tree()
             return category, None
         except Exception as e:
             db.session.rollback()
@@ -63,11 +188,24 @@ class CategoryService:
                 if not new_parent or new_parent.is_deleted:
                     return None, "Parent category not found"
 
+                is_descendant = CategoryClosure.query.filter_by(
+                    ancestor_id=category.id, descendant_id=new_parent_id
+                ).first()
+                if is_descendant:
+                    return None, "A category cannot be moved under its own subcategory"
+
+        reparented = 'parent_id' in data and data['parent_id'] != category.parent_id
+
         for key, value in data.items():
             setattr(category, key, value)
 
         try:
+            if reparented:
+                CategoryService._move_closure(category.id, category.parent_id)
+            CatalogVersionService.bump('categories')
             db.session.commit()
+            CategoryService.invalidate_tree()
+            invalidate_catalog()
             return category, None
         except Exception as e:
             db.session.rollback()
@@ -89,7 +227,13 @@ class CategoryService:
         try:
             category.is_deleted = True
             category.deleted_at = datetime.utcnow()
+            CategoryClosure.query.filter(
+                db.or_(CategoryClosure.ancestor_id == category_id, CategoryClosure.descendant_id == category_id)
+            ).delete(synchronize_session=False)
+            CatalogVersionService.bump('categories')
             db.session.commit()
+            CategoryService.invalidate_tree()
+            invalidate_catalog()
             return True, None
         except Exception as e:
             db.session.rollback()
@@ -0,0 +1,19 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def eager(model, *paths):
+    options = []
+    for path in paths:
+        loader = None
+        current = model
+        for name in path.split('.'):
+            attribute = getattr(current, name)
+            relationship = attribute.property
+            strategy = selectinload if relationship.uselist else joinedload
+            if loader is None:
+                loader = strategy(attribute)
+            else:
+                loader = getattr(loader, strategy.__name__)(attribute)
+            current = relationship.mapper.class_
+        options.append(loader)
+    return options
@@ -1,6 +1,9 @@
 from app import db
 from app.models.favorite import Favorite
 from app.models.product import Product
+from app.service.eager_loading import eager
+
+FAVORITE_LOADS = ('product.category', 'product.images')
 
 
 class FavoriteService:
@@ -26,7 +29,10 @@ class FavoriteService:
 
     @staticmethod
     def get_user_favorites(user_id):
-        return Favorite.query.filter_by(user_id=user_id).order_by(Favorite.created_at.desc()).all()
+        return Favorite.query.options(*eager(Favorite, *FAVORITE_LOADS)) \
+            .filter_by(user_id=user_id) \
+            .order_by(Favorite.created_at.desc()) \
+            .all()
 
     @staticmethod
     def remove_favorite(user_id, product_id):
@@ -0,0 +1,118 @@
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyService:
+    @staticmethod
+    def _config(name, default):
+        return current_app.config.get(name, default)
+
+    @staticmethod
+    def begin(user_id, key, request_hash):
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=IdempotencyService._config('IDEMPOTENCY_TTL_HOURS', 24))
+
+        try:
+            record = IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash, expires_at=expires_at)
+            db.session.add(record)
+            db.session.commit()
+            return record, None
+        except IntegrityError:
+            db.session.rollback()
+
+        deadline = time.monotonic() + IdempotencyService._config('IDEMPOTENCY_WAIT_SECONDS', 5)
+        lock_timeout = timedelta(seconds=IdempotencyService._config('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+
+        while True:
+            record = IdempotencyKey.query.filter_by(user_id=user_id, key=key).populate_existing().first()
+            now = datetime.utcnow()
+
+            # A key whose order already committed is never taken over, however long ago it was locked.
+            if record is None or record.expires_at <= now or \
+                    (record.status == 'in_progress' and record.order_id is None and record.locked_at <= now - lock_timeout):
+                claimed = IdempotencyService._claim(user_id, key, request_hash, record, expires_at)
+                if claimed:
+                    return claimed, None
+                continue
+
+            if record.request_hash != request_hash:
+                return None, "Idempotency-Key farklı bir istekle kullanılmış"
+
+            if record.status == 'completed' or record.order_id is not None:
+                return record, None
+
+            if time.monotonic() >= deadline:
+                return None, "Aynı Idempotency-Key ile bir istek hâlâ işleniyor"
+            db.session.rollback()
+            time.sleep(0.1)
+
+    @staticmethod
+    def _claim(user_id, key, request_hash, stale, expires_at):
+        # Expired keys and keys abandoned mid-request are taken over by exactly one caller.
+        now = datetime.utcnow()
+        if stale is None:
+            try:
+                record = IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash, expires_at=expires_at)
+                db.session.add(record)
+                db.session.commit()
+                return record
+            except IntegrityError:
+                db.session.rollback()
+                return None
+
+        claimed = db.session.execute(
+            db.update(IdempotencyKey)
+            .where(
+                IdempotencyKey.id == stale.id,
+                IdempotencyKey.locked_at == stale.locked_at,
+                IdempotencyKey.order_id.is_(None) | (IdempotencyKey.expires_at <= now)
+            )
+            .values(
+                request_hash=request_hash, status='in_progress', response_code=None, response_body=None,
+                order_id=None, locked_at=now, created_at=now, expires_at=expires_at
+            )
+        ).rowcount
+        db.session.commit()
+        return IdempotencyKey.query.get(stale.id) if claimed else None
+
+    @staticmethod
+    def attach_order(record_id, order_id):
+        # Called inside the order's transaction, so the key points at the order from the moment it commits.
+        db.session.execute(
+            db.update(IdempotencyKey).where(IdempotencyKey.id == record_id).values(order_id=order_id)
+        )
+
+    @staticmethod
+    def complete(record_id, response_code, response_body):
+        db.session.execute(
+            db.update(IdempotencyKey)
+            .where(IdempotencyKey.id == record_id)
+            .values(status='completed', response_code=response_code, response_body=response_body)
+        )
+        db.session.commit()
+
+    @staticmethod
+    def release(record_id):
+        db.session.rollback()
+        IdempotencyKey.query.filter_by(id=record_id, status='in_progress', order_id=None).delete()
+        db.session.commit()
+
+    @staticmethod
+    def purge_expired(batch_size=1000):
+        deleted = 0
+        while True:
+            expired = db.select(IdempotencyKey.id) \
+                .where(IdempotencyKey.expires_at <= datetime.utcnow()) \
+                .limit(batch_size) \
+                .scalar_subquery()
+            count = db.session.execute(
+                db.delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired))
+            ).rowcount
+            db.session.commit()
+            deleted += count
+            if count < batch_size:
+                return deleted
@@ -0,0 +1,135 @@
+from datetime import datetime
+from app import db
+from app.models.product import Product, ProductStockShard
+from app.service.category_service import CategoryService
+from app.service.product_cache import invalidate_product
+from app.service.search_outbox_service import SearchOutboxService
+
+MAX_SHARD_COUNT = 64
+
+
+class InventoryService:
+    @staticmethod
+    def get_stock_shards(product_id):
+        product = Product.query.filter_by(id=product_id, is_deleted=False).first()
+        if not product:
+            return None, "Ürün bulunamadı"
+
+        shards = ProductStockShard.query.filter_by(product_id=product_id).order_by(ProductStockShard.shard_no).all()
+        return {
+            'product_id': product.id,
+            'is_stock_sharded': product.is_stock_sharded,
+            'stock': product.available_stock,
+            'shards': [{'shard_no': shard.shard_no, 'quantity': shard.quantity} for shard in shards]
+        }, None
+
+    @staticmethod
+    def _distribute(product, total, shard_count):
+        ProductStockShard.query.filter_by(product_id=product.id).delete(synchronize_session=False)
+
+        if shard_count:
+            base, extra = divmod(total, shard_count)
+            db.session.add_all([
+                ProductStockShard(product_id=product.id, shard_no=shard_no, quantity=base + (1 if shard_no < extra else 0))
+                for shard_no in range(shard_count)
+            ])
+            product.stock = 0
+        else:
+            product.stock = total
+
+        product.is_stock_sharded = bool(shard_count)
+        product.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def _lock_shards(product_id):
+        return ProductStockShard.query.filter_by(product_id=product_id) \
+            .order_by(ProductStockShard.shard_no) \
+            .with_for_update() \
+            .all()
+
+    @staticmethod
+    def set_stock(product, total):
+        # Same lock order as rebalance and checkout: the product row, then its shards by shard_no.
+        # Only the row is locked here, so pending changes on `product` are not reloaded over.
+        db.session.query(Product.id).filter_by(id=product.id).with_for_update().one()
+        shards = InventoryService._lock_shards(product.id)
+        InventoryService._distribute(product, total, len(shards))
+
+    @staticmethod
+    def rebalance(product_id, shard_count, requesting_user):
+        if requesting_user.role != 'admin':
+            return None, "Erişim engellendi"
+
+        if shard_count < 0 or shard_count > MAX_SHARD_COUNT:
+            return None, f"Shard sayısı 0 ile {MAX_SHARD_COUNT} arasında olmalı"
+
+        product = Product.query.filter_by(id=product_id, is_deleted=False).with_for_update().first()
+        if not product:
+            return None, "Ürün bulunamadı"
+
+        shards = InventoryService._lock_shards(product_id)
+        total = sum(shard.quantity for shard in shards) if product.is_stock_sharded else product.stock
+
+        try:
+            InventoryService._distribute(product, total, shard_count)
+            SearchOutboxService.enqueue(product.id, 'index')
+            db.session.commit()
+            invalidate_product(product.category_id, *CategoryService.get_ancestor_ids(product.category_id))
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+
+        return InventoryService.get_stock_shards(product_id)
+
+    @staticmethod
+    def reserve_sharded(product_id, quantity):
+        # A random shard that nobody else holds absorbs the whole quantity, so concurrent
+        # checkouts of the same product spread over different rows instead of queueing on one.
+        candidate = db.select(ProductStockShard.shard_no) \
+            .where(ProductStockShard.product_id == product_id, ProductStockShard.quantity >= quantity) \
+            .order_by(db.func.random()) \
+            .limit(1) \
+            .with_for_update(skip_locked=True) \
+            .scalar_subquery()
+
+        reserved = db.session.execute(
+            db.update(ProductStockShard.__table__)
+            .where(ProductStockShard.product_id == product_id)
+            .where(ProductStockShard.shard_no == candidate)
+            .where(ProductStockShard.quantity >= quantity)
+            .values(quantity=ProductStockShard.quantity - quantity)
+            .returning(ProductStockShard.shard_no)
+        ).first()
+        if reserved:
+            return True
+
+        shards = ProductStockShard.query.filter_by(product_id=product_id) \
+            .order_by(ProductStockShard.shard_no) \
+            .with_for_update() \
+            .all()
+        if sum(shard.quantity for shard in shards) < quantity:
+            return False
+
+        remaining = quantity
+        for shard in shards:
+            taken = min(shard.quantity, remaining)
+            shard.quantity -= taken
+            remaining -= taken
+            if not remaining:
+                break
+        return True
+
+    @staticmethod
+    def release_sharded(product_id, quantity):
+        candidate = db.select(ProductStockShard.shard_no) \
+            .where(ProductStockShard.product_id == product_id) \
+            .order_by(db.func.random()) \
+            .limit(1) \
+            .scalar_subquery()
+
+        db.session.execute(
+            db.update(ProductStockShard.__table__)
+            .where(ProductStockShard.product_id == product_id)
+            .where(ProductStockShard.shard_no == candidate)
+            .values(quantity=ProductStockShard.quantity + quantity)
+        )
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from flask import current_app
+from app.models.product import Product
+from app.service.search_index_service import SearchIndexService
+from app.utils.ElasticSearchService import ElasticSearchService, PRICE_BUCKETS
+from app.utils.LocalSearchIndex import LocalSearchIndex
+
+DEFAULT_RESULT_SIZE = 10
+# Rows committed slightly out of updated_at order are picked up by re-reading this window.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+_index = None
+_synced_until = None
+_checked_at = 0.0
+_sync_lock = threading.Lock()
+
+
+class LocalSearchService:
+    @staticmethod
+    def is_primary():
+        return current_app.config.get('SEARCH_BACKEND', 'elasticsearch') == 'local'
+
+    @staticmethod
+    def is_fallback():
+        return current_app.config.get('SEARCH_LOCAL_FALLBACK', False)
+
+    @staticmethod
+    def enabled():
+        return LocalSearchService.is_primary() or LocalSearchService.is_fallback()
+
+    @staticmethod
+    def init_app(app):
+        warmed = threading.Event()
+
+        def warm():
+            with app.app_context():
+                try:
+                    LocalSearchService.get_index()
+                except Exception as e:
+                    app.logger.warning(f"Yerel arama indeksi oluşturulamadı: {e}")
+
+        @app.before_request
+        def start_warmup():
+            if not warmed.is_set() and LocalSearchService.enabled():
+                warmed.set()
+                threading.Thread(target=warm, daemon=True).start()
+
+    @staticmethod
+    def get_index():
+        global _index, _synced_until, _checked_at
+        interval = current_app.config.get('SEARCH_LOCAL_SYNC_INTERVAL', 2)
+        if _index is not None and time.monotonic() - _checked_at < interval:
+            return _index
+
+        with _sync_lock:
+            if _index is None:
+                index = LocalSearchIndex()
+                synced_until = None
+                rows = SearchIndexService.document_query() \
+                    .filter(Product.is_deleted == False) \
+                    .execution_options(yield_per=1000)
+                for row in rows:
+                    index.add(ElasticSearchService.document_from_row(row, row.image_url))
+                    synced_until = max(synced_until or row.updated_at, row.updated_at)
+                _index, _synced_until = index, synced_until
+
+            elif time.monotonic() - _checked_at >= interval:
+                query = SearchIndexService.document_query()
+                if _synced_until is not None:
+                    query = query.filter(Product.updated_at > _synced_until - SYNC_OVERLAP)
+                for row in query:
+                    if row.is_deleted:
+                        _index.remove(row.id)
+                    else:
+                        _index.add(ElasticSearchService.document_from_row(row, row.image_url))
+                    _synced_until = max(_synced_until or row.updated_at, row.updated_at)
+
+            _checked_at = time.monotonic()
+            return _index
+
+    @staticmethod
+    def refresh_product(product):
+        if _index is None or not LocalSearchService.enabled():
+            return
+        if product.is_deleted:
+            _index.remove(product.id)
+        else:
+            _index.add(ElasticSearchService.build_document(product))
+
+    @staticmethod
+    def search_products(query_text):
+        index = LocalSearchService.get_index()
+        with index.lock:
+            ranked = sorted(index.score(query_text).items(), key=lambda item: (-item[1], item[0]))
+            return [dict(index.docs[doc_id]) for doc_id, _ in ranked[:DEFAULT_RESULT_SIZE]]
+
+    @staticmethod
+    def search_products_page(query_text, size, offset=0, search_after=None, category_ids=None,
+                             min_price=None, max_price=None, in_stock=False):
+        category_set = set(category_ids) if category_ids is not None else None
+
+        def in_categories(doc):
+            return category_set is None or doc['category_id'] in category_set
+
+        def in_price(doc):
+            return (min_price is None or doc['price'] >= min_price) and \
+                (max_price is None or doc['price'] <= max_price)
+
+        index = LocalSearchService.get_index()
+        with index.lock:
+            matched = [
+                (score, index.docs[doc_id]) for doc_id, score in index.score(query_text).items()
+                if not in_stock or index.docs[doc_id]['stock'] > 0
+            ]
+
+        category_counts = Counter(doc['category_id'] for _, doc in matched if in_price(doc))
+
+        price_ranges = []
+        for bucket in PRICE_BUCKETS:
+            count = sum(
+                1 for _, doc in matched
+                if in_categories(doc)
+                and ('from' not in bucket or doc['price'] >= bucket['from'])
+                and ('to' not in bucket or doc['price'] < bucket['to'])
+            )
+            price_ranges.append({'key': bucket['key'], 'from': bucket.get('from'), 'to': bucket.get('to'), 'count': count})
+
+        hits = sorted(
+            ((score, doc) for score, doc in matched if in_categories(doc) and in_price(doc)),
+            key=lambda hit: (-hit[0], hit[1]['id'])
+        )
+        total = len(hits)
+
+        if search_after is not None:
+            after = (-search_after[0], search_after[1])
+            hits = [hit for hit in hits if (-hit[0], hit[1]['id']) > after]
+        else:
+            hits = hits[offset:]
+        hits = hits[:size]
+
+        return {
+            'hits': [dict(doc) for _, doc in hits],
+            'total': total,
+            'last_sort': [hits[-1][0], hits[-1][1]['id']] if hits else None,
+            'facets': {
+                'categories': [
+                    {'category_id': category_id, 'count': count}
+                    for category_id, count in sorted(category_counts.items(), key=lambda item: (-item[1], item[0]))[:100]
+                ],
+                'price_ranges': price_ranges
+            }
+        }
@@ -3,24 +3,138 @@ from app.models import User, Address
 from app.models.order import Order, OrderItem
 from app.models.cart import Cart, CartItem
 from app.models.product import Product
+from app.models.product_image import ProductImage
 from app.service.cart_service import CartService
+from app.service.eager_loading import eager
+from app.service.idempotency_service import IdempotencyService
+from app.service.inventory_service import InventoryService
+from app.service.report_service import ReportService
+from app.service.search_outbox_service import SearchOutboxService
+from app.utils.pagination import paginate_keyset, InvalidCursor
+
+ORDER_LOADS = ('items',)
+
+ORDER_STATUSES = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
+CANCELLABLE_STATUSES = ['pending', 'processing']
+
+# Orders only move forward through fulfilment, and only unshipped ones can be cancelled.
+ORDER_TRANSITIONS = [
+    ('pending', 'processing'), ('pending', 'shipped'), ('pending', 'delivered'),
+    ('processing', 'shipped'), ('processing', 'delivered'),
+    ('shipped', 'delivered'),
+] + [(status, 'cancelled') for status in CANCELLABLE_STATUSES]
 
 
 class OrderService:
+    @staticmethod
+    def _lock_products(quantities):
+        # Locking in id order keeps concurrent checkouts over overlapping products from deadlocking.
+        # Sharded products are left unlocked; their stock lives in product_stock_shards.
+        products = {
+            product.id: product for product in Product.query
+            .filter(Product.id.in_(quantities.keys()), Product.is_deleted == False, Product.is_stock_sharded == False)
+            .order_by(Product.id)
+            .with_for_update()
+        }
+
+        missing = [product_id for product_id in quantities if product_id not in products]
+        if missing:
+            products.update({
+                product.id: product for product in Product.query
+                .filter(Product.id.in_(missing), Product.is_deleted == False, Product.is_stock_sharded == True)
+            })
+        return products
+
+    @staticmethod
+    def _reserve_stock(quantities, products):
+        plain = {pid: qty for pid, qty in quantities.items() if not products[pid].is_stock_sharded}
+        sharded = {pid: qty for pid, qty in quantities.items() if products[pid].is_stock_sharded}
+
+        if plain:
+            requested = db.values(
+                db.column('product_id', db.Integer), db.column('quantity', db.Integer), name='requested'
+            ).data(sorted(plain.items()))
+
+            rows = db.session.execute(
+                db.update(Product.__table__)
+                .where(Product.id == requested.c.product_id)
+                .where(Product.stock >= requested.c.quantity)
+                .values(stock=Product.stock - requested.c.quantity)
+                .returning(Product.id, Product.stock)
+            ).all()
+
+            # Named like the locked pre-check, so the error does not depend on which check lost the race.
+            short = sorted(set(plain) - {row.id for row in rows})
+            if short:
+                raise ValueError(f"Insufficient stock for: {', '.join(products[pid].name for pid in short)}")
+
+            for row in rows:
+                if row.stock == 0:
+                    SearchOutboxService.enqueue(row.id, 'index')
+
+        for product_id in sorted(sharded):
+            if not InventoryService.reserve_sharded(product_id, sharded[product_id]):
+                raise ValueError(f"Insufficient stock for: {products[product_id].name}")
+            if products[product_id].available_stock <= sharded[product_id]:
+                SearchOutboxService.enqueue(product_id, 'index')
+
+    @staticmethod
+    def _first_image_urls(product_ids):
+        rows = db.session.query(ProductImage.product_id, ProductImage.url) \
+            .filter(ProductImage.product_id.in_(product_ids)) \
+            .order_by(ProductImage.product_id, ProductImage.id) \
+            .all()
+
+        urls = {}
+        for product_id, url in rows:
+            urls.setdefault(product_id, url)
+        return urls
+
+    @staticmethod
+    def _order_filters(status=None, user_id=None, created_from=None, created_to=None):
+        filters = []
+        if status is not None:
+            filters.append(Order.status == status)
+        if user_id is not None:
+            filters.append(Order.user_id == user_id)
+        if created_from is not None:
+            filters.append(Order.created_at >= created_from)
+        if created_to is not None:
+            filters.append(Order.created_at < created_to)
+        return filters
+
     @staticmethod
     def get_all_orders():
-        return Order.query.order_by(Order.created_at.desc()).all()
+        return Order.query.options(*eager(Order, *ORDER_LOADS)).order_by(Order.created_at.desc()).all()
+
+    @staticmethod
+    def get_orders_page(limit, after=None, status=None, user_id=None, created_from=None, created_to=None):
+        if status is not None and status not in ORDER_STATUSES:
+            return None, f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}"
+
+        query = Order.query.options(*eager(Order, *ORDER_LOADS)) \
+            .filter(*OrderService._order_filters(status, user_id, created_from, created_to))
+
+        try:
+            orders, next_cursor = paginate_keyset(query, [Order.created_at, Order.id], limit, after, descending=True)
+        except InvalidCursor as e:
+            return None, str(e)
+
+        return {'items': orders, 'next_cursor': next_cursor}, None
 
     @staticmethod
     def get_order_by_id(order_id):
-        return Order.query.get(order_id)
+        return Order.query.options(*eager(Order, *ORDER_LOADS)).filter_by(id=order_id).first()
 
     @staticmethod
     def get_orders_by_user(user_id):
-        return Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
+        return Order.query.options(*eager(Order, *ORDER_LOADS)) \
+            .filter_by(user_id=user_id) \
+            .order_by(Order.created_at.desc()) \
+            .all()
 
     @staticmethod
-    def create_order_from_cart(user_id, address_id):
+    def create_order_from_cart(user_id, address_id, idempotency_key_id=None):
         user = User.query.filter_by(id=user_id, is_deleted=False).first()
         if not user:
             return None, "User not found"
@@ -33,14 +147,20 @@ class OrderService:
         if not address:
             return None, "Invalid delivery address"
 
+        quantities = {item.product_id: item.quantity for item in cart.items}
+        products = OrderService._lock_products(quantities)
+
         total_price = 0
 
         for item in cart.items:
-            if item.product.is_deleted:
+            product = products.get(item.product_id)
+            if not product:
+                db.session.rollback()
                 return None, f"Product '{item.product.name}' is no longer available"
-            if item.product.stock < item.quantity:
-                return None, f"Insufficient stock for: {item.product.name}"
-            total_price += float(item.product.price) * item.quantity
+            if product.available_stock < item.quantity:
+                db.session.rollback()
+                return None, f"Insufficient stock for: {product.name}"
+            total_price += float(product.price) * item.quantity
 
         order = Order(
             user_id=user_id,
@@ -55,18 +175,24 @@ class OrderService:
         try:
             db.session.add(order)
             db.session.flush()
+            image_urls = OrderService._first_image_urls(quantities.keys())
 
             for cart_item in cart.items:
                 order_item = OrderItem(
                     order_id=order.id,
                     product_id=cart_item.product_id,
                     quantity=cart_item.quantity,
-                    unit_price=cart_item.product.price
+                    unit_price=products[cart_item.product_id].price,
+                    product_name=products[cart_item.product_id].name,
+                    image_url=image_urls.get(cart_item.product_id)
                 )
                 db.session.add(order_item)
-                cart_item.product.stock -= cart_item.quantity
 
+            OrderService._reserve_stock(quantities, products)
+            ReportService.record_orders([order.id])
             CartItem.query.filter_by(cart_id=cart.id).delete()
+            if idempotency_key_id is not None:
+                IdempotencyService.attach_order(idempotency_key_id, order.id)
 
             db.session.commit()
             return order, None
@@ -76,7 +202,7 @@ class OrderService:
             return None, str(e)
 
     @staticmethod
-    def create_order_direct(user_id, address_id, items_data):
+    def create_order_direct(user_id, address_id, items_data, idempotency_key_id=None):
         user = User.query.filter_by(id=user_id, is_deleted=False).first()
         if not user:
             return None, "User not found"
@@ -85,16 +211,23 @@ class OrderService:
         if not address:
             return None, "Invalid delivery address"
 
+        quantities = {}
+        for item in items_data:
+            quantities[item['product_id']] = quantities.get(item['product_id'], 0) + item['quantity']
+
+        products = OrderService._lock_products(quantities)
+
         total_price = 0
         order_items_buffer = []
 
-        for item in items_data:
-            product = Product.query.filter_by(id=item["product_id"], is_deleted=False).first()
+        for product_id, qty in quantities.items():
+            product = products.get(product_id)
             if not product:
-                return None, f"Product ID {item['product_id']} not found"
+                db.session.rollback()
+                return None, f"Product ID {product_id} not found"
 
-            qty = item['quantity']
-            if product.stock < qty:
+            if product.available_stock < qty:
+                db.session.rollback()
                 return None, f"Insufficient stock for: {product.name}"
 
             total_price += float(product.price) * qty
@@ -118,17 +251,23 @@ class OrderService:
         try:
             db.session.add(order)
             db.session.flush()
+            image_urls = OrderService._first_image_urls(quantities.keys())
 
             for buffer_item in order_items_buffer:
                 order_item = OrderItem(
                     order_id=order.id,
                     product_id=buffer_item['product'].id,
                     quantity=buffer_item['quantity'],
-                    unit_price=buffer_item['price']
+                    unit_price=buffer_item['price'],
+                    product_name=buffer_item['product'].name,
+                    image_url=image_urls.get(buffer_item['product'].id)
                 )
                 db.session.add(order_item)
-                buffer_item['product'].stock -= buffer_item['quantity']
 
+            OrderService._reserve_stock(quantities, products)
+            ReportService.record_orders([order.id])
+            if idempotency_key_id is not None:
+                IdempotencyService.attach_order(idempotency_key_id, order.id)
             db.session.commit()
             return order, None
 
@@ -136,27 +275,179 @@ class OrderService:
             db.session.rollback()
             return None, str(e)
 
+    @staticmethod
+    def _cancel(order_ids, user_id=None):
+        # The status guard decides which orders this call cancels; only those are restocked,
+        # so a repeated or concurrent cancel of the same order cannot restock twice.
+        query = db.update(Order) \
+            .where(Order.id.in_(order_ids), Order.status.in_(CANCELLABLE_STATUSES)) \
+            .values(status='cancelled') \
+            .returning(Order.id)
+        if user_id is not None:
+            query = query.where(Order.user_id == user_id)
+
+        cancelled = db.session.scalars(query.execution_options(synchronize_session=False)).all()
+        if not cancelled:
+            return cancelled
+
+        restock = db.select(OrderItem.product_id, db.func.sum(OrderItem.quantity).label('quantity')) \
+            .where(OrderItem.order_id.in_(cancelled)) \
+            .group_by(OrderItem.product_id) \
+            .subquery('restock')
+
+        restocked = db.session.execute(
+            db.select(restock.c.product_id, restock.c.quantity, Product.is_stock_sharded)
+            .join(Product, Product.id == restock.c.product_id)
+            .order_by(restock.c.product_id)
+        ).all()
+        quantities = {row.product_id: row.quantity for row in restocked if not row.is_stock_sharded}
+
+        if quantities:
+            rows = db.session.execute(
+                db.update(Product.__table__)
+                .where(Product.id == restock.c.product_id, Product.is_stock_sharded == False)
+                .values(stock=Product.stock + restock.c.quantity)
+                .returning(Product.id, Product.stock)
+            ).all()
+            for row in rows:
+                if row.stock == quantities[row.id]:
+                    SearchOutboxService.enqueue(row.id, 'index')
+
+        for row in restocked:
+            if row.is_stock_sharded:
+                InventoryService.release_sharded(row.product_id, row.quantity)
+                SearchOutboxService.enqueue(row.product_id, 'index')
+
+        ReportService.record_orders(cancelled, sign=-1)
+        return cancelled
+
     @staticmethod
     def update_order_status(order_id, status):
         order = Order.query.get(order_id)
         if not order:
             return None, "Order not found"
 
-        valid_statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
-        if status not in valid_statuses:
-            return None, f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+        if status not in ORDER_STATUSES:
+            return None, f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}"
 
-        if order.status == 'cancelled':
-            return None, "Cannot update a cancelled order"
+        if status == 'cancelled':
+            success, error = OrderService.cancel_order(order_id, None, is_admin=True)
+            if error:
+                return None, error
+            return Order.query.get(order_id), None
 
-        order.status = status
         try:
+            updated = db.session.execute(
+                db.update(Order)
+                .where(Order.id == order_id, Order.status.in_(OrderService._sources(status)))
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not updated:
+                db.session.rollback()
+                return None, OrderService._skip_reasons({order_id}, {order_id: status})[0]['error']
+            db.session.commit()
+            return Order.query.get(order_id), None
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+
+    @staticmethod
+    def _sources(status):
+        return [source for source, target in ORDER_TRANSITIONS if target == status]
+
+    @staticmethod
+    def _skip_reasons(order_ids, targets):
+        statuses = dict(
+            db.session.query(Order.id, Order.status).filter(Order.id.in_(order_ids)).all()
+        ) if order_ids else {}
+
+        skipped = []
+        for order_id in sorted(order_ids):
+            status, target = statuses.get(order_id), targets[order_id]
+            if status is None:
+                reason = "Order not found"
+            elif status == 'cancelled':
+                reason = "Order already cancelled" if target == 'cancelled' else "Cannot update a cancelled order"
+            elif status == target:
+                reason = f"Order is already {status}"
+            elif target == 'cancelled':
+                reason = f"Cannot cancel order with status: {status}"
+            else:
+                reason = f"Cannot change order status from {status} to {target}"
+            skipped.append({'id': order_id, 'error': reason})
+        return skipped
+
+    @staticmethod
+    def _apply_statuses(targets):
+        # One conditional statement per kind of change: joining the allowed (from, to) pairs is the
+        # transition check, and RETURNING tells which orders actually moved.
+        cancel_ids = [order_id for order_id, status in targets.items() if status == 'cancelled']
+        changes = sorted((order_id, status) for order_id, status in targets.items() if status != 'cancelled')
+
+        updated = []
+        if changes:
+            requested = db.values(
+                db.column('order_id', db.Integer), db.column('status', db.String(20)), name='requested'
+            ).data(changes)
+            transitions = db.values(
+                db.column('from_status', db.String(20)), db.column('to_status', db.String(20)), name='transitions'
+            ).data([transition for transition in ORDER_TRANSITIONS if transition[1] != 'cancelled'])
+
+            updated = db.session.scalars(
+                db.update(Order)
+                .where(Order.id == requested.c.order_id)
+                .where(transitions.c.from_status == Order.status, transitions.c.to_status == requested.c.status)
+                .values(status=requested.c.status)
+                .returning(Order.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+
+        cancelled = OrderService._cancel(cancel_ids) if cancel_ids else []
+        return updated + cancelled
+
+    @staticmethod
+    def update_order_statuses(targets):
+        invalid = sorted({status for status in targets.values() if status not in ORDER_STATUSES})
+        if invalid:
+            return None, f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}"
+
+        try:
+            applied = OrderService._apply_statuses(targets)
             db.session.commit()
-            return order, None
         except Exception as e:
             db.session.rollback()
             return None, str(e)
 
+        return {
+            'updated': [{'id': order_id, 'status': targets[order_id]} for order_id in sorted(applied)],
+            'skipped': OrderService._skip_reasons(set(targets) - set(applied), targets)
+        }, None
+
+    @staticmethod
+    def update_order_statuses_matching(new_status, limit, **filters):
+        if new_status not in ORDER_STATUSES:
+            return None, f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}"
+        if filters.get('status') is not None and filters['status'] not in ORDER_STATUSES:
+            return None, f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}"
+
+        # Only orders that may move to the new status are selected, so repeating the call walks
+        # through a large selection one batch at a time.
+        order_ids = db.session.scalars(
+            db.select(Order.id)
+            .where(*OrderService._order_filters(**filters))
+            .where(Order.status.in_(OrderService._sources(new_status)))
+            .order_by(Order.id)
+            .limit(limit + 1)
+        ).all()
+        has_more = len(order_ids) > limit
+
+        result, error = OrderService.update_order_statuses({order_id: new_status for order_id in order_ids[:limit]})
+        if error:
+            return None, error
+        result['has_more'] = has_more
+        return result, None
+
     @staticmethod
     def cancel_order(order_id, user_id, is_admin=False):
         order = Order.query.get(order_id)
@@ -169,18 +460,29 @@ class OrderService:
         if order.status == 'cancelled':
             return False, "Order already cancelled"
 
-        if order.status in ['shipped', 'delivered']:
+        if order.status not in CANCELLABLE_STATUSES:
             return False, f"Cannot cancel order with status: {order.status}"
 
         try:
-            for item in order.items:
-                product = Product.query.filter_by(id=item.product_id).first()
-                if product:
-                    product.stock += item.quantity
-
-            order.status = 'cancelled'
+            cancelled = OrderService._cancel([order_id], user_id=None if is_admin else user_id)
+            if not cancelled:
+                db.session.rollback()
+                return False, "Order already cancelled"
             db.session.commit()
             return True, None
         except Exception as e:
             db.session.rollback()
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+    @staticmethod
+    def cancel_orders(order_ids):
+        try:
+            cancelled = OrderService._cancel(order_ids)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+
+        remaining = set(order_ids) - set(cancelled)
+        skipped = OrderService._skip_reasons(remaining, {order_id: 'cancelled' for order_id in remaining})
+        return {'cancelled': sorted(cancelled), 'skipped': skipped}, None
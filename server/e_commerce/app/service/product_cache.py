@@ -0,0 +1,33 @@
+import hashlib
+from urllib.parse import urlencode
+from flask import g
+from app import cache
+
+
+# Keys carry the version the response ETag was computed from, so a cached body never
+# outlives the ETag it is served under.
+def product_key(product_id):
+    return f"product:{cache.generation('catalog')}:{product_id}:{g.get('resource_version', '')}"
+
+
+def listing_key(args, category_id=None):
+    namespace = _listing_namespace(category_id)
+    digest = hashlib.sha1(urlencode(sorted(args.items(multi=True))).encode()).hexdigest()
+    return (
+        f"{namespace}:{cache.generation('catalog')}:{cache.generation(namespace)}:"
+        f"{g.get('resource_version', '')}:{digest}"
+    )
+
+
+# Only listings need bumping: detail keys embed the product's own version stamp, so an
+# updated product is looked up under a new key without deleting the old one.
+def invalidate_product(*category_ids):
+    cache.bump(_listing_namespace(), *{_listing_namespace(c) for c in category_ids if c is not None})
+
+
+def invalidate_catalog():
+    cache.bump('catalog')
+
+
+def _listing_namespace(category_id=None):
+    return 'products' if category_id is None else f"products:category:{category_id}"
@@ -4,16 +4,54 @@ from werkzeug.utils import secure_filename
 from flask import current_app
 from app import db
 from app.models.category import Category
-from app.models.product import Product
+from app.models.product import Product, ProductStockShard
 from app.models.product_image import ProductImage
+from app.service.eager_loading import eager
+from app.service.catalog_version_service import CatalogVersionService
+from app.service.product_cache import invalidate_product
+from app.models.catalog_version import CatalogVersion
+from app.service.category_service import CategoryService
 from app.utils.ElasticSearchService import ElasticSearchService
+from app.service.search_outbox_service import SearchOutboxService
+from app.service.local_search_service import LocalSearchService
+from app.service.inventory_service import InventoryService
+from app.utils.pagination import paginate_keyset, encode_cursor, decode_cursor, InvalidCursor
 from config import Config
 
+PRODUCT_SORT_KEYS = {
+    'id': Product.id,
+    'price': Product.price,
+    'name': Product.name,
+}
+
+MAX_SEARCH_WINDOW = 10000
+
+# search_after follows the search sort: relevance score, then product id.
+SEARCH_CURSOR_TYPES = (float, int)
+
+PRODUCT_LOADS = ('category', 'images')
+
 
 class ProductService:
+    @staticmethod
+    def _search_backend(method, *args, **kwargs):
+        if LocalSearchService.is_primary():
+            return getattr(LocalSearchService, method)(*args, **kwargs)
+
+        try:
+            return getattr(ElasticSearchService, method)(*args, **kwargs)
+        except Exception as e:
+            if not LocalSearchService.is_fallback():
+                raise
+            current_app.logger.warning(f"Elasticsearch kullanılamıyor, yerel aramaya geçiliyor: {e}")
+            return getattr(LocalSearchService, method)(*args, **kwargs)
+
     @staticmethod
     def search_in_elastic(query_text):
-        hits = ElasticSearchService.search_products(query_text)
+        try:
+            hits = ProductService._search_backend('search_products', query_text)
+        except Exception:
+            hits = []
 
         results = []
         for hit in hits:
@@ -26,17 +64,125 @@ class ProductService:
 
         return results
 
+    @staticmethod
+    def search_products_page(query_text, size, page=1, search_after=None, category_id=None,
+                             include_descendants=True, min_price=None, max_price=None, in_stock=False):
+        if search_after is None and page * size > MAX_SEARCH_WINDOW:
+            return None, f"Sayfa çok derin. {MAX_SEARCH_WINDOW} sonuçtan sonrası için search_after kullanın"
+
+        try:
+            after_values = decode_cursor(search_after, SEARCH_CURSOR_TYPES) if search_after else None
+        except InvalidCursor as e:
+            return None, str(e)
+
+        category_ids = None
+        if category_id is not None:
+            category_ids = CategoryService.get_descendant_ids(category_id) if include_descendants else [category_id]
+
+        try:
+            result = ProductService._search_backend(
+                'search_products_page',
+                query_text,
+                size=size,
+                offset=(page - 1) * size,
+                search_after=after_values,
+                category_ids=category_ids,
+                min_price=min_price,
+                max_price=max_price,
+                in_stock=in_stock
+            )
+        except Exception as e:
+            return None, f"Arama servisi kullanılamıyor: {e}"
+
+        items = []
+        for hit in result['hits']:
+            hit['images'] = [{"url": hit['image_url']}] if hit.get('image_url') else []
+            items.append(hit)
+
+        next_search_after = None
+        if result['last_sort'] is not None and len(items) == size:
+            next_search_after = encode_cursor(result['last_sort'])
+
+        return {
+            'items': items,
+            'total': result['total'],
+            'page': page if search_after is None else None,
+            'size': size,
+            'next_search_after': next_search_after,
+            'facets': result['facets']
+        }, None
+
+    @staticmethod
+    def get_catalog_stamp(product_id=None):
+        # Listings follow catalog writes only: stock moves on every checkout, and counting it here
+        # would revalidate every listing. A product's own stamp does include its stock.
+        if product_id is None:
+            versions = dict(
+                db.session.query(CatalogVersion.name, CatalogVersion.version)
+                .filter(CatalogVersion.name.in_(('products', 'categories')))
+                .all()
+            )
+            return f"{versions.get('products', 0)}-{versions.get('categories', 0)}"
+
+        categories_version = db.select(CatalogVersion.version) \
+            .where(CatalogVersion.name == 'categories') \
+            .scalar_subquery()
+
+        # Sharded stock moves without touching products.updated_at, so shard writes count separately.
+        shards_updated_at = db.select(db.func.max(ProductStockShard.updated_at)) \
+            .where(ProductStockShard.product_id == product_id) \
+            .scalar_subquery()
+        row = db.session.query(Product.updated_at, shards_updated_at, categories_version) \
+            .filter(Product.id == product_id) \
+            .first()
+        updated_at, shards_at, version = row if row else (None, None, None)
+        stamps = [stamp.timestamp() if stamp else 0 for stamp in (updated_at, shards_at)]
+        return f"{stamps[0]}-{stamps[1]}-{version or 0}"
+
     @staticmethod
     def get_all_products():
-        return Product.query.filter_by(is_deleted=False).all()
+        return Product.query.options(*eager(Product, *PRODUCT_LOADS)).filter_by(is_deleted=False).all()
 
     @staticmethod
     def get_product_by_id(product_id):
-        return Product.query.filter_by(id=product_id, is_deleted=False).first()
+        return Product.query.options(*eager(Product, *PRODUCT_LOADS)) \
+            .filter_by(id=product_id, is_deleted=False) \
+            .first()
+
+    @staticmethod
+    def get_products_by_category(category_id, include_descendants=False):
+        query = Product.query.options(*eager(Product, *PRODUCT_LOADS)).filter_by(is_deleted=False)
+        return ProductService._filter_category(query, category_id, include_descendants).all()
+
+    @staticmethod
+    def _filter_category(query, category_id, include_descendants):
+        if include_descendants:
+            return query.filter(Product.category_id.in_(CategoryService.descendant_ids_query(category_id)))
+        return query.filter_by(category_id=category_id)
 
     @staticmethod
-    def get_products_by_category(category_id):
-        return Product.query.filter_by(category_id=category_id, is_deleted=False).all()
+    def _invalidate(*category_ids):
+        invalidate_product(*category_ids, *CategoryService.get_ancestor_ids(*category_ids))
+
+    @staticmethod
+    def get_products_page(limit, after=None, sort='id', category_id=None, include_descendants=False):
+        descending = sort.startswith('-')
+        sort_column = PRODUCT_SORT_KEYS.get(sort.lstrip('-'))
+        if sort_column is None:
+            return None, f"Geçersiz sıralama. Seçenekler: {', '.join(PRODUCT_SORT_KEYS)}"
+
+        query = Product.query.options(*eager(Product, *PRODUCT_LOADS)).filter_by(is_deleted=False)
+        if category_id is not None:
+            query = ProductService._filter_category(query, category_id, include_descendants)
+
+        columns = [Product.id] if sort_column is Product.id else [sort_column, Product.id]
+
+        try:
+            products, next_cursor = paginate_keyset(query, columns, limit, after, descending)
+        except InvalidCursor as e:
+            return None, str(e)
+
+        return {'items': products, 'next_cursor': next_cursor}, None
 
     @staticmethod
     def create_product(data, requesting_user):
@@ -53,14 +199,17 @@ class ProductService:
             name=data['name'],
             description=data.get('description'),
             price=data['price'],
-            stock=data.get('stock', 0),
-            rating=0.0
+            stock=data.get('stock', 0)
         )
 
         try:
             db.session.add(product)
+            db.session.flush()
+            SearchOutboxService.enqueue(product.id, 'index')
+            CatalogVersionService.bump('products')
             db.session.commit()
-            ElasticSearchService.index_product(product)
+            ProductService._invalidate(product.category_id)
+            LocalSearchService.refresh_product(product)
 
             return product, None
         except Exception as e:
@@ -81,13 +230,20 @@ class ProductService:
             if not category:
                 return None, "Geçersiz Kategori ID"
 
+        previous_category_id = product.category_id
+
         try:
             for key, value in data.items():
-                if hasattr(product, key):
+                if key == 'stock':
+                    InventoryService.set_stock(product, value)
+                elif hasattr(product, key):
                     setattr(product, key, value)
 
+            SearchOutboxService.enqueue(product.id, 'index')
+            CatalogVersionService.bump('products')
             db.session.commit()
-            ElasticSearchService.index_product(product)
+            ProductService._invalidate(previous_category_id, product.category_id)
+            LocalSearchService.refresh_product(product)
 
             return product, None
         except Exception as e:
@@ -106,8 +262,11 @@ class ProductService:
         try:
             product.is_deleted = True
             product.deleted_at = datetime.utcnow()
+            SearchOutboxService.enqueue(product_id, 'delete')
+            CatalogVersionService.bump('products')
             db.session.commit()
-            ElasticSearchService.delete_product(product_id)
+            ProductService._invalidate(product.category_id)
+            LocalSearchService.refresh_product(product)
 
             return True, None
         except Exception as e:
@@ -130,7 +289,12 @@ class ProductService:
                 new_image = ProductImage(product_id=product_id, url=saved_path)
                 db.session.add(new_image)
                 saved_images.append(new_image)
+            SearchOutboxService.enqueue(product_id, 'index')
+            CatalogVersionService.bump('products')
+            product.updated_at = datetime.utcnow()
             db.session.commit()
+            ProductService._invalidate(product.category_id)
+            LocalSearchService.refresh_product(product)
             return saved_images, None
         except Exception as e:
             db.session.rollback()
@@ -150,9 +314,15 @@ class ProductService:
                     os.remove(full_path)
                 except:
                     pass
+        product = image.product
         try:
             db.session.delete(image)
+            SearchOutboxService.enqueue(product.id, 'index')
+            CatalogVersionService.bump('products')
+            product.updated_at = datetime.utcnow()
             db.session.commit()
+            ProductService._invalidate(product.category_id)
+            LocalSearchService.refresh_product(product)
             return True, None
         except Exception as e:
             db.session.rollback()
@@ -0,0 +1,129 @@
+from sqlalchemy.dialects.postgresql import insert
+from app import db
+from app.models.category import Category, CategoryClosure
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.sales_rollup import SalesRollup
+from app.service.category_service import CategoryService
+
+ROLLUP_SHARDS = 8
+
+
+class ReportService:
+    @staticmethod
+    def _rollup_rows(order_filter, sign=1):
+        return db.select(
+            db.func.date(Order.created_at),
+            OrderItem.product_id,
+            Order.id % ROLLUP_SHARDS,
+            sign * db.func.sum(OrderItem.quantity),
+            sign * db.func.sum(OrderItem.quantity * OrderItem.unit_price)
+        ) \
+            .join(Order, Order.id == OrderItem.order_id) \
+            .where(order_filter) \
+            .group_by(db.func.date(Order.created_at), OrderItem.product_id, Order.id % ROLLUP_SHARDS)
+
+    @staticmethod
+    def record_orders(order_ids, sign=1):
+        db.session.flush()
+        stmt = insert(SalesRollup).from_select(
+            ['day', 'product_id', 'shard', 'units', 'revenue'],
+            ReportService._rollup_rows(Order.id.in_(order_ids), sign)
+        )
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=['day', 'product_id', 'shard'],
+                set_={
+                    'units': SalesRollup.units + stmt.excluded.units,
+                    'revenue': SalesRollup.revenue + stmt.excluded.revenue
+                }
+            )
+        )
+
+    @staticmethod
+    def rebuild(start=None):
+        delete = db.delete(SalesRollup)
+        order_filter = Order.status != 'cancelled'
+        if start is not None:
+            delete = delete.where(SalesRollup.day >= start)
+            order_filter = order_filter & (db.func.date(Order.created_at) >= start)
+
+        db.session.execute(delete)
+        db.session.execute(
+            db.insert(SalesRollup).from_select(
+                ['day', 'product_id', 'shard', 'units', 'revenue'],
+                ReportService._rollup_rows(order_filter)
+            )
+        )
+        db.session.commit()
+        return db.session.query(db.func.count()).select_from(SalesRollup).scalar()
+
+    @staticmethod
+    def _filtered(query, start, end, category_id=None):
+        query = query.where(SalesRollup.day >= start, SalesRollup.day <= end)
+        if category_id is not None:
+            query = query.join(Product, Product.id == SalesRollup.product_id) \
+                .where(Product.category_id.in_(CategoryService.descendant_ids_query(category_id)))
+        return query
+
+    @staticmethod
+    def sales_by_day(start, end, category_id=None):
+        query = db.select(
+            SalesRollup.day,
+            db.func.sum(SalesRollup.units).label('units'),
+            db.func.sum(SalesRollup.revenue).label('revenue')
+        )
+        query = ReportService._filtered(query, start, end, category_id) \
+            .group_by(SalesRollup.day) \
+            .order_by(SalesRollup.day)
+
+        return [
+            {'day': row.day.isoformat(), 'units': int(row.units), 'revenue': float(row.revenue)}
+            for row in db.session.execute(query)
+        ]
+
+    @staticmethod
+    def sales_by_category(start, end):
+        # Each category includes its descendants' sales, matching sales_by_day(category_id),
+        # so a parent's totals overlap its children's rather than adding up with them.
+        query = db.select(
+            Category.id,
+            Category.name,
+            db.func.sum(SalesRollup.units).label('units'),
+            db.func.sum(SalesRollup.revenue).label('revenue')
+        ) \
+            .select_from(SalesRollup) \
+            .join(Product, Product.id == SalesRollup.product_id) \
+            .join(CategoryClosure, CategoryClosure.descendant_id == Product.category_id) \
+            .join(Category, Category.id == CategoryClosure.ancestor_id)
+        query = ReportService._filtered(query, start, end) \
+            .group_by(Category.id, Category.name) \
+            .order_by(db.func.sum(SalesRollup.revenue).desc())
+
+        return [
+            {'category_id': row.id, 'name': row.name, 'units': int(row.units), 'revenue': float(row.revenue)}
+            for row in db.session.execute(query)
+        ]
+
+    @staticmethod
+    def top_products(start, end, limit=10, category_id=None):
+        totals = db.select(
+            SalesRollup.product_id,
+            db.func.sum(SalesRollup.units).label('units'),
+            db.func.sum(SalesRollup.revenue).label('revenue')
+        )
+        totals = ReportService._filtered(totals, start, end, category_id) \
+            .group_by(SalesRollup.product_id) \
+            .having(db.func.sum(SalesRollup.units) > 0) \
+            .order_by(db.func.sum(SalesRollup.revenue).desc(), SalesRollup.product_id) \
+            .limit(limit) \
+            .subquery('totals')
+
+        query = db.select(totals, Product.name) \
+            .join(Product, Product.id == totals.c.product_id) \
+            .order_by(totals.c.revenue.desc(), totals.c.product_id)
+
+        return [
+            {'product_id': row.product_id, 'name': row.name, 'units': int(row.units), 'revenue': float(row.revenue)}
+            for row in db.session.execute(query)
+        ]
@@ -0,0 +1,146 @@
+import time
+from datetime import datetime, timedelta
+from elasticsearch import helpers
+from flask import current_app
+from app import db
+from app.models.product import Product, ProductStockShard
+from app.models.product_image import ProductImage
+from app.utils.ElasticSearchService import es, PRODUCTS_INDEX, PRODUCTS_MAPPING, ElasticSearchService, document_version
+
+# Writes committed slightly out of updated_at order are picked up by re-reading this window.
+REPLAY_OVERLAP = timedelta(seconds=5)
+
+
+class SearchIndexService:
+    @staticmethod
+    def document_query():
+        first_image = db.select(ProductImage.url) \
+            .where(ProductImage.product_id == Product.id) \
+            .order_by(ProductImage.id) \
+            .limit(1) \
+            .correlate(Product) \
+            .scalar_subquery()
+
+        return db.session.query(
+            Product.id, Product.name, Product.description, Product.price, Product.category_id,
+            Product.available_stock, Product.is_deleted, Product.updated_at, first_image.label('image_url')
+        )
+
+    @staticmethod
+    def stream_documents(chunk_size):
+        rows = SearchIndexService.document_query() \
+            .filter(Product.is_deleted == False) \
+            .order_by(Product.id) \
+            .execution_options(yield_per=chunk_size)
+
+        for row in rows:
+            yield row.id, ElasticSearchService.document_from_row(row, row.image_url)
+
+    @staticmethod
+    def replay_since(since, client=None, chunk_size=1000):
+        shard_changes = db.select(ProductStockShard.product_id).where(ProductStockShard.updated_at > since)
+        rows = SearchIndexService.document_query() \
+            .filter(db.or_(Product.updated_at > since, Product.id.in_(shard_changes))) \
+            .order_by(Product.id) \
+            .execution_options(yield_per=chunk_size)
+        version = document_version()
+
+        def actions():
+            for row in rows:
+                action = {'_index': PRODUCTS_INDEX, '_id': row.id, 'version': version, 'version_type': 'external'}
+                if row.is_deleted:
+                    action['_op_type'] = 'delete'
+                else:
+                    action['_op_type'] = 'index'
+                    action['_source'] = ElasticSearchService.document_from_row(row, row.image_url)
+                yield action
+
+        results = ElasticSearchService.bulk(actions(), client=client)
+        return {'replayed': len(results), 'failed': sum(1 for ok, _ in results if not ok)}
+
+    @staticmethod
+    def reindex(chunk_size=1000, thread_count=4, replicas=1, client=None, delete_old=False, progress=None):
+        client = client or es
+        started = time.monotonic()
+        # The outbox worker keeps writing to the current alias target while the new index fills;
+        # everything changed after this mark is replayed into the new index once it is live.
+        high_water_mark = datetime.utcnow()
+        version = document_version()
+        total = Product.query.filter_by(is_deleted=False).count()
+        new_index = f"{PRODUCTS_INDEX}_v{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+
+        client.indices.create(
+            index=new_index,
+            mappings=PRODUCTS_MAPPING,
+            settings={"number_of_replicas": 0, "refresh_interval": "-1"}
+        )
+
+        app = current_app._get_current_object()
+
+        def actions():
+            # parallel_bulk pulls this generator from its own pool thread.
+            with app.app_context():
+                for product_id, document in SearchIndexService.stream_documents(chunk_size):
+                    yield {
+                        "_index": new_index, "_id": product_id, "_source": document,
+                        "version": version, "version_type": "external"
+                    }
+
+        indexed, failed = 0, 0
+        for ok, item in helpers.parallel_bulk(
+            client, actions(),
+            thread_count=thread_count,
+            chunk_size=chunk_size,
+            raise_on_error=False,
+            raise_on_exception=False
+        ):
+            if ok:
+                indexed += 1
+            else:
+                failed += 1
+            done = indexed + failed
+            if progress and done % chunk_size == 0:
+                progress(done, total, time.monotonic() - started)
+
+        summary = {
+            'index': new_index,
+            'total': total,
+            'indexed': indexed,
+            'failed': failed,
+            'seconds': round(time.monotonic() - started, 2),
+            'swapped': False,
+            'replayed': 0,
+            'removed': []
+        }
+        summary['docs_per_second'] = round(indexed / summary['seconds'], 1) if summary['seconds'] else float(indexed)
+
+        if failed:
+            return summary
+
+        client.indices.put_settings(index=new_index, settings={"refresh_interval": "1s", "number_of_replicas": replicas})
+        client.indices.refresh(index=new_index)
+
+        alias_actions = [{"add": {"index": new_index, "alias": PRODUCTS_INDEX}}]
+        old_indices = []
+        if client.indices.exists_alias(name=PRODUCTS_INDEX):
+            old_indices = [name for name in client.indices.get_alias(name=PRODUCTS_INDEX) if name != new_index]
+        elif client.indices.exists(index=PRODUCTS_INDEX):
+            alias_actions.append({"remove_index": {"index": PRODUCTS_INDEX}})
+            summary['removed'].append(PRODUCTS_INDEX)
+
+        for name in old_indices:
+            alias_actions.append({"remove": {"index": name, "alias": PRODUCTS_INDEX}})
+
+        client.indices.update_aliases(actions=alias_actions)
+        summary['swapped'] = True
+
+        replay = SearchIndexService.replay_since(high_water_mark - REPLAY_OVERLAP, client=client, chunk_size=chunk_size)
+        summary['replayed'] = replay['replayed']
+        summary['replay_failed'] = replay['failed']
+
+        if delete_old:
+            for name in old_indices:
+                client.indices.delete(index=name)
+                summary['removed'].append(name)
+
+        return summary
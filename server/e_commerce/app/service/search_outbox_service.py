@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from app import db
+from app.models.product import Product
+from app.models.search_outbox import SearchOutbox
+from app.service.eager_loading import eager
+from app.utils.ElasticSearchService import ElasticSearchService, PRODUCTS_INDEX, document_version
+
+MAX_BACKOFF_SECONDS = 600
+
+
+class SearchOutboxService:
+    @staticmethod
+    def enqueue(product_id, operation='index'):
+        db.session.add(SearchOutbox(product_id=product_id, operation=operation))
+
+    @staticmethod
+    def pending_count():
+        return SearchOutbox.query.count()
+
+    @staticmethod
+    def drain(batch_size=500, client=None):
+        rows = SearchOutbox.query \
+            .filter(SearchOutbox.available_at <= datetime.utcnow()) \
+            .order_by(SearchOutbox.id) \
+            .limit(batch_size) \
+            .with_for_update(skip_locked=True) \
+            .all()
+
+        if not rows:
+            db.session.commit()
+            return {'processed': 0, 'indexed': 0, 'deleted': 0, 'failed': 0}
+
+        latest = {}
+        for row in rows:
+            latest[row.product_id] = row
+
+        index_ids = [pid for pid, row in latest.items() if row.operation == 'index']
+        version = document_version()
+        products = {}
+        if index_ids:
+            products = {
+                p.id: p for p in Product.query.options(*eager(Product, 'images')).filter(Product.id.in_(index_ids))
+            }
+
+        actions = []
+        for product_id, row in latest.items():
+            product = products.get(product_id)
+            action = {
+                '_index': PRODUCTS_INDEX,
+                '_id': product_id,
+                'version': version,
+                'version_type': 'external'
+            }
+            if product is not None and not product.is_deleted:
+                action['_op_type'] = 'index'
+                action['_source'] = ElasticSearchService.build_document(product)
+            else:
+                action['_op_type'] = 'delete'
+            actions.append(action)
+
+        try:
+            results = ElasticSearchService.bulk(actions, client=client)
+        except Exception as e:
+            results = [(False, {'error': str(e)})] * len(actions)
+
+        stats = {'processed': len(rows), 'indexed': 0, 'deleted': 0, 'failed': 0}
+        failed = {}
+        for action, (ok, item) in zip(actions, results):
+            if ok:
+                stats['indexed' if action['_op_type'] == 'index' else 'deleted'] += 1
+            else:
+                failed[action['_id']] = str(item)[:1000]
+                stats['failed'] += 1
+
+        now = datetime.utcnow()
+        for row in rows:
+            error = failed.get(row.product_id)
+            if error is None:
+                db.session.delete(row)
+            else:
+                row.attempts += 1
+                row.last_error = error
+                row.available_at = now + timedelta(seconds=min(2 ** row.attempts, MAX_BACKOFF_SECONDS))
+
+        db.session.commit()
+        return stats
@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db, jwt
+from app.models.revoked_token import RevokedToken
+from app.utils.bloom_filter import BloomFilter
+
+# Rows committed slightly out of revoked_at order are picked up by re-reading this window.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+_filter = None
+_synced_until = None
+_checked_at = 0.0
+_built_at = 0.0
+_sync_lock = threading.Lock()
+
+
+class TokenRevocationService:
+    @staticmethod
+    def init_app(app):
+        @jwt.token_in_blocklist_loader
+        def is_token_revoked(jwt_header, jwt_payload):
+            return TokenRevocationService.is_revoked(jwt_payload['jti'])
+
+    @staticmethod
+    def _build():
+        global _filter, _synced_until, _built_at
+        now = datetime.utcnow()
+        rows = db.session.query(RevokedToken.jti, RevokedToken.revoked_at) \
+            .filter(db.or_(RevokedToken.expires_at == None, RevokedToken.expires_at > now)) \
+            .all()
+
+        bloom = BloomFilter(max(len(rows) * 2, current_app.config.get('TOKEN_REVOCATION_FILTER_CAPACITY', 10000)))
+        synced_until = None
+        for jti, revoked_at in rows:
+            bloom.add(jti)
+            synced_until = max(synced_until or revoked_at, revoked_at)
+
+        _filter, _synced_until, _built_at = bloom, synced_until, time.monotonic()
+
+    @staticmethod
+    def get_filter():
+        global _synced_until, _checked_at
+        interval = current_app.config.get('TOKEN_REVOCATION_SYNC_INTERVAL', 5)
+        if _filter is not None and time.monotonic() - _checked_at < interval:
+            return _filter
+
+        with _sync_lock:
+            rebuild_interval = current_app.config.get('TOKEN_REVOCATION_REBUILD_INTERVAL', 3600)
+            if _filter is None or _filter.is_saturated() or time.monotonic() - _built_at >= rebuild_interval:
+                TokenRevocationService._build()
+
+            elif time.monotonic() - _checked_at >= interval:
+                query = db.session.query(RevokedToken.jti, RevokedToken.revoked_at)
+                if _synced_until is not None:
+                    query = query.filter(RevokedToken.revoked_at > _synced_until - SYNC_OVERLAP)
+                for jti, revoked_at in query:
+                    _filter.add(jti)
+                    _synced_until = max(_synced_until or revoked_at, revoked_at)
+
+            _checked_at = time.monotonic()
+            return _filter
+
+    @staticmethod
+    def is_revoked(jti):
+        # The filter answers "not revoked" without I/O; only possible hits are confirmed in the table.
+        if jti not in TokenRevocationService.get_filter():
+            return False
+        return db.session.query(RevokedToken.query.filter_by(jti=jti).exists()).scalar()
+
+    @staticmethod
+    def revoke(jwt_payload):
+        expires_at = datetime.utcfromtimestamp(jwt_payload['exp']) if jwt_payload.get('exp') else None
+        try:
+            db.session.add(RevokedToken(
+                jti=jwt_payload['jti'],
+                token_type=jwt_payload.get('type', 'access'),
+                user_id=int(jwt_payload['sub']),
+                expires_at=expires_at
+            ))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+        if _filter is not None:
+            with _sync_lock:
+                _filter.add(jwt_payload['jti'])
+
+    @staticmethod
+    def purge_expired(batch_size=1000):
+        deleted = 0
+        while True:
+            expired = db.select(RevokedToken.id) \
+                .where(RevokedToken.expires_at <= datetime.utcnow()) \
+                .limit(batch_size) \
+                .scalar_subquery()
+            count = db.session.execute(
+                db.delete(RevokedToken).where(RevokedToken.id.in_(expired))
+            ).rowcount
+            db.session.commit()
+            deleted += count
+            if count < batch_size:
+                return deleted
@@ -1,17 +1,83 @@
-from app import db
+from flask import current_app
+from sqlalchemy.orm import make_transient_to_detached
+from app import db, cache
 from app.models.user import User
+from app.utils.pagination import paginate_keyset, InvalidCursor
 from datetime import datetime
 
+# The password hash is left out: cached snapshots cannot check or change a password,
+# so code that needs it loads the row (login, update_user).
+CACHED_USER_FIELDS = ('id', 'fullname', 'email', 'phone', 'role', 'is_deleted')
+
+USER_ROLES = ['customer', 'seller', 'admin']
+
 
 class UserService:
     @staticmethod
     def get_all_users():
         return User.query.filter_by(is_deleted=False).all()
 
+    @staticmethod
+    def get_users_page(limit, after=None, role=None, q=None, created_from=None, created_to=None):
+        if role is not None and role not in USER_ROLES:
+            return None, f"Invalid role. Must be one of: {', '.join(USER_ROLES)}"
+
+        query = User.query.filter(User.is_deleted == False)
+        if role is not None:
+            query = query.filter(User.role == role)
+        if created_from is not None:
+            query = query.filter(User.created_at >= created_from)
+        if created_to is not None:
+            query = query.filter(User.created_at < created_to)
+        if q:
+            # Patterns are built here rather than with || in SQL so the planner sees a constant
+            # prefix and can use ix_users_email_lower_pattern / ix_users_fullname_lower_trgm.
+            prefix = q.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query = query.filter(db.or_(
+                db.func.lower(User.email).like(f"{prefix}%", escape='\\'),
+                db.func.lower(User.fullname).like(f"{prefix}%", escape='\\'),
+                db.func.lower(User.fullname).like(f"% {prefix}%", escape='\\')
+            ))
+
+        try:
+            users, next_cursor = paginate_keyset(query, [User.created_at, User.id], limit, after, descending=True)
+        except InvalidCursor as e:
+            return None, str(e)
+
+        return {'items': users, 'next_cursor': next_cursor}, None
+
     @staticmethod
     def get_user_by_id(user_id):
         return User.query.filter_by(id=user_id, is_deleted=False).first()
 
+    @staticmethod
+    def get_cached_user(user_id):
+        # Only a backend shared by every worker is used: invalidation has to reach all of them,
+        # or a demoted or deleted user keeps their old role elsewhere until the entry expires.
+        ttl = current_app.config.get('USER_CACHE_TTL', 30)
+        if not ttl or not cache.is_shared():
+            return UserService.get_user_by_id(user_id)
+
+        key = f"user:{user_id}"
+        data = cache.get(key)
+        if data is None:
+            user = UserService.get_user_by_id(user_id)
+            if user:
+                data = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+                data['created_at'] = user.created_at.isoformat()
+                cache.set(key, data, ttl)
+            return user
+
+        # A detached snapshot for authorization and display; it never enters the session, so
+        # handlers that load and modify the same user in this request get the real row.
+        user = User(**{**data, 'created_at': datetime.fromisoformat(data['created_at'])})
+        make_transient_to_detached(user)
+        return user
+
+    @staticmethod
+    def invalidate_cached_user(user_id):
+        cache.delete(f"user:{user_id}")
+
     @staticmethod
     def get_user_by_email(email):
         return User.query.filter_by(email=email, is_deleted=False).first()
@@ -43,6 +109,7 @@ class UserService:
                     setattr(user, key, value)
 
             db.session.commit()
+            UserService.invalidate_cached_user(user.id)
             return user, None
 
         except Exception as e:
@@ -59,6 +126,7 @@ class UserService:
             user.is_deleted = True
             user.deleted_at = datetime.utcnow()
             db.session.commit()
+            UserService.invalidate_cached_user(user.id)
             return True, None
         except Exception as e:
             db.session.rollback()
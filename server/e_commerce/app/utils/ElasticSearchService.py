@@ -1,46 +1,156 @@
-from elasticsearch import Elasticsearch
+import time
+from elasticsearch import Elasticsearch, helpers
 
 es = Elasticsearch(["http://localhost:9200"])
 
+PRODUCTS_INDEX = "products"
+
+PRODUCTS_MAPPING = {
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": "text"},
+        "description": {"type": "text"},
+        "price": {"type": "scaled_float", "scaling_factor": 100},
+        "category_id": {"type": "integer"},
+        "stock": {"type": "integer"},
+        "is_deleted": {"type": "boolean"},
+        "image_url": {"type": "keyword", "index": False}
+    }
+}
+
+PRICE_BUCKETS = [
+    {"key": "0-100", "to": 100},
+    {"key": "100-500", "from": 100, "to": 500},
+    {"key": "500-1000", "from": 500, "to": 1000},
+    {"key": "1000-5000", "from": 1000, "to": 5000},
+    {"key": "5000+", "from": 5000}
+]
+
+
+def document_version():
+    # Every write to the products index uses external versioning with the time its source rows
+    # were read, so whichever writer read the database last wins regardless of arrival order.
+    return time.time_ns() // 1000
+
+
 class ElasticSearchService:
     @staticmethod
-    def index_product(product):
-        try:
-            image_url = product.images[0].url if product.images else None
-
-            doc = {
-                "id": product.id,
-                "name": product.name,
-                "description": product.description,
-                "price": product.price,
-                "category_id": product.category_id,
-                "is_deleted": product.is_deleted,
-                "image_url": image_url
+    def build_document(product):
+        image_url = product.images[0].url if product.images else None
+        return ElasticSearchService.document_from_row(product, image_url)
+
+    @staticmethod
+    def document_from_row(row, image_url):
+        return {
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "price": float(row.price),
+            "category_id": row.category_id,
+            "stock": row.available_stock,
+            "is_deleted": row.is_deleted,
+            "image_url": image_url
+        }
+
+    @staticmethod
+    def _text_query(query_text):
+        if not query_text:
+            return {"match_all": {}}
+        return {
+            "multi_match": {
+                "query": query_text,
+                "fields": ["name^3", "description"],
+                "fuzziness": "AUTO"
             }
-            es.index(index="products", id=product.id, document=doc)
-        except Exception as e:
-            print(f"ES Indeksleme Hatası: {e}")
+        }
 
     @staticmethod
     def search_products(query_text):
         body = {
             "query": {
-                "multi_match": {
-                    "query": query_text,
-                    "fields": ["name^3", "description"],
-                    "fuzziness": "AUTO"
+                "bool": {
+                    "must": [ElasticSearchService._text_query(query_text)],
+                    "filter": [{"term": {"is_deleted": False}}]
                 }
             }
         }
-        try:
-            res = es.search(index="products", body=body)
-            return [hit["_source"] for hit in res["hits"]["hits"]]
-        except Exception as e:
-            return []
+        res = es.search(index=PRODUCTS_INDEX, body=body)
+        return [hit["_source"] for hit in res["hits"]["hits"]]
+
+    @staticmethod
+    def search_products_page(query_text, size, offset=0, search_after=None, category_ids=None,
+                             min_price=None, max_price=None, in_stock=False):
+        base_filters = [{"term": {"is_deleted": False}}]
+        if in_stock:
+            base_filters.append({"range": {"stock": {"gt": 0}}})
+
+        category_filters = [{"terms": {"category_id": category_ids}}] if category_ids is not None else []
+
+        price_range = {}
+        if min_price is not None:
+            price_range["gte"] = min_price
+        if max_price is not None:
+            price_range["lte"] = max_price
+        price_filters = [{"range": {"price": price_range}}] if price_range else []
+
+        # Category and price filters go into post_filter so each facet is counted
+        # without its own selection applied, all within a single search request.
+        body = {
+            "query": {
+                "bool": {
+                    "must": [ElasticSearchService._text_query(query_text)],
+                    "filter": base_filters
+                }
+            },
+            "post_filter": {"bool": {"filter": category_filters + price_filters}},
+            "sort": [{"_score": "desc"}, {"id": "asc"}],
+            "size": size,
+            "track_total_hits": True,
+            "aggs": {
+                "categories": {
+                    "filter": {"bool": {"filter": price_filters}},
+                    "aggs": {"ids": {"terms": {"field": "category_id", "size": 100}}}
+                },
+                "price_ranges": {
+                    "filter": {"bool": {"filter": category_filters}},
+                    "aggs": {"ranges": {"range": {"field": "price", "ranges": PRICE_BUCKETS}}}
+                }
+            }
+        }
+        if search_after is not None:
+            body["search_after"] = search_after
+        else:
+            body["from"] = offset
+
+        res = es.search(index=PRODUCTS_INDEX, body=body)
+        hits = res["hits"]["hits"]
+
+        return {
+            "hits": [hit["_source"] for hit in hits],
+            "total": res["hits"]["total"]["value"],
+            "last_sort": hits[-1]["sort"] if hits else None,
+            "facets": {
+                "categories": [
+                    {"category_id": bucket["key"], "count": bucket["doc_count"]}
+                    for bucket in res["aggregations"]["categories"]["ids"]["buckets"]
+                ],
+                "price_ranges": [
+                    {
+                        "key": bucket["key"],
+                        "from": bucket.get("from"),
+                        "to": bucket.get("to"),
+                        "count": bucket["doc_count"]
+                    }
+                    for bucket in res["aggregations"]["price_ranges"]["ranges"]["buckets"]
+                ]
+            }
+        }
 
     @staticmethod
-    def delete_product(product_id):
-        try:
-            es.delete(index="products", id=product_id)
-        except Exception as e:
-            print(f"ES Silme Hatası: {e}")
\ No newline at end of file
+    def bulk(actions, client=None):
+        results = []
+        for ok, item in helpers.streaming_bulk(client or es, actions, raise_on_error=False, raise_on_exception=False):
+            status = next(iter(item.values())).get('status')
+            # 404: deleting a document that was never indexed, 409: a newer version is already there.
+            results.append((ok or status in (404, 409), item))
+        return results
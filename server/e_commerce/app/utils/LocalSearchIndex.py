@@ -0,0 +1,129 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+FIELD_BOOSTS = {"name": 3.0, "description": 1.0}
+K1 = 1.2
+B = 0.75
+FUZZY_MIN_SIMILARITY = 0.35
+FUZZY_MAX_EXPANSIONS = 5
+
+
+def normalize(text):
+    text = (text or "").replace("ı", "i").replace("İ", "i").casefold()
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LocalSearchIndex:
+    def __init__(self):
+        self.docs = {}
+        self.postings = {field: defaultdict(dict) for field in FIELD_BOOSTS}
+        self.lengths = {field: {} for field in FIELD_BOOSTS}
+        self.total_lengths = {field: 0 for field in FIELD_BOOSTS}
+        self.doc_terms = {}
+        self.term_refs = Counter()
+        self.trigram_terms = defaultdict(set)
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, doc):
+        with self.lock:
+            self.remove(doc["id"])
+            self.docs[doc["id"]] = doc
+            self.doc_terms[doc["id"]] = {}
+
+            for field in FIELD_BOOSTS:
+                terms = Counter(tokenize(doc.get(field)))
+                self.doc_terms[doc["id"]][field] = list(terms)
+                self.lengths[field][doc["id"]] = sum(terms.values())
+                self.total_lengths[field] += sum(terms.values())
+                for term, tf in terms.items():
+                    self.postings[field][term][doc["id"]] = tf
+                    self._ref_term(term)
+
+    def remove(self, doc_id):
+        with self.lock:
+            if self.docs.pop(doc_id, None) is None:
+                return
+
+            for field, terms in self.doc_terms.pop(doc_id).items():
+                self.total_lengths[field] -= self.lengths[field].pop(doc_id, 0)
+                postings = self.postings[field]
+                for term in terms:
+                    del postings[term][doc_id]
+                    if not postings[term]:
+                        del postings[term]
+                    self._unref_term(term)
+
+    def _ref_term(self, term):
+        if self.term_refs[term] == 0:
+            for gram in trigrams(term):
+                self.trigram_terms[gram].add(term)
+        self.term_refs[term] += 1
+
+    def _unref_term(self, term):
+        self.term_refs[term] -= 1
+        if self.term_refs[term] <= 0:
+            del self.term_refs[term]
+            for gram in trigrams(term):
+                self.trigram_terms[gram].discard(term)
+                if not self.trigram_terms[gram]:
+                    del self.trigram_terms[gram]
+
+    def _expand(self, term):
+        if term in self.term_refs:
+            return [(term, 1.0)]
+
+        query_grams = trigrams(term)
+        shared = Counter()
+        for gram in query_grams:
+            for candidate in self.trigram_terms.get(gram, ()):
+                shared[candidate] += 1
+
+        expansions = []
+        for candidate, common in shared.items():
+            similarity = common / (len(query_grams) + len(trigrams(candidate)) - common)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                expansions.append((candidate, similarity))
+
+        expansions.sort(key=lambda item: (-item[1], item[0]))
+        return expansions[:FUZZY_MAX_EXPANSIONS]
+
+    def score(self, query_text):
+        with self.lock:
+            if not query_text or not query_text.strip():
+                return {doc_id: 1.0 for doc_id in self.docs}
+
+            total_docs = len(self.docs)
+            scores = defaultdict(float)
+
+            for term in set(tokenize(query_text)):
+                for candidate, weight in self._expand(term):
+                    for field, boost in FIELD_BOOSTS.items():
+                        docs = self.postings[field].get(candidate)
+                        if not docs:
+                            continue
+
+                        average = self.total_lengths[field] / total_docs if total_docs else 0
+                        idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                        for doc_id, tf in docs.items():
+                            norm = 1 - B + B * (self.lengths[field][doc_id] / average if average else 0)
+                            scores[doc_id] += boost * weight * idf * tf * (K1 + 1) / (tf + K1 * norm)
+
+            return dict(scores)
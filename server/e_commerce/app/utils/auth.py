@@ -0,0 +1,51 @@
+from functools import wraps
+from flask import g, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_header, get_jwt_identity
+from flask_jwt_extended.exceptions import UserLookupError
+from werkzeug.local import LocalProxy
+from app.service.user_service import UserService
+
+
+def current_user_id():
+    return int(get_jwt_identity())
+
+
+def _load_current_user():
+    if 'current_user' not in g:
+        g.current_user = UserService.get_cached_user(current_user_id())
+    if g.current_user is None:
+        # The token outlived its account; answered with 401 by the JWT error handlers.
+        raise UserLookupError("User not found", get_jwt_header(), get_jwt())
+    return g.current_user
+
+
+# Resolved on first attribute access, at most once per request.
+current_user = LocalProxy(_load_current_user)
+
+
+def current_role():
+    role = get_jwt().get('role')
+    if role is None:
+        # Tokens issued before the role claim existed.
+        role = current_user.role
+    return role
+
+
+def is_admin():
+    return current_role() == 'admin'
+
+
+def require_role(*roles, message=None):
+    # Trusts the role claim, so a demoted or deleted user keeps it until the access token
+    # expires (JWT_ACCESS_TOKEN_EXPIRES). /auth/refresh re-reads the role from the database,
+    # and services that receive current_user check the role of the current row.
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if current_role() not in roles:
+                error = message or ('Admin access required' if roles == ('admin',) else 'Access denied')
+                return jsonify({'error': error}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,28 @@
+from functools import wraps
+from flask import current_app, request, make_response, g
+
+
+def conditional_get(version_loader):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.resource_version = version_loader(**kwargs)
+            etag = f"v{g.resource_version}"
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            max_age = current_app.config.get('CATALOG_CACHE_MAX_AGE', 0)
+            response.cache_control.public = True
+            if max_age:
+                response.cache_control.max_age = max_age
+            else:
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,59 @@
+import hashlib
+import json
+from functools import wraps
+from flask import current_app, g, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from app.service.idempotency_service import IdempotencyService
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(recover):
+    # recover(order_id) rebuilds the response for an order that committed without its response
+    # being stored, e.g. when the process died between the two.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return jsonify({'error': f"{IDEMPOTENCY_HEADER} en fazla {MAX_KEY_LENGTH} karakter olabilir"}), 400
+
+            payload = json.dumps(request.get_json(silent=True), sort_keys=True, separators=(',', ':'))
+            request_hash = hashlib.sha256(f"{request.method} {request.path} {payload}".encode()).hexdigest()
+
+            record, error = IdempotencyService.begin(int(get_jwt_identity()), key, request_hash)
+            if error:
+                return jsonify({'error': error}), 422 if "farklı" in error else 409
+
+            if record.status == 'completed':
+                response = current_app.response_class(
+                    record.response_body, status=record.response_code, mimetype='application/json'
+                )
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response
+
+            record_id = record.id
+            if record.order_id is not None:
+                response = make_response(recover(record.order_id))
+                IdempotencyService.complete(record_id, response.status_code, response.get_data(as_text=True))
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response
+
+            g.idempotency_key_id = record_id
+            try:
+                response = make_response(view(*args, **kwargs))
+            except Exception:
+                IdempotencyService.release(record_id)
+                raise
+
+            # Server errors are not replayed; the key is freed so the client can retry.
+            if response.status_code >= 500:
+                IdempotencyService.release(record_id)
+            else:
+                IdempotencyService.complete(record_id, response.status_code, response.get_data(as_text=True))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,110 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def wants_page(args):
+    return 'limit' in args or 'after' in args
+
+
+def parse_page_args(args):
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return None, None, "limit must be an integer"
+
+    if limit < 1:
+        return None, None, "limit must be positive"
+
+    return min(limit, MAX_PAGE_SIZE), args.get('after') or None, None
+
+
+def parse_date_arg(args, name, end_of_range=False):
+    value = args.get(name)
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    # A bare date as the upper bound includes that whole day.
+    if end_of_range and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def encode_cursor(values):
+    raw = json.dumps([_dump_value(v) for v in values], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, types):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor("Invalid cursor")
+
+    values = [_load_value(v) for v in values]
+    # A value of the wrong type would only fail once it reaches the query.
+    if not all(_matches(value, python_type) for value, python_type in zip(values, types)):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def paginate_keyset(query, columns, limit, after=None, descending=False):
+    if after:
+        values = decode_cursor(after, [column.type.python_type for column in columns])
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+
+    order_by = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+
+    return rows, next_cursor
+
+
+def _dump_value(value):
+    if isinstance(value, Decimal):
+        return {'d': str(value)}
+    if isinstance(value, datetime):
+        return {'t': value.isoformat()}
+    return value
+
+
+def _matches(value, python_type):
+    # bool is an int subclass but never a valid key; whole numbers are valid floats and decimals.
+    if isinstance(value, bool):
+        return python_type is bool
+    if python_type in (float, Decimal) and isinstance(value, int):
+        return True
+    return isinstance(value, python_type)
+
+
+def _load_value(value):
+    if not isinstance(value, dict):
+        return value
+    try:
+        if 'd' in value:
+            return Decimal(value['d'])
+        if 't' in value:
+            return datetime.fromisoformat(value['t'])
+    except (InvalidOperation, TypeError, ValueError):
+        pass
+    raise InvalidCursor("Invalid cursor")
@@ -0,0 +1,111 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+HASHER_BUSY = "Authentication service is busy, please retry"
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def normalize_method(method):
+    # Mirrors werkzeug's defaults so a stored "scrypt:32768:8:1" matches a configured "scrypt".
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = args if args else (2 ** 15, 8, 1)
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{int(iterations)}"
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(stored_hash, password, method):
+    if not check_password_hash(stored_hash, password):
+        return False, None
+    if stored_hash.split('$', 1)[0] == normalize_method(method):
+        return True, None
+    return True, generate_password_hash(password, method=method)
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.method = 'scrypt'
+        self.workers = 0
+        self.max_pending = 0
+        self.timeout = 10
+        self.pending = 0
+        self.rejected = 0
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+        normalize_method(self.method)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', min(os.cpu_count() or 1, 4))
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', self.workers * 8)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        app.extensions['password_hasher'] = self
+
+    def _get_pool(self):
+        # Created lazily and per process, so pre-forking servers do not share one pool across workers.
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy(HASHER_BUSY)
+            self.pending += 1
+            pool = self._get_pool()
+
+        try:
+            future = pool.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # The slot is held until the work itself finishes, not just until this caller stops
+        # waiting, so timed-out hashes still occupying a worker keep counting against max_pending.
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy(HASHER_BUSY) from None
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.pending -= 1
+
+    def hash(self, password):
+        return self._run(_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        # new_hash is only returned when the stored hash was made with other parameters.
+        return self._run(_verify, stored_hash, password, self.method)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'method': normalize_method(self.method),
+                'workers': self.workers,
+                'pending': self.pending,
+                'max_pending': self.max_pending,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,193 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import request, jsonify, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rule(rule):
+    count, period = rule.split('/')
+    return int(count), PERIODS[period.strip().rstrip('s')]
+
+
+def _decide(previous, current, limit, window, now):
+    # Sliding-window counter: the previous fixed window is weighted by how much of it
+    # still overlaps the last `window` seconds.
+    elapsed = (now % window) / window
+    if previous * (1 - elapsed) + current + 1 <= limit:
+        return True, 0
+    if current + 1 > limit or not previous:
+        return False, math.ceil(window - now % window)
+    needed = 1 - (limit - current - 1) / previous
+    return False, max(math.ceil((needed - elapsed) * window), 1)
+
+
+class MemoryRateLimitBackend:
+    name = 'memory'
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, limit, window):
+        now = time.time()
+        window_id = int(now // window)
+        with self._lock:
+            # Entries are [window_id, current, previous, expires_at].
+            entry = self._windows.pop(key, None)
+            if entry is None or entry[0] < window_id - 1:
+                entry = [window_id, 0, 0, 0]
+            elif entry[0] == window_id - 1:
+                entry = [window_id, 0, entry[1], 0]
+
+            allowed, retry_after = _decide(entry[2], entry[1], limit, window, now)
+            if allowed:
+                entry[1] += 1
+            entry[3] = (window_id + 2) * window
+            self._windows[key] = entry
+
+            if len(self._windows) > self.max_keys:
+                for stale_key in [k for k, v in self._windows.items() if v[3] <= now]:
+                    del self._windows[stale_key]
+                while len(self._windows) > self.max_keys:
+                    del self._windows[next(iter(self._windows))]
+            return allowed, retry_after
+
+    def size(self):
+        with self._lock:
+            return len(self._windows)
+
+
+class SQLiteRateLimitBackend:
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._hits = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_windows ('
+            'key TEXT NOT NULL, window_id INTEGER NOT NULL, count INTEGER NOT NULL, expires_at REAL NOT NULL, '
+            'PRIMARY KEY (key, window_id))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_rate_limit_windows_expires_at ON rate_limit_windows (expires_at)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key, limit, window):
+        conn = self._connection()
+        now = time.time()
+        window_id = int(now // window)
+
+        # BEGIN IMMEDIATE serializes the read-decide-increment across worker processes.
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            counts = dict(conn.execute(
+                'SELECT window_id, count FROM rate_limit_windows WHERE key = ? AND window_id IN (?, ?)',
+                (key, window_id - 1, window_id)
+            ).fetchall())
+            allowed, retry_after = _decide(counts.get(window_id - 1, 0), counts.get(window_id, 0), limit, window, now)
+            if allowed:
+                conn.execute(
+                    'INSERT INTO rate_limit_windows (key, window_id, count, expires_at) VALUES (?, ?, 1, ?) '
+                    'ON CONFLICT(key, window_id) DO UPDATE SET count = count + 1',
+                    (key, window_id, (window_id + 2) * window)
+                )
+            self._hits += 1
+            if self._hits % 1000 == 0:
+                conn.execute('DELETE FROM rate_limit_windows WHERE expires_at <= ?', (now,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, retry_after
+
+    def size(self):
+        return self._connection().execute('SELECT COUNT(*) FROM rate_limit_windows').fetchone()[0]
+
+
+class RateLimiter:
+    def __init__(self):
+        self.backend = None
+        self.enabled = True
+        self.rules = {}
+        self.allowed = {}
+        self.rejected = {}
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app):
+        backend = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.rules = app.config.get('RATE_LIMITS', {})
+
+        if backend == 'memory':
+            self.backend = MemoryRateLimitBackend(app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+        elif backend == 'sqlite':
+            path = app.config.get('RATE_LIMIT_SQLITE_PATH') or os.path.join(app.instance_path, 'rate_limit.sqlite3')
+            self.backend = SQLiteRateLimitBackend(path)
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+        app.extensions['rate_limiter'] = self
+
+    def _record(self, name, allowed):
+        with self._stats_lock:
+            counters = self.allowed if allowed else self.rejected
+            counters[name] = counters.get(name, 0) + 1
+
+    def limit(self, name, default, per='ip'):
+        def identity():
+            if per == 'user':
+                try:
+                    verify_jwt_in_request(optional=True)
+                    subject = get_jwt_identity()
+                except (JWTExtendedException, PyJWTError):
+                    subject = None
+                if subject is not None:
+                    return f"user:{subject}"
+            return f"ip:{request.remote_addr}"
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+
+                limit, window = parse_rule(self.rules.get(name, default))
+                key = f"{name}:{identity()}"
+                allowed, retry_after = self.backend.acquire(key, limit, window)
+                self._record(name, allowed)
+                if not allowed:
+                    current_app.logger.info(f"Rate limit exceeded: {key}")
+                    return jsonify({'error': 'Too many requests'}), 429, {'Retry-After': str(retry_after)}
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._stats_lock:
+            allowed, rejected = dict(self.allowed), dict(self.rejected)
+        return {
+            'backend': self.backend.name,
+            'pid': os.getpid(),
+            'keys': self.backend.size(),
+            'allowed': allowed,
+            'rejected': rejected
+        }
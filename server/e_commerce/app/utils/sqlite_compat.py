@@ -0,0 +1,21 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import Values
+
+
+# SQLite cannot name the columns of a VALUES alias, so the set-based UPDATE ... FROM (VALUES ...)
+# statements wrap it in a SELECT that renames SQLite's column1..columnN. PostgreSQL is unaffected.
+@compiles(Values, 'sqlite')
+def _compile_values(element, compiler, asfrom=False, from_linter=None, **kw):
+    if not asfrom or element._unnamed:
+        return compiler.visit_values(element, asfrom=asfrom, from_linter=from_linter, **kw)
+
+    name = compiler.preparer.quote(element.name)
+    if from_linter:
+        from_linter.froms[element._de_clone()] = name
+
+    columns = ', '.join(
+        f"column{index} AS {compiler.preparer.quote(column.name)}"
+        for index, column in enumerate(element.columns, start=1)
+    )
+    kw.pop('visiting_cte', None)
+    return f"(SELECT {columns} FROM ({compiler._render_values(element, **kw)})) AS {name}"
@@ -0,0 +1,111 @@
+"""Compare checkout throughput for one hot product with and without sharded stock.
+
+Runs against a throwaway database: the schema is created on start and dropped on exit,
+and the script refuses to touch a database that already has tables.
+
+    python benchmarks/stock_checkout.py --database-url postgresql://localhost/shop_bench
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from sqlalchemy import inspect, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.models import User
+from app.service.address_service import AddressService
+from app.service.auth_service import AuthService
+from app.service.category_service import CategoryService
+from app.service.inventory_service import InventoryService
+from app.service.order_service import OrderService
+from app.service.product_service import ProductService
+
+
+def _seed(orders):
+    admin, error = AuthService.register_user({'fullname': 'Benchmark Admin', 'email': 'admin@bench.local', 'password': 'benchmark'})
+    if error:
+        raise click.ClickException(error)
+    admin.role = 'admin'
+    db.session.commit()
+
+    customer, error = AuthService.register_user({'fullname': 'Benchmark Customer', 'email': 'customer@bench.local', 'password': 'benchmark'})
+    if error:
+        raise click.ClickException(error)
+    address, error = AddressService.create_address(customer.id, {'title': 'Home', 'city': 'Istanbul', 'district': 'Kadikoy', 'detail': '-'})
+    if error:
+        raise click.ClickException(error)
+
+    category, error = CategoryService.create_category({'name': 'Benchmark'}, admin)
+    if error:
+        raise click.ClickException(error)
+    product, error = ProductService.create_product(
+        {'category_id': category.id, 'name': 'benchmark-stock', 'price': 1, 'stock': orders}, admin
+    )
+    if error:
+        raise click.ClickException(error)
+
+    return admin.id, customer.id, address.id, product.id
+
+
+def _run_checkouts(app, customer_id, address_id, product_id, orders, threads):
+    def checkout(_):
+        with app.app_context():
+            order, error = OrderService.create_order_direct(customer_id, address_id, [{'product_id': product_id, 'quantity': 1}])
+            return error is None
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        succeeded = sum(pool.map(checkout, range(orders)))
+    return succeeded, time.monotonic() - started
+
+
+@click.command()
+@click.option('--database-url', required=True, help='An empty database the benchmark may create and drop tables in.')
+@click.option('--orders', default=2000, show_default=True, help='Single-unit checkouts attempted per run.')
+@click.option('--threads', default=16, show_default=True, help='Concurrent checkouts.')
+@click.option('--shards', default=16, show_default=True, help='Shard count used for the sharded run.')
+def main(database_url, orders, threads, shards):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': threads, 'max_overflow': threads}
+        RATE_LIMIT_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        if inspect(db.engine).get_table_names():
+            raise click.ClickException("The database is not empty; point --database-url at a throwaway database.")
+
+        if db.engine.dialect.name == 'postgresql':
+            with db.engine.begin() as conn:
+                conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        db.create_all()
+        try:
+            admin_id, customer_id, address_id, product_id = _seed(orders)
+
+            for shard_count in (0, shards):
+                admin = db.session.get(User, admin_id)
+                ProductService.update_product(product_id, {'stock': orders}, admin)
+                _, error = InventoryService.rebalance(product_id, shard_count, admin)
+                if error:
+                    raise click.ClickException(error)
+
+                succeeded, elapsed = _run_checkouts(app, customer_id, address_id, product_id, orders, threads)
+                db.session.expire_all()
+                stock, _ = InventoryService.get_stock_shards(product_id)
+                label = f"{shard_count} shards" if shard_count else "unsharded"
+                click.echo(
+                    f"{label}: {succeeded}/{orders} orders in {elapsed:.2f}s "
+                    f"({succeeded / elapsed:.0f} orders/s), stock left {stock['stock']}"
+                )
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
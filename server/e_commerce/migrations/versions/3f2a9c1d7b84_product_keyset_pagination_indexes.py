@@ -0,0 +1,35 @@
+"""product keyset pagination indexes
+
+Revision ID: 3f2a9c1d7b84
+Revises: 
+Create Date: 2026-10-18 09:12:40.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b84'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    live = sa.text('is_deleted = false')
+    op.create_index('ix_products_live_price_id', 'products', ['price', 'id'], postgresql_where=live)
+    op.create_index('ix_products_live_name_id', 'products', ['name', 'id'], postgresql_where=live)
+    op.create_index('ix_products_category_live_id', 'products', ['category_id', 'id'], postgresql_where=live)
+    op.create_index('ix_products_category_live_price_id', 'products', ['category_id', 'price', 'id'],
+                    postgresql_where=live)
+    op.create_index('ix_products_category_live_name_id', 'products', ['category_id', 'name', 'id'],
+                    postgresql_where=live)
+
+
+def downgrade():
+    op.drop_index('ix_products_category_live_name_id', table_name='products')
+    op.drop_index('ix_products_category_live_price_id', table_name='products')
+    op.drop_index('ix_products_category_live_id', table_name='products')
+    op.drop_index('ix_products_live_name_id', table_name='products')
+    op.drop_index('ix_products_live_price_id', table_name='products')
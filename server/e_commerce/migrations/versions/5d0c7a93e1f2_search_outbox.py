@@ -0,0 +1,38 @@
+"""search outbox
+
+Revision ID: 5d0c7a93e1f2
+Revises: c41d9e2b6f10
+Create Date: 2026-10-18 12:41:55.901266
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0c7a93e1f2'
+down_revision = 'c41d9e2b6f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'search_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=10), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_search_outbox_product_id', 'search_outbox', ['product_id'])
+    op.create_index('ix_search_outbox_available_at_id', 'search_outbox', ['available_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_search_outbox_available_at_id', table_name='search_outbox')
+    op.drop_index('ix_search_outbox_product_id', table_name='search_outbox')
+    op.drop_table('search_outbox')
@@ -0,0 +1,39 @@
+"""order listing indexes
+
+Revision ID: 6e1b8d4a2f95
+Revises: 2c8e5f0a7d13
+Create Date: 2026-10-18 19:41:07.118254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1b8d4a2f95'
+down_revision = '2c8e5f0a7d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE orders SET created_at = now() WHERE created_at IS NULL")
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_orders_created_at_id', 'orders', [sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_orders_status_created_at_id', 'orders',
+                    ['status', sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_orders_user_created_at_id', 'orders',
+                    ['user_id', sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+
+
+def downgrade():
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_user_created_at_id', table_name='orders')
+    op.drop_index('ix_orders_status_created_at_id', table_name='orders')
+    op.drop_index('ix_orders_created_at_id', table_name='orders')
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
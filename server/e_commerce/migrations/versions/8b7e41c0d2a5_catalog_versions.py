@@ -0,0 +1,34 @@
+"""catalog versions
+
+Revision ID: 8b7e41c0d2a5
+Revises: 3f2a9c1d7b84
+Create Date: 2026-10-18 10:04:17.552910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b7e41c0d2a5'
+down_revision = '3f2a9c1d7b84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'catalog_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(
+        "INSERT INTO catalog_versions (name, version, updated_at) "
+        "VALUES ('products', 1, now()), ('categories', 1, now())"
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_versions')
@@ -0,0 +1,39 @@
+"""product stock shards
+
+Revision ID: 9a4f2e6c1b37
+Revises: e7a35b1c9d42
+Create Date: 2026-10-18 18:52:10.417320
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f2e6c1b37'
+down_revision = 'e7a35b1c9d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_stock_sharded', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    op.create_table(
+        'product_stock_shards',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('shard_no', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.CheckConstraint('quantity >= 0', name='ck_product_stock_shards_quantity'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'shard_no')
+    )
+
+
+def downgrade():
+    op.drop_table('product_stock_shards')
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_column('is_stock_sharded')
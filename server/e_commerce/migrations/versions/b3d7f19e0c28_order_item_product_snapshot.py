@@ -0,0 +1,44 @@
+"""order item product snapshot
+
+Revision ID: b3d7f19e0c28
+Revises: 6e1b8d4a2f95
+Create Date: 2026-10-18 19:58:31.640912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d7f19e0c28'
+down_revision = '6e1b8d4a2f95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('product_name', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('image_url', sa.String(length=500), nullable=True))
+
+    op.execute("""
+        UPDATE order_items
+        SET product_name = (
+                SELECT products.name FROM products WHERE products.id = order_items.product_id
+            ),
+            image_url = (
+                SELECT product_images.url FROM product_images
+                WHERE product_images.product_id = order_items.product_id
+                ORDER BY product_images.id
+                LIMIT 1
+            )
+    """)
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.alter_column('product_name', existing_type=sa.String(length=200), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_column('image_url')
+        batch_op.drop_column('product_name')
@@ -0,0 +1,43 @@
+"""user directory indexes
+
+Revision ID: c7f2b9e4a158
+Revises: a9e4d07b3c56
+Create Date: 2026-10-18 22:51:36.904127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f2b9e4a158'
+down_revision = 'a9e4d07b3c56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE users SET created_at = now() WHERE created_at IS NULL")
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_users_created_at_id', 'users', [sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_users_role_created_at_id', 'users',
+                    ['role', sa.text('created_at DESC'), sa.text('id DESC')])
+
+    # Email prefix search: a btree over the lowered value with text_pattern_ops serves LIKE 'abc%'
+    # regardless of the database collation. Full names are matched at word starts, which needs trigrams.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_users_email_lower_pattern', 'users', [sa.text('lower(email) text_pattern_ops')])
+    op.create_index('ix_users_fullname_lower_trgm', 'users', [sa.text('lower(fullname) gin_trgm_ops')],
+                    postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_users_fullname_lower_trgm', table_name='users')
+    op.drop_index('ix_users_email_lower_pattern', table_name='users')
+    op.drop_index('ix_users_role_created_at_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,43 @@
+"""cart items unique product
+
+Revision ID: d5a2c8e4b716
+Revises: b3d7f19e0c28
+Create Date: 2026-10-18 20:14:52.305871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2c8e4b716'
+down_revision = 'b3d7f19e0c28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Merge rows left behind by concurrent adds into the oldest one before the constraint goes on.
+    op.execute("""
+        UPDATE cart_items
+        SET quantity = LEAST(10, merged.quantity)
+        FROM (
+            SELECT MIN(id) AS id, SUM(quantity) AS quantity
+            FROM cart_items
+            GROUP BY cart_id, product_id
+            HAVING COUNT(*) > 1
+        ) AS merged
+        WHERE cart_items.id = merged.id
+    """)
+    op.execute("""
+        DELETE FROM cart_items
+        WHERE id NOT IN (SELECT MIN(id) FROM cart_items GROUP BY cart_id, product_id)
+    """)
+
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_cart_items_cart_product', ['cart_id', 'product_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_cart_items_cart_product', type_='unique')
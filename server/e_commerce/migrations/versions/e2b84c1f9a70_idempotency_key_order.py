@@ -0,0 +1,28 @@
+"""idempotency key order
+
+Revision ID: e2b84c1f9a70
+Revises: c7f2b9e4a158
+Create Date: 2026-10-19 10:12:05.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b84c1f9a70'
+down_revision = 'c7f2b9e4a158'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('order_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_idempotency_keys_order_id', 'orders', ['order_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_idempotency_keys_order_id', type_='foreignkey')
+        batch_op.drop_column('order_id')
@@ -0,0 +1,28 @@
+"""product updated_at
+
+Revision ID: e7a35b1c9d42
+Revises: 5d0c7a93e1f2
+Create Date: 2026-10-18 14:02:38.226104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a35b1c9d42'
+down_revision = '5d0c7a93e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+        batch_op.create_index('ix_products_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_updated_at')
+        batch_op.drop_column('updated_at')
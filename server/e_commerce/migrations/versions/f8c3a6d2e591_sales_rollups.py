@@ -0,0 +1,35 @@
+"""sales rollups
+
+Revision ID: f8c3a6d2e591
+Revises: d5a2c8e4b716
+Create Date: 2026-10-18 20:47:19.550236
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c3a6d2e591'
+down_revision = 'd5a2c8e4b716'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sales_rollups',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('day', 'product_id', 'shard')
+    )
+    op.create_index('ix_sales_rollups_product_day', 'sales_rollups', ['product_id', 'day'])
+
+
+def downgrade():
+    op.drop_index('ix_sales_rollups_product_day', table_name='sales_rollups')
+    op.drop_table('sales_rollups')
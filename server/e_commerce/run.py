@@ -1,6 +1,9 @@
 from app import create_app
 
-app = create_app()
+# Password hashing workers are spawned processes that re-import this module as __mp_main__;
+# they only need the hashing functions, not another application instance.
+if __name__ != '__mp_main__':
+    app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000, ssl_context=('cert.pem', 'key.pem'))
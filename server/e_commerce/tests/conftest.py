@@ -0,0 +1,142 @@
+import os
+import sys
+import types
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import config
+except ImportError:
+    # config.py holds deployment settings and is not checked in; the test config below sets
+    # everything the application needs.
+    config = types.ModuleType('config')
+    config.Config = type('Config', (), {})
+    sys.modules['config'] = config
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db, cache, rate_limiter
+from app.models import Address, Product, User
+from app.service.category_service import CategoryService
+from app.utils.rate_limit import MemoryRateLimitBackend
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'postgres: needs PostgreSQL (set TEST_DATABASE_URL to a throwaway database)')
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('e_commerce')
+
+    class TestConfig(config.Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+        SECRET_KEY = 'test'
+        JWT_SECRET_KEY = 'test-jwt-secret-key-of-at-least-32-bytes'
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        CACHE_BACKEND = 'memory'
+        RATE_LIMIT_BACKEND = 'memory'
+        RATE_LIMIT_ENABLED = False
+        PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+        PASSWORD_HASH_WORKERS = 0
+        IDEMPOTENCY_WAIT_SECONDS = 0.2
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        if db.engine.dialect.name == 'postgresql':
+            with db.engine.begin() as conn:
+                conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        db.create_all()
+
+    yield app
+
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def _clean_state(app):
+    yield
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    cache.clear()
+    CategoryService.invalidate_tree()
+    rate_limiter.backend = MemoryRateLimitBackend()
+
+
+@pytest.fixture(autouse=True)
+def _skip_without_postgres(request, app):
+    if request.node.get_closest_marker('postgres'):
+        with app.app_context():
+            if db.engine.dialect.name != 'postgresql':
+                pytest.skip('needs PostgreSQL')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def app_ctx(app):
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def seed(app):
+    """An admin, a customer with an address, and one product in stock; returns their ids."""
+    with app.app_context():
+        admin = User(fullname='Admin', email='admin@example.com', role='admin')
+        admin.set_password('secret1')
+        customer = User(fullname='Customer', email='customer@example.com')
+        customer.set_password('secret1')
+        db.session.add_all([admin, customer])
+        db.session.flush()
+
+        address = Address(user_id=customer.id, title='Home', city='Istanbul', district='Kadikoy', detail='-')
+        db.session.add(address)
+        db.session.commit()
+        category, _ = CategoryService.create_category({'name': 'Electronics'}, admin)
+
+        product = Product(seller_id=admin.id, category_id=category.id, name='Phone', price=100, stock=10)
+        db.session.add(product)
+        db.session.commit()
+
+        return types.SimpleNamespace(
+            admin_id=admin.id, customer_id=customer.id, address_id=address.id,
+            category_id=category.id, product_id=product.id
+        )
+
+
+@pytest.fixture
+def auth_header(app):
+    def make(user_id, role='customer'):
+        with app.app_context():
+            token = create_access_token(identity=str(user_id), additional_claims={'role': role})
+        return {'Authorization': f"Bearer {token}"}
+    return make
+
+
+@pytest.fixture
+def count_queries(app_ctx):
+    """Context manager collecting the SQL statements run inside it."""
+    @contextmanager
+    def count():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return count
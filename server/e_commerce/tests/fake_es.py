@@ -0,0 +1,87 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeElasticsearch:
+    """Just enough of the Elasticsearch HTTP API for the bulk helper and for recorded searches."""
+
+    def __init__(self):
+        self.documents = {}
+        self.versions = {}
+        self.bulk_requests = []
+        self.fail_with = None
+        self.search_requests = []
+        self.search_response = None
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def bulk(self, lines):
+        actions = []
+        items = []
+        lines = iter(lines)
+        for header in lines:
+            op_type, meta = next(iter(header.items()))
+            source = next(lines) if op_type in ('index', 'create', 'update') else None
+            actions.append((op_type, meta, source))
+            items.append({op_type: {'_id': meta['_id'], 'status': self._apply(op_type, meta, source)}})
+        self.bulk_requests.append(actions)
+        return {'took': 1, 'errors': any(item[op]['status'] >= 300 for item in items for op in item), 'items': items}
+
+    def _apply(self, op_type, meta, source):
+        if self.fail_with:
+            return self.fail_with
+
+        key = (meta['_index'], str(meta['_id']))
+        version = meta.get('version')
+        if version is not None:
+            if self.versions.get(key, 0) >= version:
+                return 409
+            self.versions[key] = version
+
+        if op_type == 'delete':
+            return 200 if self.documents.pop(key, None) is not None else 404
+        self.documents[key] = source
+        return 201
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('X-Elastic-Product', 'Elasticsearch')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._send(200, {'version': {'number': '8.15.0'}})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode()
+                if self.path.split('?')[0].endswith('/_bulk'):
+                    self._send(200, fake.bulk([json.loads(line) for line in body.splitlines() if line]))
+                elif self.path.split('?')[0].endswith('/_search'):
+                    fake.search_requests.append(json.loads(body))
+                    self._send(200, fake.search_response)
+                else:
+                    self._send(404, {'error': f"unsupported path {self.path}"})
+
+            do_PUT = do_POST
+
+        return Handler
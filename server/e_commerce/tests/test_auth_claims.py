@@ -0,0 +1,96 @@
+import pytest
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+from app import db, cache
+from app.models import User
+from app.service.user_service import UserService
+from app.utils.cache import SQLiteCacheBackend
+
+
+@pytest.fixture
+def shared_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'backend', SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'), 1000))
+
+
+def _delete(app, user_id):
+    with app.app_context():
+        _, error = UserService.delete_user(user_id)
+        assert error is None
+
+
+def test_admin_claim_authorizes_admin_endpoint(client, seed, auth_header):
+    response = client.get('/api/users', headers=auth_header(seed.admin_id, 'admin'))
+
+    assert response.status_code == 200
+
+
+def test_customer_claim_is_rejected_by_admin_endpoint(client, seed, auth_header):
+    response = client.get('/api/users', headers=auth_header(seed.customer_id))
+
+    assert response.status_code == 403
+    assert response.get_json() == {'error': 'Admin access required'}
+
+
+def test_token_without_role_claim_falls_back_to_the_user_row(app, client, seed):
+    with app.app_context():
+        token = create_access_token(identity=str(seed.admin_id))
+
+    response = client.get('/api/users', headers={'Authorization': f"Bearer {token}"})
+
+    assert response.status_code == 200
+
+
+def test_deleted_admin_token_gets_401_where_the_user_is_needed(app, client, seed, auth_header):
+    headers = auth_header(seed.admin_id, 'admin')
+    _delete(app, seed.admin_id)
+
+    response = client.post('/api/categories', headers=headers, json={'name': 'Books'})
+
+    assert response.status_code == 401
+
+
+def test_deleted_user_token_gets_401_on_me(app, client, seed, auth_header):
+    headers = auth_header(seed.customer_id)
+    _delete(app, seed.customer_id)
+
+    assert client.get('/api/users/me', headers=headers).status_code == 401
+
+
+def test_refresh_reissues_the_current_role(app, client, seed):
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        customer = db.session.get(User, seed.customer_id)
+        _, error = UserService.update_user(seed.customer_id, {'role': 'seller'}, admin)
+        assert error is None
+        refresh = create_refresh_token(identity=str(customer.id), additional_claims={'role': 'customer'})
+
+    response = client.post('/api/auth/refresh', headers={'Authorization': f"Bearer {refresh}"})
+
+    assert response.status_code == 200
+    with app.app_context():
+        assert decode_token(response.get_json()['access_token'])['role'] == 'seller'
+
+
+def test_cached_user_is_a_detached_snapshot(app_ctx, seed, shared_cache):
+    UserService.get_cached_user(seed.customer_id)
+
+    user = UserService.get_cached_user(seed.customer_id)
+
+    assert user.email == 'customer@example.com'
+    assert user not in db.session
+
+
+def test_update_user_invalidates_the_cached_user(app_ctx, seed, shared_cache):
+    UserService.get_cached_user(seed.customer_id)
+    admin = db.session.get(User, seed.admin_id)
+
+    UserService.update_user(seed.customer_id, {'role': 'seller'}, admin)
+
+    assert UserService.get_cached_user(seed.customer_id).role == 'seller'
+
+
+def test_deleted_user_drops_out_of_the_cache(app_ctx, seed, shared_cache):
+    UserService.get_cached_user(seed.customer_id)
+
+    UserService.delete_user(seed.customer_id)
+
+    assert UserService.get_cached_user(seed.customer_id) is None
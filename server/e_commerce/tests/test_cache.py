@@ -0,0 +1,97 @@
+import types
+import pytest
+from app import cache, db
+from app.models import User
+from app.service.category_service import CategoryService
+from app.service.product_service import ProductService
+from app.utils import cache as cache_module
+from app.utils.cache import MemoryCacheBackend, SQLiteCacheBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, 'time', types.SimpleNamespace(monotonic=lambda: now[0], time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryCacheBackend(max_entries=2)
+    return SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'), max_entries=2)
+
+
+def test_least_recently_used_entry_is_evicted(backend, clock):
+    backend.set('a', 1, 60)
+    clock[0] += 1
+    backend.set('b', 2, 60)
+    clock[0] += 1
+    backend.get('a')
+    clock[0] += 1
+
+    backend.set('c', 3, 60)
+
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (1, None, 3)
+
+
+def test_entries_expire_after_their_ttl(backend, clock):
+    backend.set('a', {'x': 1}, 10)
+
+    clock[0] += 9
+    assert backend.get('a') == {'x': 1}
+    clock[0] += 1
+    assert backend.get('a') is None
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    first, second = SQLiteCacheBackend(path), SQLiteCacheBackend(path)
+
+    first.set('product:1', {'name': 'Phone'}, 60)
+    first.incr('gen:products')
+
+    assert second.get('product:1') == {'name': 'Phone'}
+    assert second.counter('gen:products') == 1
+    second.delete('product:1')
+    assert first.get('product:1') is None
+
+
+def test_product_detail_is_served_from_cache_until_updated(app, client, seed):
+    url = f"/api/products/{seed.product_id}"
+    client.get(url)
+    hits = cache.hits
+
+    assert client.get(url).get_json()['name'] == 'Phone'
+    assert cache.hits == hits + 1
+
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        ProductService.update_product(seed.product_id, {'name': 'Smartphone'}, requesting_user=admin)
+
+    assert client.get(url).get_json()['name'] == 'Smartphone'
+
+
+def test_new_product_invalidates_parent_category_listings(app, client, seed):
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        child, _ = CategoryService.create_category({'name': 'Phones', 'parent_id': seed.category_id}, admin)
+        child_id = child.id
+    url = f"/api/products/category/{seed.category_id}?include_descendants=1&limit=10"
+    assert [item['name'] for item in client.get(url).get_json()['items']] == ['Phone']
+
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        ProductService.create_product({'name': 'Pixel', 'price': 50, 'stock': 1, 'category_id': child_id}, admin)
+
+    assert [item['name'] for item in client.get(url).get_json()['items']] == ['Phone', 'Pixel']
+
+
+def test_metrics_expose_cache_hit_counters(client, seed, auth_header):
+    client.get('/api/products')
+    client.get('/api/products')
+
+    stats = client.get('/api/metrics', headers=auth_header(seed.admin_id, 'admin')).get_json()['cache']
+
+    assert stats['backend'] == 'memory'
+    assert stats['hits'] >= 1 and stats['misses'] >= 1
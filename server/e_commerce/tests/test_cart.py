@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import db
+from app.models import CartItem, Product
+from app.service.cart_service import CartService, MAX_ITEM_QUANTITY
+
+
+def _quantities(response):
+    return {item['product']['id']: item['quantity'] for item in response.get_json()['items']}
+
+
+def test_adding_the_same_product_twice_updates_one_row(client, seed, auth_header):
+    headers = auth_header(seed.customer_id)
+
+    first = client.post('/api/cart/items', headers=headers, json={'product_id': seed.product_id, 'quantity': 2})
+    second = client.post('/api/cart/items', headers=headers, json={'product_id': seed.product_id, 'quantity': 3})
+
+    assert first.status_code == second.status_code == 201
+    assert first.get_json()['cart_item']['id'] == second.get_json()['cart_item']['id']
+    assert second.get_json()['cart_item']['quantity'] == 5
+    assert _quantities(client.get('/api/cart', headers=headers)) == {seed.product_id: 5}
+
+
+def test_add_rejects_quantities_over_the_per_item_cap(client, seed, auth_header):
+    headers = auth_header(seed.customer_id)
+    client.post('/api/cart/items', headers=headers, json={'product_id': seed.product_id, 'quantity': 8})
+
+    response = client.post('/api/cart/items', headers=headers, json={'product_id': seed.product_id, 'quantity': 3})
+
+    assert response.status_code == 400
+    assert str(MAX_ITEM_QUANTITY) in response.get_json()['error']
+    assert _quantities(client.get('/api/cart', headers=headers)) == {seed.product_id: 8}
+
+
+def test_add_rejects_more_than_the_available_stock(app, client, seed, auth_header):
+    with app.app_context():
+        db.session.get(Product, seed.product_id).stock = 2
+        db.session.commit()
+
+    response = client.post(
+        '/api/cart/items', headers=auth_header(seed.customer_id), json={'product_id': seed.product_id, 'quantity': 3}
+    )
+
+    assert response.status_code == 400
+    with app.app_context():
+        assert CartItem.query.count() == 0
+
+
+def test_add_rejects_the_op_field(client, seed, auth_header):
+    response = client.post(
+        '/api/cart/items', headers=auth_header(seed.customer_id),
+        json={'product_id': seed.product_id, 'quantity': 1, 'op': 'remove'}
+    )
+
+    assert response.status_code == 422
+    assert 'op' in response.get_json()
+
+
+def test_patch_applies_operations_in_order(client, seed, auth_header):
+    headers = auth_header(seed.customer_id)
+    client.post('/api/cart/items', headers=headers, json={'product_id': seed.product_id, 'quantity': 2})
+
+    response = client.patch('/api/cart', headers=headers, json={'items': [
+        {'product_id': seed.product_id, 'op': 'set', 'quantity': 4},
+        {'product_id': seed.product_id, 'quantity': 3},
+    ]})
+    assert response.status_code == 200
+    assert _quantities(response) == {seed.product_id: 7}
+
+    response = client.patch('/api/cart', headers=headers, json={'items': [{'product_id': seed.product_id, 'op': 'remove'}]})
+    assert response.status_code == 200
+    assert _quantities(response) == {}
+
+
+def test_patch_is_all_or_nothing(client, seed, auth_header):
+    headers = auth_header(seed.customer_id)
+    client.post('/api/cart/items', headers=headers, json={'product_id': seed.product_id, 'quantity': 2})
+
+    response = client.patch('/api/cart', headers=headers, json={'items': [
+        {'product_id': seed.product_id, 'op': 'set', 'quantity': 5},
+        {'product_id': 999999, 'quantity': 1},
+    ]})
+
+    assert response.status_code == 404
+    assert response.get_json()['error'].startswith('items[1]')
+    assert _quantities(client.get('/api/cart', headers=headers)) == {seed.product_id: 2}
+
+
+@pytest.mark.postgres
+def test_concurrent_adds_are_not_lost_and_respect_the_cap(app, seed):
+    def add(_):
+        with app.app_context():
+            return CartService.add_item_to_cart(seed.customer_id, {'product_id': seed.product_id, 'quantity': 1})[1]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        errors = list(pool.map(add, range(MAX_ITEM_QUANTITY + 4)))
+
+    assert errors.count(None) == MAX_ITEM_QUANTITY
+    with app.app_context():
+        assert CartItem.query.one().quantity == MAX_ITEM_QUANTITY
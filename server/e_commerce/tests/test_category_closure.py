@@ -0,0 +1,72 @@
+from app import db
+from app.models import CategoryClosure, Product, User
+from app.service.category_service import CategoryService
+
+
+def _admin(seed):
+    return db.session.get(User, seed.admin_id)
+
+
+def _category(seed, name, parent_id=None):
+    category, error = CategoryService.create_category({'name': name, 'parent_id': parent_id}, _admin(seed))
+    assert error is None
+    return category.id
+
+
+def _paths():
+    return {(row.ancestor_id, row.descendant_id, row.depth) for row in CategoryClosure.query}
+
+
+def test_create_links_every_ancestor(app_ctx, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+    cases = _category(seed, 'Cases', phones)
+
+    assert _paths() == {
+        (seed.category_id, seed.category_id, 0), (phones, phones, 0), (cases, cases, 0),
+        (seed.category_id, phones, 1), (phones, cases, 1), (seed.category_id, cases, 2),
+    }
+
+
+def test_reparent_moves_the_whole_subtree(app_ctx, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+    cases = _category(seed, 'Cases', phones)
+    gifts = _category(seed, 'Gifts')
+
+    _, error = CategoryService.update_category(phones, {'parent_id': gifts}, _admin(seed))
+
+    assert error is None
+    assert sorted(CategoryService.get_descendant_ids(gifts)) == sorted([gifts, phones, cases])
+    assert CategoryService.get_descendant_ids(seed.category_id) == [seed.category_id]
+    assert (gifts, cases, 2) in _paths()
+
+
+def test_cannot_move_a_category_under_its_own_subtree(app_ctx, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+
+    _, error = CategoryService.update_category(seed.category_id, {'parent_id': phones}, _admin(seed))
+
+    assert error == "A category cannot be moved under its own subcategory"
+
+
+def test_delete_removes_the_category_paths(app_ctx, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+
+    _, error = CategoryService.delete_category(phones, _admin(seed))
+
+    assert error is None
+    assert _paths() == {(seed.category_id, seed.category_id, 0)}
+
+
+def test_listing_includes_descendants_on_request(app, client, seed):
+    with app.app_context():
+        phones = _category(seed, 'Phones', seed.category_id)
+        cases = _category(seed, 'Cases', phones)
+        db.session.add(Product(seller_id=seed.admin_id, category_id=cases, name='Case', price=5, stock=1))
+        db.session.commit()
+    url = f"/api/products/category/{seed.category_id}"
+
+    direct = client.get(url).get_json()
+    subtree = client.get(f"{url}?include_descendants=1").get_json()
+
+    assert [product['name'] for product in direct] == ['Phone']
+    assert sorted(product['name'] for product in subtree) == ['Case', 'Phone']
@@ -0,0 +1,73 @@
+from app import db
+from app.models import User
+from app.service.catalog_version_service import CatalogVersionService
+from app.service.category_service import CategoryService
+
+
+def _admin(seed):
+    return db.session.get(User, seed.admin_id)
+
+
+def _category(seed, name, parent_id=None):
+    category, error = CategoryService.create_category({'name': name, 'parent_id': parent_id}, _admin(seed))
+    assert error is None
+    return category.id
+
+
+def test_tree_loads_in_one_query_and_is_reused(count_queries, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+    _category(seed, 'Cases', phones)
+    CategoryService.invalidate_tree()
+
+    with count_queries() as cold:
+        tree = CategoryService.get_tree()
+    with count_queries() as warm:
+        assert CategoryService.get_tree() is tree
+
+    # One query for the categories version, one for the rows; a warm tree only checks the version.
+    assert (len(cold), len(warm)) == (2, 1)
+
+
+def test_tree_serves_roots_subtrees_and_breadcrumbs(app_ctx, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+    cases = _category(seed, 'Cases', phones)
+    tree = CategoryService.get_tree()
+
+    assert tree.roots() == [{
+        'id': seed.category_id, 'name': 'Electronics', 'parent_id': None,
+        'children': [{'id': phones, 'name': 'Phones', 'children': [{'id': cases, 'name': 'Cases', 'children': []}]}]
+    }]
+    assert [crumb['name'] for crumb in tree.breadcrumbs(cases)] == ['Electronics', 'Phones', 'Cases']
+    assert tree.subtree(999999) is None
+
+
+def test_tree_is_rebuilt_after_category_writes(app_ctx, seed):
+    phones = _category(seed, 'Phones', seed.category_id)
+    before = CategoryService.get_tree()
+
+    CategoryService.update_category(phones, {'name': 'Mobile'}, _admin(seed))
+
+    tree = CategoryService.get_tree()
+    assert tree is not before
+    assert tree.nodes[phones]['name'] == 'Mobile'
+
+
+def test_tree_follows_writes_made_by_another_worker(app_ctx, seed):
+    tree = CategoryService.get_tree()
+
+    # Another process changed the table: only the shared version counter tells this one.
+    CatalogVersionService.bump('categories')
+    db.session.commit()
+
+    assert CategoryService.get_tree() is not tree
+
+
+def test_breadcrumbs_endpoint(client, seed, app):
+    with app.app_context():
+        phones = _category(seed, 'Phones', seed.category_id)
+
+    response = client.get(f"/api/categories/{phones}/breadcrumbs")
+
+    assert response.status_code == 200
+    assert response.get_json() == [{'id': seed.category_id, 'name': 'Electronics'}, {'id': phones, 'name': 'Phones'}]
+    assert client.get('/api/categories/999999/breadcrumbs').status_code == 404
@@ -0,0 +1,60 @@
+import pytest
+from app import db
+from app.models import Favorite, Product, ProductImage
+from app.schemas.favorite_schema import FavoriteSchema
+from app.schemas.order_schema import OrderSchema
+from app.schemas.product_schema import ProductSchema
+from app.service.favorite_service import FavoriteService
+from app.service.order_service import OrderService
+from app.service.product_service import ProductService
+
+
+def _add_products(seed, count):
+    for i in range(count):
+        product = Product(seller_id=seed.admin_id, category_id=seed.category_id, name=f"Item {i}", price=10, stock=5)
+        product.images = [ProductImage(url=f"uploads/{i}-{n}.png") for n in range(2)]
+        db.session.add(product)
+        db.session.add(Favorite(user_id=seed.customer_id, product=product))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def _dump_cost(count_queries, load, schema):
+    db.session.expunge_all()
+    with count_queries() as statements:
+        schema.dump(load())
+    return len(statements)
+
+
+@pytest.mark.parametrize('load, schema', [
+    (ProductService.get_all_products, ProductSchema(many=True)),
+    (lambda: ProductService.get_products_page(50)[0]['items'], ProductSchema(many=True)),
+])
+def test_product_lists_cost_the_same_whatever_their_size(count_queries, seed, load, schema):
+    _add_products(seed, 1)
+    small = _dump_cost(count_queries, load, schema)
+
+    _add_products(seed, 6)
+
+    assert _dump_cost(count_queries, load, schema) == small
+
+
+def test_favorites_cost_the_same_whatever_their_size(count_queries, seed):
+    load = lambda: FavoriteService.get_user_favorites(seed.customer_id)
+    _add_products(seed, 1)
+    small = _dump_cost(count_queries, load, FavoriteSchema(many=True))
+
+    _add_products(seed, 6)
+
+    assert _dump_cost(count_queries, load, FavoriteSchema(many=True)) == small
+
+
+def test_order_history_costs_the_same_whatever_its_size(count_queries, seed):
+    load = lambda: OrderService.get_orders_by_user(seed.customer_id)
+    OrderService.create_order_direct(seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 1}])
+    small = _dump_cost(count_queries, load, OrderSchema(many=True))
+
+    for _ in range(4):
+        OrderService.create_order_direct(seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 1}])
+
+    assert _dump_cost(count_queries, load, OrderSchema(many=True)) == small
@@ -0,0 +1,71 @@
+from app import db
+from app.models import User
+from app.service.order_service import OrderService
+from app.service.product_service import ProductService
+
+
+def _checkout(app, seed, quantity=1):
+    with app.app_context():
+        _, error = OrderService.create_order_direct(
+            seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': quantity}]
+        )
+        assert error is None
+
+
+def _update_product(app, seed, **data):
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        _, error = ProductService.update_product(seed.product_id, data, requesting_user=admin)
+        assert error is None
+
+
+def test_listing_answers_304_for_a_matching_etag(client, seed):
+    response = client.get('/api/products')
+    etag = response.headers['ETag']
+
+    repeat = client.get('/api/products', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert 'no-cache' in response.headers['Cache-Control']
+    assert repeat.status_code == 304
+    assert repeat.data == b''
+
+
+def test_checkout_keeps_the_listing_version(app, client, seed):
+    etag = client.get('/api/products').headers['ETag']
+
+    _checkout(app, seed)
+
+    assert client.get('/api/products', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_checkout_revalidates_the_product_detail(app, client, seed):
+    url = f"/api/products/{seed.product_id}"
+    etag = client.get(url).headers['ETag']
+
+    _checkout(app, seed, quantity=4)
+    response = client.get(url, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.get_json()['stock'] == 6
+
+
+def test_product_update_changes_the_listing_and_its_cached_body(app, client, seed):
+    response = client.get('/api/products?limit=10')
+
+    _update_product(app, seed, name='Smartphone')
+    updated = client.get('/api/products?limit=10', headers={'If-None-Match': response.headers['ETag']})
+
+    assert updated.status_code == 200
+    assert updated.headers['ETag'] != response.headers['ETag']
+    assert updated.get_json()['items'][0]['name'] == 'Smartphone'
+
+
+def test_category_change_revalidates_category_endpoints(app, client, seed, auth_header):
+    etag = client.get('/api/categories').headers['ETag']
+
+    client.post('/api/categories', headers=auth_header(seed.admin_id, 'admin'), json={'name': 'Books'})
+    response = client.get('/api/categories', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert 'Books' in [category['name'] for category in response.get_json()]
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models import IdempotencyKey, Order
+from app.service.idempotency_service import IdempotencyService
+
+
+def test_begin_claims_a_new_key(app_ctx, seed):
+    record, error = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+
+    assert error is None
+    assert record.status == 'in_progress'
+
+
+def test_completed_keys_return_the_stored_response(app_ctx, seed):
+    record, _ = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+    IdempotencyService.complete(record.id, 201, '{"ok": true}')
+
+    replay, error = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+
+    assert error is None
+    assert replay.id == record.id
+    assert (replay.status, replay.response_code, replay.response_body) == ('completed', 201, '{"ok": true}')
+
+
+def test_keys_are_scoped_to_the_user(app_ctx, seed):
+    IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+
+    record, error = IdempotencyService.begin(seed.admin_id, 'key-1', 'hash-b')
+
+    assert error is None
+    assert record.user_id == seed.admin_id
+
+
+def test_reusing_a_key_for_another_request_is_rejected(app_ctx, seed):
+    record, _ = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+    IdempotencyService.complete(record.id, 201, '{}')
+
+    record, error = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-b')
+
+    assert record is None
+    assert 'farklı' in error
+
+
+def test_a_key_still_in_progress_is_reported_as_busy(app_ctx, seed):
+    IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+
+    record, error = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+
+    assert record is None
+    assert 'işleniyor' in error
+
+
+def test_released_keys_can_be_claimed_again(app_ctx, seed):
+    record, _ = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-a')
+    IdempotencyService.release(record.id)
+    db.session.remove()
+
+    record, error = IdempotencyService.begin(seed.customer_id, 'key-1', 'hash-b')
+
+    assert error is None
+    assert record.request_hash == 'hash-b'
+
+
+def test_order_endpoint_replays_a_completed_response(app, client, seed, auth_header):
+    headers = {**auth_header(seed.customer_id), 'Idempotency-Key': 'order-1'}
+    body = {'address_id': 999999, 'items': [{'product_id': seed.product_id, 'quantity': 1}]}
+
+    first = client.post('/api/orders', headers=headers, json=body)
+    second = client.post('/api/orders', headers=headers, json=body)
+
+    assert first.status_code == second.status_code == 400
+    assert second.get_json() == first.get_json()
+    assert 'Idempotent-Replayed' not in first.headers
+    assert second.headers['Idempotent-Replayed'] == 'true'
+
+    conflict = client.post('/api/orders', headers=headers, json={**body, 'address_id': seed.address_id})
+    assert conflict.status_code == 422
+    with app.app_context():
+        assert IdempotencyKey.query.count() == 1
+
+
+def test_retried_order_is_created_once(app, client, seed, auth_header):
+    headers = {**auth_header(seed.customer_id), 'Idempotency-Key': 'order-1'}
+    body = {'address_id': seed.address_id, 'items': [{'product_id': seed.product_id, 'quantity': 1}]}
+
+    first = client.post('/api/orders', headers=headers, json=body)
+    second = client.post('/api/orders', headers=headers, json=body)
+
+    assert first.status_code == second.status_code == 201
+    assert second.get_json()['order']['id'] == first.get_json()['order']['id']
+    with app.app_context():
+        assert Order.query.count() == 1
+
+
+@pytest.mark.parametrize('lock_expired', [False, True])
+def test_order_committed_without_a_stored_response_is_not_placed_again(app, client, seed, auth_header,
+                                                                      monkeypatch, lock_expired):
+    headers = {**auth_header(seed.customer_id), 'Idempotency-Key': 'order-1'}
+    body = {'address_id': seed.address_id, 'items': [{'product_id': seed.product_id, 'quantity': 1}]}
+
+    def crash(*args):
+        raise RuntimeError('worker died')
+
+    # The order commits, then the process dies before the response is written to the key.
+    with monkeypatch.context() as patch:
+        patch.setattr(IdempotencyService, 'complete', staticmethod(crash))
+        with pytest.raises(RuntimeError):
+            client.post('/api/orders', headers=headers, json=body)
+
+    with app.app_context():
+        record = IdempotencyKey.query.one()
+        assert record.status == 'in_progress'
+        assert record.order_id is not None
+        if lock_expired:
+            record.locked_at = datetime.utcnow() - timedelta(hours=1)
+            db.session.commit()
+        order_id = record.order_id
+
+    retry = client.post('/api/orders', headers=headers, json=body)
+
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json()['order']['id'] == order_id
+    with app.app_context():
+        assert Order.query.count() == 1
+        assert IdempotencyKey.query.one().status == 'completed'
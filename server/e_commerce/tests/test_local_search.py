@@ -0,0 +1,106 @@
+import socket
+import pytest
+from elasticsearch import Elasticsearch
+from app import db
+from app.models import Product, User
+from app.service import local_search_service
+from app.service.product_service import ProductService
+from app.utils import ElasticSearchService as es_module
+from app.utils.LocalSearchIndex import LocalSearchIndex, tokenize
+
+
+def _doc(doc_id, name, description='', category_id=1, price=10.0, stock=1):
+    return {'id': doc_id, 'name': name, 'description': description, 'category_id': category_id,
+            'price': price, 'stock': stock, 'is_deleted': False, 'image_url': None}
+
+
+def _ranked(index, query):
+    return [doc_id for doc_id, _ in sorted(index.score(query).items(), key=lambda item: (-item[1], item[0]))]
+
+
+@pytest.fixture
+def local_backend(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_BACKEND', 'local')
+    monkeypatch.setattr(local_search_service, '_index', None)
+    monkeypatch.setattr(local_search_service, '_synced_until', None)
+
+
+def test_tokens_are_case_and_accent_folded():
+    assert tokenize("İPHONE Kılıf, şarj") == ['iphone', 'kilif', 'sarj']
+
+
+def test_name_matches_outrank_description_matches():
+    index = LocalSearchIndex()
+    index.add(_doc(1, 'Case', 'fits any phone'))
+    index.add(_doc(2, 'Phone', 'a case is sold separately'))
+
+    assert _ranked(index, 'phone') == [2, 1]
+
+
+def test_rarer_terms_and_shorter_fields_score_higher():
+    index = LocalSearchIndex()
+    index.add(_doc(1, 'Blue phone'))
+    index.add(_doc(2, 'Blue phone charger cable'))
+    index.add(_doc(3, 'Blue shirt'))
+
+    scores = index.score('blue phone')
+
+    assert scores[1] > scores[2] > scores[3]
+
+
+def test_misspelled_terms_match_through_trigrams():
+    index = LocalSearchIndex()
+    index.add(_doc(1, 'Telefon'))
+    index.add(_doc(2, 'Tablet'))
+
+    assert _ranked(index, 'telefn') == [1]
+
+
+def test_removed_documents_leave_no_terms_behind():
+    index = LocalSearchIndex()
+    index.add(_doc(1, 'Telefon', 'akilli'))
+
+    index.remove(1)
+
+    assert len(index) == 0
+    assert index.score('telefon') == {}
+    assert not index.term_refs and not index.trigram_terms
+
+
+def test_local_backend_builds_from_the_table_and_follows_writes(app_ctx, seed, local_backend):
+    assert [hit['name'] for hit in ProductService.search_in_elastic('phone')] == ['Phone']
+
+    admin = db.session.get(User, seed.admin_id)
+    ProductService.update_product(seed.product_id, {'name': 'Telefon'}, requesting_user=admin)
+
+    assert ProductService.search_in_elastic('phone') == []
+    assert [hit['name'] for hit in ProductService.search_in_elastic('telefon')] == ['Telefon']
+
+
+def test_local_page_has_facets_and_cursor(app_ctx, seed, local_backend):
+    db.session.add_all([
+        Product(seller_id=seed.admin_id, category_id=seed.category_id, name=f"Phone {i}", price=price, stock=1)
+        for i, price in enumerate([50, 700])
+    ])
+    db.session.commit()
+
+    first, error = ProductService.search_products_page('phone', 2)
+    second, _ = ProductService.search_products_page('phone', 2, search_after=first['next_search_after'])
+
+    assert error is None
+    assert first['total'] == 3
+    assert {bucket['key']: bucket['count'] for bucket in first['facets']['price_ranges']} == {
+        '0-100': 1, '100-500': 1, '500-1000': 1, '1000-5000': 0, '5000+': 0
+    }
+    assert len({hit['id'] for hit in first['items'] + second['items']}) == 3
+
+
+def test_unreachable_cluster_falls_back_to_the_local_index(app, app_ctx, seed, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_LOCAL_FALLBACK', True)
+    monkeypatch.setattr(local_search_service, '_index', None)
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    monkeypatch.setattr(es_module, 'es', Elasticsearch([url], retry_on_timeout=False, max_retries=0))
+
+    assert [hit['name'] for hit in ProductService.search_in_elastic('phone')] == ['Phone']
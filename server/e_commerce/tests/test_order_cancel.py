@@ -0,0 +1,84 @@
+from app import db
+from app.models import Order, Product, User
+from app.service.inventory_service import InventoryService
+from app.service.order_service import OrderService
+
+
+def _order(seed, quantity):
+    order, error = OrderService.create_order_direct(
+        seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': quantity}]
+    )
+    assert error is None
+    return order.id
+
+
+def _available(product_id):
+    db.session.expire_all()
+    return db.session.get(Product, product_id).available_stock
+
+
+def test_cancel_restocks_the_order(app_ctx, seed):
+    order_id = _order(seed, 3)
+
+    assert OrderService.cancel_order(order_id, seed.customer_id) == (True, None)
+    assert _available(seed.product_id) == 10
+    assert db.session.get(Order, order_id).status == 'cancelled'
+
+
+def test_repeated_cancel_restocks_once(app_ctx, seed):
+    order_id = _order(seed, 3)
+    OrderService.cancel_order(order_id, seed.customer_id)
+
+    assert OrderService.cancel_order(order_id, seed.customer_id) == (False, "Order already cancelled")
+    # A concurrent cancel that passed the status check still loses at the conditional update.
+    assert OrderService._cancel([order_id]) == []
+    assert _available(seed.product_id) == 10
+
+
+def test_only_the_owner_or_an_admin_can_cancel(app_ctx, seed):
+    order_id = _order(seed, 1)
+
+    assert OrderService.cancel_order(order_id, seed.admin_id) == (False, "Access denied")
+    assert OrderService.cancel_order(order_id, seed.admin_id, is_admin=True) == (True, None)
+
+
+def test_shipped_orders_are_not_cancelled(app_ctx, seed):
+    order_id = _order(seed, 1)
+    OrderService.update_order_status(order_id, 'shipped')
+
+    assert OrderService.cancel_order(order_id, seed.customer_id) == (False, "Cannot cancel order with status: shipped")
+    assert _available(seed.product_id) == 9
+
+
+def test_bulk_cancel_restocks_with_one_aggregated_update(count_queries, seed):
+    order_ids = [_order(seed, quantity) for quantity in (1, 2, 3)]
+    OrderService.update_order_status(order_ids[2], 'shipped')
+
+    with count_queries() as statements:
+        result, error = OrderService.cancel_orders(order_ids + [999999])
+
+    assert error is None
+    assert result == {'cancelled': order_ids[:2], 'skipped': [
+        {'id': order_ids[2], 'error': "Cannot cancel order with status: shipped"},
+        {'id': 999999, 'error': "Order not found"},
+    ]}
+    assert len([s for s in statements if s.lstrip().upper().startswith('UPDATE PRODUCTS')]) == 1
+    assert _available(seed.product_id) == 7
+
+
+def test_cancel_releases_sharded_stock(app_ctx, seed):
+    admin = db.session.get(User, seed.admin_id)
+    InventoryService.rebalance(seed.product_id, 4, admin)
+    order_id = _order(seed, 5)
+
+    OrderService.cancel_order(order_id, seed.customer_id)
+
+    assert _available(seed.product_id) == 10
+
+
+def test_bulk_cancel_endpoint_is_admin_only(client, seed, auth_header):
+    payload = {'order_ids': [1]}
+
+    assert client.post('/api/orders/cancel', headers=auth_header(seed.customer_id), json=payload).status_code == 403
+    response = client.post('/api/orders/cancel', headers=auth_header(seed.admin_id, 'admin'), json={'order_ids': 'x'})
+    assert response.status_code == 400
@@ -0,0 +1,68 @@
+from datetime import datetime
+import pytest
+from app import db
+from app.models import Order
+from app.service.order_service import OrderService
+
+
+@pytest.fixture
+def orders(app, seed):
+    """Five orders, one per day from 2024-05-01, alternating pending/shipped; returns their ids oldest first."""
+    with app.app_context():
+        order_ids = []
+        for day in range(1, 6):
+            order, error = OrderService.create_order_direct(
+                seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 1}]
+            )
+            assert error is None
+            order.created_at = datetime(2024, 5, day, 12)
+            order.status = 'pending' if day % 2 else 'shipped'
+            order_ids.append(order.id)
+        db.session.commit()
+        return order_ids
+
+
+def _walk(client, headers, query):
+    order_ids, after = [], None
+    while True:
+        response = client.get(f"/api/orders?{query}" + (f"&after={after}" if after else ''), headers=headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        order_ids += [order['id'] for order in body['items']]
+        after = body['next_cursor']
+        if after is None:
+            return order_ids
+
+
+def test_admin_pages_through_orders_newest_first(client, seed, auth_header, orders):
+    assert _walk(client, auth_header(seed.admin_id, 'admin'), 'limit=2') == orders[::-1]
+
+
+def test_status_and_date_filters_combine(client, seed, auth_header, orders):
+    query = 'limit=10&status=pending&created_from=2024-05-02&created_to=2024-05-05'
+
+    assert _walk(client, auth_header(seed.admin_id, 'admin'), query) == [orders[4], orders[2]]
+
+
+def test_customers_only_see_their_own_orders(client, seed, auth_header, orders):
+    headers = auth_header(seed.customer_id)
+
+    assert _walk(client, headers, f"limit=10&user_id={seed.admin_id}") == orders[::-1]
+
+
+def test_invalid_filters_are_rejected(client, seed, auth_header):
+    headers = auth_header(seed.admin_id, 'admin')
+
+    assert client.get('/api/orders?created_from=yesterday', headers=headers).status_code == 400
+    assert client.get('/api/orders?status=lost', headers=headers).status_code == 400
+
+
+def test_page_items_are_loaded_in_one_batch(count_queries, seed, orders):
+    def cost(limit):
+        db.session.expunge_all()
+        with count_queries() as statements:
+            page, _ = OrderService.get_orders_page(limit)
+            [order.items[0].product_name for order in page['items']]
+        return len(statements)
+
+    assert cost(1) == cost(5)
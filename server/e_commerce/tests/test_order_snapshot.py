@@ -0,0 +1,59 @@
+from app import db
+from app.models import Product, ProductImage
+from app.schemas.order_schema import OrderSchema
+from app.service.cart_service import CartService
+from app.service.order_service import OrderService
+
+
+def _add_image(seed, url):
+    db.session.add(ProductImage(product_id=seed.product_id, url=url))
+    db.session.commit()
+
+
+def test_checkout_snapshots_name_and_first_image(app_ctx, seed):
+    _add_image(seed, 'uploads/phone.png')
+
+    order, error = OrderService.create_order_direct(
+        seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 2}]
+    )
+
+    assert error is None
+    [item] = order.items
+    assert (item.product_name, item.image_url) == ('Phone', 'uploads/phone.png')
+
+
+def test_cart_checkout_snapshots_too(app_ctx, seed):
+    CartService.add_item_to_cart(seed.customer_id, {'product_id': seed.product_id, 'quantity': 1})
+
+    order, error = OrderService.create_order_from_cart(seed.customer_id, seed.address_id)
+
+    assert error is None
+    assert order.items[0].product_name == 'Phone'
+    assert order.items[0].image_url is None
+
+
+def test_order_history_keeps_the_name_at_purchase_time(client, seed, auth_header, app):
+    with app.app_context():
+        order, _ = OrderService.create_order_direct(
+            seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 1}]
+        )
+        order_id = order.id
+        db.session.get(Product, seed.product_id).name = 'Phone 2'
+        db.session.commit()
+
+    body = client.get(f"/api/orders/{order_id}", headers=auth_header(seed.customer_id)).get_json()
+
+    assert body['items'][0]['product'] == {'id': seed.product_id, 'name': 'Phone', 'images': []}
+    assert body['items'][0]['subtotal'] == 100.0
+
+
+def test_order_rendering_reads_only_order_tables(count_queries, seed):
+    _add_image(seed, 'uploads/phone.png')
+    OrderService.create_order_direct(seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 1}])
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        OrderSchema(many=True).dump(OrderService.get_orders_by_user(seed.customer_id))
+
+    assert statements
+    assert not [statement for statement in statements if 'products' in statement or 'product_images' in statement]
@@ -0,0 +1,105 @@
+import pytest
+from app import db
+from app.models import Order, Product
+from app.service.order_service import OrderService
+
+
+def _orders(seed, *statuses):
+    order_ids = []
+    for status in statuses:
+        order, error = OrderService.create_order_direct(
+            seed.customer_id, seed.address_id, [{'product_id': seed.product_id, 'quantity': 1}]
+        )
+        assert error is None
+        order.status = status
+        order_ids.append(order.id)
+    db.session.commit()
+    return order_ids
+
+
+def _statuses(order_ids):
+    db.session.expire_all()
+    return [db.session.get(Order, order_id).status for order_id in order_ids]
+
+
+def test_bulk_update_applies_allowed_transitions_only(app_ctx, seed):
+    pending, shipped, delivered, cancelled = _orders(seed, 'pending', 'shipped', 'delivered', 'cancelled')
+
+    result, error = OrderService.update_order_statuses({
+        pending: 'processing', shipped: 'pending', delivered: 'delivered', cancelled: 'shipped', 999999: 'shipped'
+    })
+
+    assert error is None
+    assert result['updated'] == [{'id': pending, 'status': 'processing'}]
+    assert {entry['id']: entry['error'] for entry in result['skipped']} == {
+        shipped: "Cannot change order status from shipped to pending",
+        delivered: "Order is already delivered",
+        cancelled: "Cannot update a cancelled order",
+        999999: "Order not found",
+    }
+    assert _statuses([pending, shipped, delivered, cancelled]) == ['processing', 'shipped', 'delivered', 'cancelled']
+
+
+def test_bulk_cancel_restocks_cancellable_orders_only(app_ctx, seed):
+    processing, shipped = _orders(seed, 'processing', 'shipped')
+
+    result, error = OrderService.update_order_statuses({processing: 'cancelled', shipped: 'cancelled'})
+
+    assert error is None
+    assert result['updated'] == [{'id': processing, 'status': 'cancelled'}]
+    assert result['skipped'] == [{'id': shipped, 'error': "Cannot cancel order with status: shipped"}]
+    db.session.expire_all()
+    assert db.session.get(Product, seed.product_id).available_stock == 9
+
+
+def test_bulk_update_rejects_unknown_status(app_ctx, seed):
+    order_id, = _orders(seed, 'pending')
+
+    result, error = OrderService.update_order_statuses({order_id: 'lost'})
+
+    assert result is None
+    assert error.startswith("Invalid status")
+
+
+def test_matching_update_selects_orders_that_can_move(app_ctx, seed):
+    order_ids = _orders(seed, 'pending', 'processing', 'shipped', 'delivered', 'pending')
+
+    result, error = OrderService.update_order_statuses_matching('shipped', 1)
+
+    assert error is None
+    assert result['updated'] == [{'id': order_ids[0], 'status': 'shipped'}]
+    assert result['has_more'] is True
+
+    result, error = OrderService.update_order_statuses_matching('shipped', 10)
+
+    assert [entry['id'] for entry in result['updated']] == [order_ids[1], order_ids[4]]
+    assert result['has_more'] is False
+    assert _statuses(order_ids) == ['shipped', 'shipped', 'shipped', 'delivered', 'shipped']
+
+
+@pytest.mark.parametrize('current, target, error', [
+    ('pending', 'shipped', None),
+    ('shipped', 'processing', "Cannot change order status from shipped to processing"),
+    ('cancelled', 'delivered', "Cannot update a cancelled order"),
+])
+def test_single_update_follows_the_same_transitions(app_ctx, seed, current, target, error):
+    order_id, = _orders(seed, current)
+
+    order, result_error = OrderService.update_order_status(order_id, target)
+
+    assert result_error == error
+    assert _statuses([order_id]) == [target if error is None else current]
+
+
+def test_bulk_status_endpoint_reports_skipped_orders(client, seed, auth_header):
+    with client.application.app_context():
+        pending, delivered = _orders(seed, 'pending', 'delivered')
+
+    response = client.put('/api/orders/status', headers=auth_header(seed.admin_id, 'admin'), json={
+        'orders': [{'order_id': pending, 'status': 'shipped'}, {'order_id': delivered, 'status': 'shipped'}]
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()['skipped'] == [
+        {'id': delivered, 'error': "Cannot change order status from delivered to shipped"}
+    ]
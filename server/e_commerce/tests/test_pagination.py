@@ -0,0 +1,75 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from app import db
+from app.models import Product
+from app.service.product_service import ProductService
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def products(app, seed):
+    with app.app_context():
+        db.session.add_all([
+            Product(seller_id=seed.admin_id, category_id=seed.category_id, name=f"Item {i}", price=price, stock=1)
+            for i, price in enumerate([30, 10, 20, 10, 50])
+        ])
+        db.session.commit()
+
+
+def _walk(client, query):
+    names, after = [], None
+    while True:
+        response = client.get(f"/api/products?{query}" + (f"&after={after}" if after else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        names += [item['name'] for item in body['items']]
+        after = body['next_cursor']
+        if after is None:
+            return names
+
+
+def test_cursor_round_trips_decimals_and_datetimes():
+    values = [Decimal('10.50'), datetime(2024, 5, 1, 12, 30), 7]
+
+    assert decode_cursor(encode_cursor(values), [Decimal, datetime, int]) == values
+
+
+def test_pages_by_id_cover_every_product_once(client, products):
+    assert _walk(client, 'limit=2') == ['Phone', 'Item 0', 'Item 1', 'Item 2', 'Item 3', 'Item 4']
+
+
+def test_pages_by_price_break_ties_on_id(client, products):
+    assert _walk(client, 'limit=2&sort=-price') == ['Phone', 'Item 4', 'Item 0', 'Item 2', 'Item 3', 'Item 1']
+
+
+@pytest.mark.parametrize('after', [
+    'not-a-cursor',
+    encode_cursor(['cheap', 3]),
+    encode_cursor([True, 3]),
+    encode_cursor([Decimal('10')]),
+    encode_cursor([{'x': 1}, 3]),
+])
+def test_tampered_listing_cursor_is_a_400(client, products, after):
+    response = client.get(f"/api/products?limit=2&sort=price&after={after}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
+
+
+def test_tampered_order_cursor_is_a_400(client, seed, auth_header):
+    after = encode_cursor(['yesterday', 1])
+
+    response = client.get(f"/api/orders?limit=2&after={after}", headers=auth_header(seed.admin_id, 'admin'))
+
+    assert response.status_code == 400
+
+
+def test_search_cursor_is_type_checked(app_ctx):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor(['high', 1]), (float, int))
+
+    result, error = ProductService.search_products_page('phone', 10, search_after=encode_cursor([1, 'x']))
+
+    assert result is None
+    assert error == 'Invalid cursor'
@@ -0,0 +1,86 @@
+import config
+import pytest
+from werkzeug.security import generate_password_hash
+from app import db, password_hasher
+from app.models import User
+from app.utils.password_hasher import HASHER_BUSY, PasswordHasher, PasswordHasherBusy, normalize_method
+
+
+def _login(client, password='secret1'):
+    return client.post('/api/auth/login', json={'email': 'customer@example.com', 'password': password})
+
+
+def _stored_hash(app, user_id):
+    with app.app_context():
+        return db.session.get(User, user_id).password
+
+
+def _set_hash(app, user_id, method):
+    with app.app_context():
+        db.session.get(User, user_id).password = generate_password_hash('secret1', method=method)
+        db.session.commit()
+
+
+@pytest.mark.parametrize('method, normalized', [
+    ('scrypt', 'scrypt:32768:8:1'),
+    ('scrypt:16384:8:1', 'scrypt:16384:8:1'),
+    ('pbkdf2:sha256:1000', 'pbkdf2:sha256:1000'),
+])
+def test_methods_are_compared_with_defaults_filled_in(method, normalized):
+    assert normalize_method(method) == normalized
+
+
+def test_login_upgrades_a_hash_made_with_other_parameters(app, client, seed):
+    _set_hash(app, seed.customer_id, 'pbkdf2:sha256:500')
+
+    assert _login(client).status_code == 200
+    assert _stored_hash(app, seed.customer_id).startswith('pbkdf2:sha256:1000$')
+
+
+def test_current_hashes_and_failed_logins_are_left_alone(app, client, seed):
+    before = _stored_hash(app, seed.customer_id)
+    assert _login(client).status_code == 200
+    assert _stored_hash(app, seed.customer_id) == before
+
+    _set_hash(app, seed.customer_id, 'pbkdf2:sha256:500')
+    before = _stored_hash(app, seed.customer_id)
+    assert _login(client, 'wrong-password').status_code == 401
+    assert _stored_hash(app, seed.customer_id) == before
+
+
+def test_full_queue_answers_503_without_hashing(client, seed, monkeypatch):
+    monkeypatch.setattr(password_hasher, 'workers', 1)
+    monkeypatch.setattr(password_hasher, 'max_pending', 1)
+    monkeypatch.setattr(password_hasher, 'pending', 1)
+    rejected = password_hasher.rejected
+
+    response = _login(client)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.get_json() == {'error': HASHER_BUSY}
+    assert password_hasher.rejected == rejected + 1
+
+
+@pytest.mark.skipif(not getattr(config, '__file__', None), reason='pool workers import config.py, which is not checked in')
+def test_process_pool_hashes_and_verifies():
+    hasher = PasswordHasher()
+    hasher.method, hasher.workers, hasher.max_pending, hasher.timeout = 'pbkdf2:sha256:1000', 1, 4, 60
+    try:
+        stored = hasher.hash('secret1')
+
+        assert stored.startswith('pbkdf2:sha256:1000$')
+        assert hasher.verify(stored, 'secret1') == (True, None)
+        assert hasher.verify(stored, 'wrong') == (False, None)
+        assert hasher.stats()['pending'] == 0
+    finally:
+        hasher._pool.shutdown()
+
+
+def test_busy_pool_raises_before_submitting():
+    hasher = PasswordHasher()
+    hasher.workers, hasher.max_pending = 1, 0
+
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash('secret1')
+    assert hasher._pool is None
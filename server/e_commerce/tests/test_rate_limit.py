@@ -0,0 +1,88 @@
+import types
+import pytest
+from app import rate_limiter
+from app.utils import rate_limit
+from app.utils.rate_limit import MemoryRateLimitBackend, SQLiteRateLimitBackend, parse_rule
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(60 * 1000.0)
+    monkeypatch.setattr(rate_limit, 'time', types.SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryRateLimitBackend()
+    return SQLiteRateLimitBackend(str(tmp_path / 'rate_limit.sqlite3'))
+
+
+def test_parse_rule():
+    assert parse_rule('10/minute') == (10, 60)
+    assert parse_rule('5 / hours') == (5, 3600)
+
+
+def test_rejects_past_the_limit_until_the_window_ends(backend, clock):
+    assert [backend.acquire('login:ip:1', 3, 60)[0] for _ in range(3)] == [True, True, True]
+    assert backend.acquire('login:ip:1', 3, 60) == (False, 60)
+
+    clock.now += 20
+    assert backend.acquire('login:ip:1', 3, 60) == (False, 40)
+
+
+def test_previous_window_is_weighted_by_its_overlap(backend, clock):
+    for _ in range(3):
+        backend.acquire('login:ip:1', 3, 60)
+
+    # Halfway through the next window half of the previous three still count.
+    clock.now += 90
+    assert backend.acquire('login:ip:1', 3, 60) == (True, 0)
+    allowed, retry_after = backend.acquire('login:ip:1', 3, 60)
+    assert not allowed
+    assert 10 <= retry_after <= 11
+
+    clock.now += 10
+    assert backend.acquire('login:ip:1', 3, 60) == (True, 0)
+
+
+def test_keys_are_limited_independently(backend, clock):
+    for _ in range(3):
+        backend.acquire('login:ip:1', 3, 60)
+
+    assert backend.acquire('login:ip:1', 3, 60)[0] is False
+    assert backend.acquire('login:ip:2', 3, 60)[0] is True
+
+
+def test_memory_backend_evicts_beyond_max_keys(clock):
+    backend = MemoryRateLimitBackend(max_keys=2)
+    for key in ('a', 'b', 'c'):
+        backend.acquire(key, 1, 60)
+
+    assert backend.size() == 2
+
+
+def test_login_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'enabled', True)
+    monkeypatch.setattr(rate_limiter, 'rules', {'login': '2/minute'})
+    credentials = {'email': 'nobody@example.com', 'password': 'wrong-password'}
+
+    assert client.post('/api/auth/login', json=credentials).status_code == 401
+    assert client.post('/api/auth/login', json=credentials).status_code == 401
+
+    response = client.post('/api/auth/login', json=credentials)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= 60
+
+    other_client = client.post('/api/auth/login', json=credentials, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert other_client.status_code == 401
+    assert rate_limiter.stats()['rejected'] == {'login': 1}
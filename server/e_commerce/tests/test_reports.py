@@ -0,0 +1,95 @@
+from datetime import datetime
+import pytest
+from app import db
+from app.models import Product, SalesRollup, User
+from app.service.category_service import CategoryService
+from app.service.order_service import OrderService
+from app.service.report_service import ReportService
+
+
+@pytest.fixture
+def case_id(app, seed):
+    """A 'Case' product (price 5) in a 'Phones' subcategory of Electronics."""
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        phones, _ = CategoryService.create_category({'name': 'Phones', 'parent_id': seed.category_id}, admin)
+        case = Product(seller_id=seed.admin_id, category_id=phones.id, name='Case', price=5, stock=10)
+        db.session.add(case)
+        db.session.commit()
+        return case.id
+
+
+def _order(seed, *lines):
+    order, error = OrderService.create_order_direct(seed.customer_id, seed.address_id, [
+        {'product_id': product_id, 'quantity': quantity} for product_id, quantity in lines
+    ])
+    assert error is None
+    return order.id
+
+
+def _report(client, seed, auth_header, path, **args):
+    today = datetime.utcnow().date().isoformat()
+    args = {'from': today, 'to': today, **args}
+    query = '&'.join(f"{key}={value}" for key, value in args.items())
+    response = client.get(f"/api/reports/sales/{path}?{query}", headers=auth_header(seed.admin_id, 'admin'))
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _rollups():
+    return sorted(
+        (row.day, row.product_id, row.units, float(row.revenue))
+        for row in db.session.query(
+            SalesRollup.day, SalesRollup.product_id,
+            db.func.sum(SalesRollup.units).label('units'), db.func.sum(SalesRollup.revenue).label('revenue')
+        ).group_by(SalesRollup.day, SalesRollup.product_id)
+    )
+
+
+def test_checkout_and_cancel_update_the_daily_rollup(app, client, seed, auth_header, case_id):
+    with app.app_context():
+        _order(seed, (seed.product_id, 1), (case_id, 2))
+        cancelled = _order(seed, (seed.product_id, 3))
+        OrderService.cancel_order(cancelled, seed.customer_id)
+
+    [day] = _report(client, seed, auth_header, 'daily')['days']
+
+    assert (day['units'], day['revenue']) == (3, 110.0)
+
+
+def test_category_report_includes_descendants(app, client, seed, auth_header, case_id):
+    with app.app_context():
+        _order(seed, (seed.product_id, 1), (case_id, 2))
+
+    categories = _report(client, seed, auth_header, 'categories')['categories']
+    phones = _report(client, seed, auth_header, 'daily', category_id=categories[1]['category_id'])['days']
+
+    assert [(c['name'], c['units'], c['revenue']) for c in categories] == [('Electronics', 3, 110.0), ('Phones', 2, 10.0)]
+    assert phones[0]['revenue'] == 10.0
+
+
+def test_top_products_leave_out_fully_cancelled_products(app, client, seed, auth_header, case_id):
+    with app.app_context():
+        _order(seed, (seed.product_id, 1))
+        OrderService.cancel_order(_order(seed, (case_id, 2)), seed.customer_id)
+
+    products = _report(client, seed, auth_header, 'products')['products']
+
+    assert products == [{'product_id': seed.product_id, 'name': 'Phone', 'units': 1, 'revenue': 100.0}]
+
+
+def test_rebuild_matches_the_incremental_rollup(app_ctx, seed, case_id):
+    _order(seed, (seed.product_id, 1), (case_id, 2))
+    OrderService.cancel_order(_order(seed, (case_id, 1)), seed.customer_id)
+    incremental = [row for row in _rollups() if row[2]]
+
+    ReportService.rebuild()
+
+    assert _rollups() == incremental
+
+
+def test_reports_validate_their_range(client, seed, auth_header):
+    headers = auth_header(seed.admin_id, 'admin')
+
+    assert client.get('/api/reports/sales/daily?from=2024-05-02&to=2024-05-01', headers=headers).status_code == 400
+    assert client.get('/api/reports/sales/daily', headers=auth_header(seed.customer_id)).status_code == 403
@@ -0,0 +1,92 @@
+import socket
+import pytest
+from elasticsearch import Elasticsearch
+from app import db
+from app.models import User
+from app.service.category_service import CategoryService
+from app.service.product_service import MAX_SEARCH_WINDOW
+from app.utils import ElasticSearchService as es_module
+from app.utils.pagination import encode_cursor
+from fake_es import FakeElasticsearch
+
+
+def _response(*hits, total=None):
+    return {
+        'hits': {
+            'total': {'value': len(hits) if total is None else total},
+            'hits': [{'_source': source, 'sort': [1.5, source['id']]} for source in hits],
+        },
+        'aggregations': {
+            'categories': {'ids': {'buckets': [{'key': 1, 'doc_count': 4}]}},
+            'price_ranges': {'ranges': {'buckets': [{'key': '0-100', 'to': 100.0, 'doc_count': 3}]}},
+        },
+    }
+
+
+@pytest.fixture
+def es(monkeypatch):
+    fake = FakeElasticsearch().start()
+    monkeypatch.setattr(es_module, 'es', Elasticsearch([fake.url], retry_on_timeout=False, max_retries=0))
+    yield fake
+    fake.stop()
+
+
+def test_filters_and_facets_go_into_one_request(app, client, seed, es):
+    with app.app_context():
+        admin = db.session.get(User, seed.admin_id)
+        phones = CategoryService.create_category({'name': 'Phones', 'parent_id': seed.category_id}, admin)[0].id
+    es.search_response = _response({'id': 7, 'name': 'Phone', 'image_url': None})
+
+    response = client.get(
+        f"/api/products/search?q=phone&category_id={seed.category_id}&min_price=10&max_price=200&in_stock=1&size=1"
+    )
+
+    assert response.status_code == 200
+    [body] = es.search_requests
+    assert body['query']['bool']['filter'] == [{'term': {'is_deleted': False}}, {'range': {'stock': {'gt': 0}}}]
+    [categories, price] = body['post_filter']['bool']['filter']
+    assert sorted(categories['terms']['category_id']) == sorted([seed.category_id, phones])
+    assert price == {'range': {'price': {'gte': 10.0, 'lte': 200.0}}}
+    assert body['aggs']['categories']['filter'] == {'bool': {'filter': [price]}}
+    assert body['aggs']['price_ranges']['filter'] == {'bool': {'filter': [categories]}}
+    assert (body['from'], body['size']) == (0, 1)
+
+
+def test_response_carries_facets_and_the_next_cursor(client, seed, es):
+    es.search_response = _response({'id': 7, 'name': 'Phone', 'image_url': 'uploads/7.png'}, total=5)
+
+    body = client.get('/api/products/search?q=phone&size=1').get_json()
+
+    assert body['total'] == 5
+    assert body['items'][0]['images'] == [{'url': 'uploads/7.png'}]
+    assert body['facets'] == {
+        'categories': [{'category_id': 1, 'count': 4}],
+        'price_ranges': [{'key': '0-100', 'from': None, 'to': 100.0, 'count': 3}],
+    }
+    assert body['next_search_after'] == encode_cursor([1.5, 7])
+
+
+def test_search_after_replaces_the_offset(client, seed, es):
+    es.search_response = _response()
+
+    client.get(f"/api/products/search?q=phone&search_after={encode_cursor([1.5, 7])}")
+
+    [body] = es.search_requests
+    assert body['search_after'] == [1.5, 7]
+    assert 'from' not in body
+
+
+def test_deep_pages_must_use_search_after(client, seed, es):
+    response = client.get(f"/api/products/search?q=phone&size=10&page={MAX_SEARCH_WINDOW // 10 + 1}")
+
+    assert response.status_code == 400
+    assert es.search_requests == []
+
+
+def test_unreachable_cluster_is_a_503(client, seed, monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    monkeypatch.setattr(es_module, 'es', Elasticsearch([url], retry_on_timeout=False, max_retries=0))
+
+    assert client.get('/api/products/search?q=phone&page=1').status_code == 503
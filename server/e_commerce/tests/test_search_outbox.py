@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+import pytest
+from elasticsearch import Elasticsearch
+from app import db
+from app.models import Product, SearchOutbox
+from app.service.search_outbox_service import SearchOutboxService, MAX_BACKOFF_SECONDS
+from app.utils.ElasticSearchService import PRODUCTS_INDEX
+from fake_es import FakeElasticsearch
+
+
+@pytest.fixture
+def es():
+    fake = FakeElasticsearch().start()
+    fake.client = Elasticsearch([fake.url], retry_on_timeout=False, max_retries=0)
+    yield fake
+    fake.stop()
+
+
+def test_drain_coalesces_rows_for_the_same_product(app_ctx, seed, es):
+    for _ in range(3):
+        SearchOutboxService.enqueue(seed.product_id, 'index')
+    db.session.commit()
+
+    stats = SearchOutboxService.drain(client=es.client)
+
+    assert stats == {'processed': 3, 'indexed': 1, 'deleted': 0, 'failed': 0}
+    assert len(es.bulk_requests) == 1
+    [(op_type, meta, source)] = es.bulk_requests[0]
+    assert op_type == 'index'
+    assert meta['version_type'] == 'external'
+    assert source['name'] == 'Phone'
+    assert SearchOutboxService.pending_count() == 0
+
+
+def test_latest_operation_wins_when_coalescing(app_ctx, seed, es):
+    SearchOutboxService.enqueue(seed.product_id, 'index')
+    SearchOutboxService.enqueue(seed.product_id, 'delete')
+    db.session.commit()
+
+    stats = SearchOutboxService.drain(client=es.client)
+
+    assert stats['deleted'] == 1
+    assert [op_type for op_type, _, _ in es.bulk_requests[0]] == ['delete']
+
+
+def test_missing_and_deleted_products_are_removed_from_the_index(app_ctx, seed, es):
+    db.session.get(Product, seed.product_id).is_deleted = True
+    SearchOutboxService.enqueue(seed.product_id, 'index')
+    SearchOutboxService.enqueue(999999, 'index')
+    db.session.commit()
+
+    stats = SearchOutboxService.drain(client=es.client)
+
+    assert stats == {'processed': 2, 'indexed': 0, 'deleted': 2, 'failed': 0}
+    assert sorted(str(meta['_id']) for _, meta, _ in es.bulk_requests[0]) == sorted([str(seed.product_id), '999999'])
+    assert all(op_type == 'delete' for op_type, _, _ in es.bulk_requests[0])
+    assert SearchOutboxService.pending_count() == 0
+
+
+def test_failed_rows_back_off_exponentially(app_ctx, seed, es):
+    es.fail_with = 503
+    SearchOutboxService.enqueue(seed.product_id, 'index')
+    db.session.commit()
+
+    started = datetime.utcnow()
+    stats = SearchOutboxService.drain(client=es.client)
+
+    assert stats['failed'] == 1
+    row = SearchOutbox.query.one()
+    assert row.attempts == 1
+    assert row.last_error
+    assert started + timedelta(seconds=2) <= row.available_at <= datetime.utcnow() + timedelta(seconds=2)
+
+    # Not retried before it becomes available again.
+    assert SearchOutboxService.drain(client=es.client)['processed'] == 0
+    assert len(es.bulk_requests) == 1
+
+
+def test_backoff_is_capped(app_ctx, seed, es):
+    es.fail_with = 503
+    SearchOutboxService.enqueue(seed.product_id, 'index')
+    db.session.commit()
+    SearchOutbox.query.one().attempts = 20
+    db.session.commit()
+
+    started = datetime.utcnow()
+    SearchOutboxService.drain(client=es.client)
+
+    row = SearchOutbox.query.one()
+    assert row.attempts == 21
+    assert started + timedelta(seconds=MAX_BACKOFF_SECONDS) <= row.available_at
+    assert row.available_at <= datetime.utcnow() + timedelta(seconds=MAX_BACKOFF_SECONDS)
+
+
+def test_rows_are_retried_once_available(app_ctx, seed, es):
+    es.fail_with = 503
+    SearchOutboxService.enqueue(seed.product_id, 'index')
+    db.session.commit()
+    SearchOutboxService.drain(client=es.client)
+
+    es.fail_with = None
+    SearchOutbox.query.one().available_at = datetime.utcnow()
+    db.session.commit()
+
+    assert SearchOutboxService.drain(client=es.client)['indexed'] == 1
+    assert (PRODUCTS_INDEX, str(seed.product_id)) in es.documents
+    assert SearchOutboxService.pending_count() == 0
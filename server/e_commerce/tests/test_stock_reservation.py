@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import db
+from app.models import Order, Product, ProductStockShard, SearchOutbox, User
+from app.service.inventory_service import InventoryService
+from app.service.order_service import OrderService
+from app.service.product_service import ProductService
+
+
+def _order(seed, quantity, product_id=None):
+    return OrderService.create_order_direct(
+        seed.customer_id, seed.address_id, [{'product_id': product_id or seed.product_id, 'quantity': quantity}]
+    )
+
+
+def _available(product_id):
+    db.session.expire_all()
+    return db.session.get(Product, product_id).available_stock
+
+
+def _shard(seed, shard_count):
+    admin = db.session.get(User, seed.admin_id)
+    _, error = InventoryService.rebalance(seed.product_id, shard_count, admin)
+    assert error is None
+
+
+def _shard_quantities(product_id):
+    db.session.expire_all()
+    return [shard.quantity for shard in ProductStockShard.query.filter_by(product_id=product_id).order_by(ProductStockShard.shard_no)]
+
+
+def test_checkout_reserves_stock(app_ctx, seed):
+    order, error = _order(seed, 3)
+
+    assert error is None
+    assert order.items[0].quantity == 3
+    assert _available(seed.product_id) == 7
+
+
+def test_checkout_never_oversells(app_ctx, seed):
+    _order(seed, 8)
+
+    order, error = _order(seed, 3)
+
+    assert order is None
+    assert error == "Insufficient stock for: Phone"
+    assert _available(seed.product_id) == 2
+    assert Order.query.count() == 1
+
+
+def test_multi_product_checkout_is_all_or_nothing(app_ctx, seed):
+    other = Product(seller_id=seed.admin_id, category_id=seed.category_id, name='Case', price=5, stock=1)
+    db.session.add(other)
+    db.session.commit()
+
+    order, error = OrderService.create_order_direct(seed.customer_id, seed.address_id, [
+        {'product_id': seed.product_id, 'quantity': 2},
+        {'product_id': other.id, 'quantity': 2},
+    ])
+
+    assert order is None
+    assert error == "Insufficient stock for: Case"
+    assert (_available(seed.product_id), _available(other.id)) == (10, 1)
+
+
+def test_selling_out_reindexes_the_product(app_ctx, seed):
+    _order(seed, 10)
+
+    assert _available(seed.product_id) == 0
+    assert SearchOutbox.query.filter_by(product_id=seed.product_id, operation='index').count() == 1
+
+
+def test_rebalance_spreads_and_keeps_the_total(app_ctx, seed):
+    _order(seed, 3)
+
+    _shard(seed, 3)
+    assert _shard_quantities(seed.product_id) == [3, 2, 2]
+    assert _available(seed.product_id) == 7
+
+    _shard(seed, 0)
+    assert _shard_quantities(seed.product_id) == []
+    assert _available(seed.product_id) == 7
+
+
+def test_rebalance_is_admin_only_and_bounded(app_ctx, seed):
+    customer = db.session.get(User, seed.customer_id)
+    admin = db.session.get(User, seed.admin_id)
+
+    assert InventoryService.rebalance(seed.product_id, 4, customer)[1] == "Erişim engellendi"
+    assert InventoryService.rebalance(seed.product_id, 1000, admin)[1].startswith("Shard sayısı")
+
+
+def test_sharded_checkout(app_ctx, seed):
+    _shard(seed, 4)
+
+    order, error = _order(seed, 2)
+
+    assert error is None
+    assert _available(seed.product_id) == 8
+    assert sum(_shard_quantities(seed.product_id)) == 8
+
+
+def test_sharded_checkout_can_span_shards(app_ctx, seed):
+    _shard(seed, 4)
+
+    order, error = _order(seed, 6)
+
+    assert error is None
+    assert _available(seed.product_id) == 4
+    assert _order(seed, 5) == (None, "Insufficient stock for: Phone")
+
+
+def test_updating_stock_redistributes_over_the_shards(app_ctx, seed):
+    _shard(seed, 4)
+    admin = db.session.get(User, seed.admin_id)
+
+    _, error = ProductService.update_product(seed.product_id, {'name': 'Phone 2', 'stock': 6}, admin)
+
+    assert error is None
+    assert _shard_quantities(seed.product_id) == [2, 2, 1, 1]
+    assert db.session.get(Product, seed.product_id).name == 'Phone 2'
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize('shard_count', [0, 4])
+def test_concurrent_checkouts_sell_exactly_the_stock(app, seed, shard_count):
+    with app.app_context():
+        db.session.get(Product, seed.product_id).stock = 5
+        db.session.commit()
+        _shard(seed, shard_count)
+
+    def checkout(_):
+        with app.app_context():
+            return _order(seed, 1)[1] is None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        succeeded = sum(pool.map(checkout, range(12)))
+
+    assert succeeded == 5
+    with app.app_context():
+        assert _available(seed.product_id) == 0
+        assert Order.query.count() == 5
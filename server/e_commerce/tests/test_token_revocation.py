@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import decode_token
+from app import db
+from app.models import RevokedToken
+from app.service import token_revocation_service
+from app.service.token_revocation_service import TokenRevocationService
+from app.service.user_service import UserService
+from app.utils.bloom_filter import BloomFilter
+
+
+@pytest.fixture(autouse=True)
+def fresh_filter(monkeypatch):
+    monkeypatch.setattr(token_revocation_service, '_filter', None)
+    monkeypatch.setattr(token_revocation_service, '_synced_until', None)
+    monkeypatch.setattr(token_revocation_service, '_checked_at', 0.0)
+
+
+def _login(client):
+    body = client.post('/api/auth/login', json={'email': 'customer@example.com', 'password': 'secret1'}).get_json()
+    return body['access_token'], body['refresh_token']
+
+
+def _bearer(token):
+    return {'Authorization': f"Bearer {token}"}
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(1000)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    assert sum(f"other-{i}" in bloom for i in range(10000)) < 50
+    assert not bloom.is_saturated()
+    bloom.add('one-more')
+    assert bloom.is_saturated()
+
+
+def test_logout_revokes_the_access_and_refresh_tokens(client, seed):
+    access, refresh = _login(client)
+
+    response = client.post('/api/auth/logout', headers=_bearer(access), json={'refresh_token': refresh})
+
+    assert response.status_code == 200
+    assert client.get('/api/users/me', headers=_bearer(access)).status_code == 401
+    assert client.post('/api/auth/refresh', headers=_bearer(refresh)).status_code == 401
+
+
+def test_revocations_by_other_workers_are_picked_up_on_sync(app, client, seed, monkeypatch):
+    monkeypatch.setitem(app.config, 'TOKEN_REVOCATION_SYNC_INTERVAL', 0)
+    access, _ = _login(client)
+    assert client.get('/api/users/me', headers=_bearer(access)).status_code == 200
+
+    with app.app_context():
+        payload = decode_token(access)
+        db.session.add(RevokedToken(jti=payload['jti'], token_type='access', user_id=seed.customer_id))
+        db.session.commit()
+
+    assert client.get('/api/users/me', headers=_bearer(access)).status_code == 401
+
+
+def test_unrevoked_tokens_are_checked_without_queries(app, count_queries, seed, monkeypatch):
+    monkeypatch.setitem(app.config, 'TOKEN_REVOCATION_SYNC_INTERVAL', 3600)
+    TokenRevocationService.revoke({'jti': 'revoked', 'sub': str(seed.customer_id), 'type': 'access'})
+    TokenRevocationService.get_filter()
+
+    with count_queries() as statements:
+        assert TokenRevocationService.is_revoked('never-revoked') is False
+
+    assert statements == []
+    assert TokenRevocationService.is_revoked('revoked') is True
+
+
+def test_purge_removes_only_expired_rows(app_ctx, seed):
+    now = datetime.utcnow()
+    db.session.add_all([
+        RevokedToken(jti='expired', token_type='access', user_id=seed.customer_id, expires_at=now - timedelta(hours=1)),
+        RevokedToken(jti='live', token_type='refresh', user_id=seed.customer_id, expires_at=now + timedelta(days=1)),
+    ])
+    db.session.commit()
+
+    assert TokenRevocationService.purge_expired(batch_size=1) == 1
+    assert [row.jti for row in RevokedToken.query] == ['live']
+
+
+def test_refresh_is_refused_once_the_account_is_deleted(app, client, seed):
+    _, refresh = _login(client)
+    with app.app_context():
+        UserService.delete_user(seed.customer_id)
+
+    assert client.post('/api/auth/refresh', headers=_bearer(refresh)).status_code == 401
@@ -0,0 +1,72 @@
+from datetime import datetime
+from urllib.parse import quote
+import pytest
+from app import db
+from app.models import User
+from app.service.user_service import UserService
+
+
+@pytest.fixture
+def users(app, seed):
+    """Four more accounts created on consecutive days from 2024-05-01; returns their ids oldest first."""
+    with app.app_context():
+        accounts = [
+            User(fullname='Ayşe Yılmaz', email='ayse@shop.test', role='seller'),
+            User(fullname='Mehmet Kaya', email='mkaya@shop.test'),
+            User(fullname='Ali Veli', email='ali_100%@shop.test'),
+            User(fullname='Zeynep Ali', email='zeynep@shop.test', is_deleted=True),
+        ]
+        for day, user in enumerate(accounts, start=1):
+            user.password = 'x'
+            user.created_at = datetime(2024, 5, day)
+        db.session.add_all(accounts)
+        db.session.commit()
+        return [user.id for user in accounts]
+
+
+def _search(client, seed, auth_header, query):
+    ids, after = [], None
+    while True:
+        response = client.get(
+            f"/api/users?limit=2&{query}" + (f"&after={after}" if after else ''),
+            headers=auth_header(seed.admin_id, 'admin')
+        )
+        assert response.status_code == 200
+        body = response.get_json()
+        ids += [user['id'] for user in body['items']]
+        after = body['next_cursor']
+        if after is None:
+            return ids
+
+
+def test_directory_pages_newest_first_without_deleted_users(client, seed, auth_header, users):
+    ids = _search(client, seed, auth_header, 'created_to=2024-05-31')
+
+    assert ids == [users[2], users[1], users[0]]
+
+
+def test_role_and_date_filters(client, seed, auth_header, users):
+    assert _search(client, seed, auth_header, 'role=seller') == [users[0]]
+    assert _search(client, seed, auth_header, 'created_from=2024-05-02&created_to=2024-05-02') == [users[1]]
+
+
+@pytest.mark.parametrize('q, expected', [
+    ('MKAYA', [1]),
+    ('meh', [1]),
+    ('kay', [1]),
+    ('ali', [2]),
+    ('ali_100%', [2]),
+    ('a_i', []),
+    ('%', []),
+])
+def test_prefix_search_on_email_and_name_words(client, seed, auth_header, users, q, expected):
+    ids = _search(client, seed, auth_header, f"q={quote(q)}&created_to=2024-05-31")
+
+    assert ids == [users[i] for i in expected]
+
+
+def test_invalid_role_is_rejected(app_ctx):
+    result, error = UserService.get_users_page(10, role='owner')
+
+    assert result is None
+    assert error.startswith('Invalid role')